@@ -1,8 +1,35 @@
+from .cache import (
+    BlockTimestampIndex,
+    ChainTracker,
+    MemoryCache,
+    SqliteCache,
+)
 from .connectors.http import (
     GethHttpConnector,
+    GethHttpLimiter,
+    GethHttpPoolConnector,
+    GethHttpTransport,
+    GethNativeHttpConnector,
+    Priority,
+    QueryPlanner,
+    use_priority,
 )
 from .connectors.ws import (
     GethNewBlockSubscriber,
 )
 
-__all__ = ["GethHttpConnector", "GethNewBlockSubscriber"]
+__all__ = [
+    "BlockTimestampIndex",
+    "ChainTracker",
+    "GethHttpConnector",
+    "GethHttpLimiter",
+    "GethHttpPoolConnector",
+    "GethHttpTransport",
+    "GethNativeHttpConnector",
+    "GethNewBlockSubscriber",
+    "MemoryCache",
+    "Priority",
+    "QueryPlanner",
+    "SqliteCache",
+    "use_priority",
+]
@@ -0,0 +1,22 @@
+from ethhelper.utils.cache import (
+    CacheStore,
+    MemoryCache,
+)
+from ethhelper.utils.chain import (
+    ChainTracker,
+)
+
+from .disk import (
+    SqliteCache,
+)
+from .timestamp import (
+    BlockTimestampIndex,
+)
+
+__all__ = [
+    "BlockTimestampIndex",
+    "CacheStore",
+    "ChainTracker",
+    "MemoryCache",
+    "SqliteCache",
+]
@@ -0,0 +1,191 @@
+import os
+import sqlite3
+from types import (
+    TracebackType,
+)
+
+from ethhelper.datatypes.stats import (
+    CacheStats,
+)
+from ethhelper.utils.cache import (
+    CacheStore,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key BLOB PRIMARY KEY,
+    value BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS logs (
+    filter BLOB NOT NULL,
+    block INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    value BLOB NOT NULL,
+    PRIMARY KEY (filter, block, log_index)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS log_ranges (
+    filter BLOB NOT NULL,
+    first INTEGER NOT NULL,
+    last INTEGER NOT NULL,
+    PRIMARY KEY (filter, first)
+) WITHOUT ROWID;
+"""
+MAX_VARIABLES = 500
+
+
+class SqliteCache(CacheStore):
+    """A persistent ``CacheStore`` in a local sqlite database.
+
+    The results are kept by their request keys, that is by block number or
+    hash for blocks and by transaction hash for transactions and receipts,
+    and the logs by filter and block, together with the ranges of blocks
+    whose logs are all cached. Since only final chain data is put into a
+    cache, nothing is ever evicted, and the database survives restarts.
+
+    The database at ``path`` is opened in WAL mode, so several processes can
+    share it: readers never block, and a writer waits up to ``timeout``
+    seconds for the others. Each batch of results or range of logs is written
+    in one transaction.
+
+    The sqlite calls are synchronous. They are short point lookups and
+    appends, but a very slow disk will stall the event loop.
+    """
+    supports_logs = True
+
+    def __init__(
+        self, path: str | os.PathLike[str], timeout: float = 30
+    ) -> None:
+        self.path = path
+        self.db = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        """The connection to the database, in autocommit mode."""
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: bytes) -> bytes | None:
+        row = self.db.execute(
+            "SELECT value FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return bytes(row[0])
+
+    def get_many(self, keys: list[bytes]) -> dict[bytes, bytes]:
+        results: dict[bytes, bytes] = {}
+        for i in range(0, len(keys), MAX_VARIABLES):
+            chunk = keys[i:i + MAX_VARIABLES]
+            results.update(
+                (bytes(key), bytes(value))
+                for key, value in self.db.execute(
+                    "SELECT key, value FROM results WHERE key IN "
+                    f"({','.join('?' * len(chunk))})",
+                    chunk
+                )
+            )
+        self.hits += len(results)
+        self.misses += len(set(keys)) - len(results)
+        return results
+
+    def put(self, key: bytes, value: bytes) -> None:
+        self.put_many([(key, value)])
+
+    def put_many(self, items: list[tuple[bytes, bytes]]) -> None:
+        if len(items) == 0:
+            return
+        with self.db:
+            self.db.execute("BEGIN")
+            self.db.executemany(
+                "INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)",
+                items
+            )
+
+    def log_gaps(
+        self, filter: bytes, start: int, end: int
+    ) -> list[tuple[int, int]]:
+        gaps: list[tuple[int, int]] = []
+        next_start = start
+        for covered_start, covered_end in self.db.execute(
+            "SELECT first, last FROM log_ranges "
+            "WHERE filter = ? AND last >= ? AND first <= ? ORDER BY first",
+            (filter, start, end)
+        ):
+            if covered_start > next_start:
+                gaps.append((next_start, covered_start - 1))
+            next_start = max(next_start, covered_end + 1)
+        if next_start <= end:
+            gaps.append((next_start, end))
+        return gaps
+
+    def get_logs(self, filter: bytes, start: int, end: int) -> list[bytes]:
+        return [
+            bytes(row[0]) for row in self.db.execute(
+                "SELECT value FROM logs WHERE filter = ? "
+                "AND block BETWEEN ? AND ? ORDER BY block, log_index",
+                (filter, start, end)
+            )
+        ]
+
+    def put_logs(
+        self,
+        filter: bytes,
+        start: int,
+        end: int,
+        logs: list[tuple[int, int, bytes]]
+    ) -> None:
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            self.db.executemany(
+                "INSERT OR REPLACE INTO logs "
+                "(filter, block, log_index, value) VALUES (?, ?, ?, ?)",
+                [(filter, block, index, value) for block, index, value in logs]
+            )
+            merged_start, merged_end = self.db.execute(
+                "SELECT MIN(first), MAX(last) FROM log_ranges "
+                "WHERE filter = ? AND last >= ? AND first <= ?",
+                (filter, start - 1, end + 1)
+            ).fetchone()
+            self.db.execute(
+                "DELETE FROM log_ranges "
+                "WHERE filter = ? AND last >= ? AND first <= ?",
+                (filter, start - 1, end + 1)
+            )
+            if merged_start is not None:
+                start = min(start, merged_start)
+                end = max(end, merged_end)
+            self.db.execute(
+                "INSERT INTO log_ranges (filter, first, last) "
+                "VALUES (?, ?, ?)",
+                (filter, start, end)
+            )
+
+    def stats(self) -> CacheStats:
+        entries = self.db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        page_count = self.db.execute("PRAGMA page_count").fetchone()[0]
+        page_size = self.db.execute("PRAGMA page_size").fetchone()[0]
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            entries=entries,
+            size=page_count * page_size,
+            max_size=0,
+            evictions=0,
+        )
+
+    def close(self) -> None:
+        """Close the connection to the database."""
+        self.db.close()
+
+    def __enter__(self) -> "SqliteCache":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None = None,
+        exc_value: BaseException | None = None,
+        traceback: TracebackType | None = None,
+    ) -> None:
+        self.close()
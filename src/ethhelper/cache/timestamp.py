@@ -0,0 +1,297 @@
+from array import (
+    array,
+)
+from bisect import (
+    bisect_left,
+)
+from collections.abc import (
+    Iterable,
+    Sequence,
+)
+import os
+import struct
+import sys
+from types import (
+    TracebackType,
+)
+from typing import (
+    BinaryIO,
+)
+
+from eth_typing import (
+    BlockNumber,
+)
+
+from ethhelper.connectors.http import (
+    GethHttpConnector,
+)
+from ethhelper.datatypes.eth import (
+    Block,
+)
+
+MAGIC = b"EHTS"
+HEADER = struct.Struct("<4sIQ")
+VERSION = 1
+ITEM_SIZE = 4
+
+
+class BlockTimestampIndex:
+    """A local append-only index of block timestamps.
+
+    The timestamps of a contiguous range of blocks, starting at ``start``, are
+    kept in an ``array`` of unsigned 32-bit integers, 4 bytes per block, so
+    the whole chain history takes less than 100 MB. Since timestamps never
+    decrease along the chain, both block to timestamp and timestamp to block
+    are answered locally, by indexing or by a binary search, without any call
+    to the Geth node.
+
+    If ``path`` is given, the index is loaded from that file and every change
+    is appended to it, so it survives restarts. The file is a small header
+    followed by the raw little-endian timestamps, and a partially written
+    trailing record is ignored when loading.
+
+    The index is filled by ``sync`` through the GraphQL range query, and
+    follows the chain by ``add_block`` as new heads arrive.
+    """
+    def __init__(
+        self, path: str | os.PathLike[str] | None = None, start: int = 0
+    ) -> None:
+        self.start: BlockNumber = BlockNumber(start)
+        """The height of the first indexed block."""
+        self.timestamps: "array[int]" = array("I")
+        """The timestamps of the indexed blocks, in block order."""
+        self.file: BinaryIO | None = None
+        if path is not None:
+            self._open(path)
+
+    def _open(self, path: str | os.PathLike[str]) -> None:
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self.file = open(path, "r+b" if exists else "w+b")
+        if not exists:
+            self.file.write(HEADER.pack(MAGIC, VERSION, self.start))
+            self.file.flush()
+            return
+        magic, version, start = HEADER.unpack(self.file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a block timestamp index.")
+        self.start = BlockNumber(start)
+        data = self.file.read()
+        self.timestamps.frombytes(data[:len(data) // ITEM_SIZE * ITEM_SIZE])
+        if sys.byteorder == "big":
+            self.timestamps.byteswap()
+        self._truncate_file()
+
+    def _truncate_file(self) -> None:
+        if self.file is None:
+            return
+        self.file.truncate(HEADER.size + len(self.timestamps) * ITEM_SIZE)
+        self.file.seek(0, os.SEEK_END)
+
+    def _write(self, timestamps: "array[int]") -> None:
+        if self.file is None:
+            return
+        if sys.byteorder == "big":
+            timestamps = array("I", timestamps)
+            timestamps.byteswap()
+        self.file.write(timestamps.tobytes())
+        self.file.flush()
+
+    @property
+    def end(self) -> BlockNumber:
+        """The height of the last indexed block, or ``start - 1`` if the index
+        is empty.
+        """
+        return BlockNumber(self.start + len(self.timestamps) - 1)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __contains__(self, number: object) -> bool:
+        return isinstance(number, int) and self.start <= number <= self.end
+
+    def extend(self, start: int, timestamps: Iterable[int]) -> None:
+        """Add the timestamps of a contiguous range of blocks.
+
+        The range must start within the index or right after its last block.
+        Indexed blocks overlapped by the range are replaced, as after a chain
+        reorganization, and blocks after the range are dropped.
+
+        Args:
+            start: The height of the first block of the range.
+            timestamps: The timestamps of the blocks, in block order.
+
+        Raises:
+            ValueError: Raised when the range leaves a gap in the index.
+        """
+        if len(self.timestamps) == 0 and self.file is None:
+            self.start = BlockNumber(start)
+        if not self.start <= start <= self.end + 1:
+            raise ValueError(
+                f"Block {start} is not contiguous with the index "
+                f"[{self.start}, {self.end}]."
+            )
+        if start <= self.end:
+            self.truncate(start)
+        added = array("I", timestamps)
+        self.timestamps.extend(added)
+        self._write(added)
+
+    def truncate(self, number: int) -> None:
+        """Drop the indexed blocks from ``number`` on.
+
+        Args:
+            number: The height of the first block to drop.
+        """
+        if number > self.end:
+            return
+        del self.timestamps[max(0, number - self.start):]
+        self._truncate_file()
+
+    def add_block(self, block: Block) -> None:
+        """Add a new head to the index.
+
+        This method is meant to be called from
+        ``GethNewBlockSubscriber.on_block``. A head at or below the last
+        indexed block replaces it and the blocks after it. A head after a gap
+        is ignored, and the gap is filled by the next ``sync``.
+
+        Args:
+            block: The new head.
+        """
+        if self.start <= block.number <= self.end + 1:
+            self.extend(block.number, [block.timestamp])
+
+    def timestamp(self, number: int) -> int:
+        """Get the timestamp of a block.
+
+        Args:
+            number: The block height.
+
+        Returns:
+            The timestamp of the block.
+
+        Raises:
+            KeyError: Raised when the block is not indexed.
+        """
+        if number not in self:
+            raise KeyError(number)
+        return self.timestamps[number - self.start]
+
+    def timestamps_of(self, numbers: Iterable[int]) -> list[int]:
+        """Get the timestamps of many blocks.
+
+        Args:
+            numbers: The block heights.
+
+        Returns:
+            A list of the timestamps of the blocks, in the order of
+            ``numbers``.
+
+        Raises:
+            KeyError: Raised when a block is not indexed.
+        """
+        return [self.timestamp(number) for number in numbers]
+
+    def height_after(self, timestamp: int) -> BlockNumber:
+        """Get the first indexed block whose timestamp is not earlier than the
+        target timestamp.
+
+        The result is the same as ``get_height_after_ts`` of the connector as
+        long as the index covers the chain up to its head.
+
+        Args:
+            timestamp: The target timestamp in seconds since the epoch.
+
+        Returns:
+            The block height, or ``end + 1`` if the target is after the last
+            indexed block.
+        """
+        return BlockNumber(
+            self.start + bisect_left(self.timestamps, timestamp)
+        )
+
+    def heights_after(self, timestamps: Sequence[int]) -> list[BlockNumber]:
+        """Get the first indexed block whose timestamp is not earlier than each
+        of the target timestamps.
+
+        The targets are searched in ascending order, each search starting from
+        the result of the previous one, so a long sorted list of targets, such
+        as the boundaries of time buckets, costs little more than a single
+        pass over the narrowed ranges.
+
+        Args:
+            timestamps: The target timestamps in seconds since the epoch.
+
+        Returns:
+            A list of block heights as ``height_after``, in the order of
+            ``timestamps``.
+        """
+        order = sorted(range(len(timestamps)), key=timestamps.__getitem__)
+        results = [BlockNumber(0)] * len(timestamps)
+        lo = 0
+        for i in order:
+            lo = bisect_left(self.timestamps, timestamps[i], lo)
+            results[i] = BlockNumber(self.start + lo)
+        return results
+
+    async def sync(
+        self,
+        connector: GethHttpConnector,
+        to_height: int | None = None,
+        step: int | None = None,
+        prefetch: int = 4
+    ) -> None:
+        """Fill the index up to ``to_height`` by the GraphQL range query.
+
+        Only the blocks after the last indexed block are requested, and every
+        chunk is added (and written to the file) as soon as it arrives, so an
+        interrupted sync resumes where it stopped.
+
+        Args:
+            connector: The connector used to request the timestamps.
+            to_height: The height of the last block to index. If ``None``, it
+                is the latest block of the Geth node.
+            step: The number of blocks per GraphQL query, passed to
+                ``iter_block_timestamps``.
+            prefetch: The maximum number of queries in flight, passed to
+                ``iter_block_timestamps``.
+
+        Raises:
+            ethhelper.types.GethGraphQLError: Raised when the Geth node returns
+                an error.
+        """
+        if to_height is None:
+            to_height = await connector.eth_block_number()
+        if to_height <= self.end:
+            return
+        async for chunk in connector.iter_block_timestamps(
+            BlockNumber(self.end + 1),
+            BlockNumber(to_height),
+            step=step,
+            prefetch=prefetch
+        ):
+            first = self.end + 1
+            self.extend(
+                first,
+                [chunk[BlockNumber(first + i)] for i in range(len(chunk))]
+            )
+
+    def close(self) -> None:
+        """Close the file of the index, if any.
+
+        The index stays usable in memory, but changes are no longer written.
+        """
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self) -> "BlockTimestampIndex":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None = None,
+        exc_value: BaseException | None = None,
+        traceback: TracebackType | None = None,
+    ) -> None:
+        self.close()
@@ -3,10 +3,24 @@ from logging import (
     Logger,
 )
 
+from ethhelper.datatypes.stats import (
+    NodeStats,
+)
+from ethhelper.utils.cache import (
+    CacheStore,
+)
+from ethhelper.utils.chain import (
+    ChainTracker,
+)
+from ethhelper.utils.planner import (
+    QueryPlanner,
+)
+
 from .base import (
     GethHttpAbstract,
     GethHttpCustomized,
     GethHttpWeb3,
+    GethWeb3Provider,
 )
 from .custom import (
     GethCustomHttp,
@@ -17,15 +31,34 @@ from .eth import (
 from .graphql import (
     GethGraphQL,
 )
+from .limiter import (
+    GethHttpLimiter,
+    Priority,
+    current_priority,
+    use_priority,
+)
+from .native import (
+    GethEthNativeHttp,
+)
 from .net import (
     GethNetHttp,
 )
+from .planner import (
+    GethPlannedHttp,
+)
+from .pool import (
+    GethHttpPool,
+    GethNode,
+)
+from .transport import (
+    GethHttpTransport,
+)
 from .txpool import (
     GethTxpoolHttp,
 )
 
 
-class GethHttpConnector(GethGraphQL, GethCustomHttp):
+class GethHttpConnector(GethPlannedHttp):
     """``GethHttpConnector`` is an asynchronous wrapper for all HTTP interfaces
     supported by ETHHelper.
 
@@ -46,27 +79,236 @@ class GethHttpConnector(GethGraphQL, GethCustomHttp):
     The ``graphql_url`` is used to specify the URL for the GraphQL interface of
     the Geth node, usually in the form of ``http://host:port/graphql``. If not
     provided, it will generate from ``url`` by appending ``/graphql``.
+
+    The ``transport`` is the pooled, keep-alive HTTP transport shared by the
+    customized, GraphQL and Web3.py interfaces. If not provided, a default
+    ``GethHttpTransport`` is created and closed together with this class, by
+    ``aclose`` or by leaving an ``async with`` block:
+
+        >>> async with GethHttpConnector("http://localhost:8545/") as c:
+        ...     await c.eth_block_number()
+
+    The ``coalesce_window`` enables coalescing of concurrent ``send`` calls
+    (and the ``txpool`` interfaces built on it) into JSON-RPC batches. Calls
+    made within ``coalesce_window`` seconds, or up to ``coalesce_max_size``
+    calls, are sent in one HTTP request. ``0`` (the default) disables it.
+
+    The ``hedge_percentile`` enables hedging of the idempotent read requests
+    sent singly, by ``send`` or by Web3.py. A request not answered after that
+    percentile of the recent latencies of its method, such as ``0.95``, is
+    sent again and the first answer wins. ``None`` (the default) disables it.
+    The recent latencies and hedges are reported by ``latency_stats``.
+
+    The ``limiter`` throttles the requests of all interfaces, by a token
+    bucket and an adaptive concurrency limit, see ``GethHttpLimiter``. It can
+    be shared by several connectors of the same node. ``None`` (the default)
+    disables throttling.
+
+    The ``cache`` keeps the results of requests that can never change, such as
+    transactions, receipts, and blocks, code, balances, storage and calls
+    pinned to a block hash or to a final block number. A result is admitted
+    once its block is ``cache_confirmations`` blocks deep, or finalized if
+    ``cache_confirmations`` is ``None``. The single requests of the
+    customized and Web3.py interfaces are answered from it, and the hits and
+    misses are reported by its ``stats``. ``None`` (the default) disables
+    caching.
+
+        >>> c = GethHttpConnector(url, cache=MemoryCache(256 * 1024 * 1024))
+
+    The ``single_flight`` lets concurrent identical requests of the idempotent
+    read methods, such as many tasks asking for the ``latest`` block right
+    after a new head, share one request in flight and its result, by the
+    customized, Web3.py and GraphQL interfaces. The requests sent and shared
+    are reported by ``flight_stats``. It is enabled by default.
+
+    The ``tracker`` is a ``ChainTracker`` following the canonical chain, fed
+    by a ``GethNewBlockSubscriber``. With a ``cache``, it lets the results and
+    logs of the blocks that are not final yet, including the calls, balances
+    and blocks of ``latest`` pinned to the tracked head, be cached until
+    their block is orphaned by a reorg, see ``track_chain``.
+
+        >>> tracker = ChainTracker()
+        >>> subscriber = MySubscriber(ws_url, tracker=tracker)
+        >>> c = GethHttpConnector(url, cache=MemoryCache(), tracker=tracker)
+
+    The ``query_*`` methods, such as ``query_block_headers`` and
+    ``query_logs``, are sent by GraphQL or by JSON-RPC, whichever the
+    ``planner`` measured to be cheaper on this node, see ``GethPlannedHttp``.
+    The reasons of its choices are reported by ``plan_stats``.
     """
     def __init__(
         self,
         url: str,
         logger: Logger | None = None,
-        graphql_url: str | None = None
+        graphql_url: str | None = None,
+        transport: GethHttpTransport | None = None,
+        coalesce_window: float = 0,
+        coalesce_max_size: int = 100,
+        hedge_percentile: float | None = None,
+        limiter: GethHttpLimiter | None = None,
+        cache: CacheStore | None = None,
+        cache_confirmations: int | None = 64,
+        single_flight: bool = True,
+        tracker: ChainTracker | None = None
     ) -> None:
         if logger is None:
             logger = logging.getLogger("GethHttpConnector")
-        super().__init__(url, logger, graphql_url=graphql_url)
+        super().__init__(
+            url, logger, graphql_url=graphql_url, transport=transport
+        )
+        self.coalesce_window = coalesce_window
+        self.coalesce_max_size = coalesce_max_size
+        self.hedge_percentile = hedge_percentile
+        self.limiter = limiter
+        self.cache = cache
+        self.cache_confirmations = cache_confirmations
+        self.single_flight = single_flight
+        if tracker is not None:
+            self.track_chain(tracker)
+
+
+class GethNativeHttpConnector(GethEthNativeHttp, GethHttpConnector):
+    """``GethNativeHttpConnector`` is a ``GethHttpConnector`` whose Eth
+    namespace is sent by the customized JSON-RPC interface instead of Web3.py.
+
+    The results of the Eth namespace are parsed directly from the raw json
+    into ETHHelper types, see ``GethEthNativeHttp``. The other interfaces and
+    the parameters of the constructor are the same as ``GethHttpConnector``.
+    """
+    def __init__(
+        self,
+        url: str,
+        logger: Logger | None = None,
+        graphql_url: str | None = None,
+        transport: GethHttpTransport | None = None,
+        coalesce_window: float = 0,
+        coalesce_max_size: int = 100,
+        hedge_percentile: float | None = None,
+        limiter: GethHttpLimiter | None = None,
+        cache: CacheStore | None = None,
+        cache_confirmations: int | None = 64,
+        single_flight: bool = True,
+        tracker: ChainTracker | None = None
+    ) -> None:
+        if logger is None:
+            logger = logging.getLogger("GethNativeHttpConnector")
+        super().__init__(
+            url,
+            logger,
+            graphql_url=graphql_url,
+            transport=transport,
+            coalesce_window=coalesce_window,
+            coalesce_max_size=coalesce_max_size,
+            hedge_percentile=hedge_percentile,
+            limiter=limiter,
+            cache=cache,
+            cache_confirmations=cache_confirmations,
+            single_flight=single_flight,
+            tracker=tracker
+        )
+
+
+class GethHttpPoolConnector(GethHttpConnector):
+    """``GethHttpPoolConnector`` is a ``GethHttpConnector`` over several Geth
+    nodes.
+
+    All requests, of the customized, GraphQL and Web3.py interfaces, are
+    routed by a ``GethHttpPool``: each request goes to the healthiest and
+    fastest node at or near the chain head, and fails over to the next nodes
+    on transport errors. The nodes are health checked in the background every
+    ``check_interval`` seconds, and a node more than ``max_lag`` blocks behind
+    the highest head is avoided. The state of each node is reported by
+    ``node_stats``. A hedged request usually goes to another node than the
+    original one, since the original is still in flight.
+
+    The ``urls`` are the JSON-RPC endpoints of the nodes, and ``url`` is the
+    first of them. The ``graphql_urls`` are their GraphQL endpoints, by
+    default generated from ``urls`` by appending ``/graphql``. The other
+    parameters are the same as ``GethHttpConnector``.
+    """
+    def __init__(
+        self,
+        urls: list[str],
+        logger: Logger | None = None,
+        graphql_urls: list[str] | None = None,
+        transport: GethHttpTransport | None = None,
+        check_interval: float = 5,
+        max_lag: int = 2,
+        coalesce_window: float = 0,
+        coalesce_max_size: int = 100,
+        hedge_percentile: float | None = None,
+        limiter: GethHttpLimiter | None = None,
+        cache: CacheStore | None = None,
+        cache_confirmations: int | None = 64,
+        single_flight: bool = True,
+        tracker: ChainTracker | None = None
+    ) -> None:
+        if logger is None:
+            logger = logging.getLogger("GethHttpPoolConnector")
+        super().__init__(
+            urls[0],
+            logger,
+            graphql_url=graphql_urls[0] if graphql_urls else None,
+            transport=transport,
+            coalesce_window=coalesce_window,
+            coalesce_max_size=coalesce_max_size,
+            hedge_percentile=hedge_percentile,
+            limiter=limiter,
+            cache=cache,
+            cache_confirmations=cache_confirmations,
+            single_flight=single_flight,
+            tracker=tracker
+        )
+        self.pool: GethHttpPool = GethHttpPool(
+            urls,
+            logger,
+            self.transport,
+            graphql_urls=graphql_urls,
+            check_interval=check_interval,
+            max_lag=max_lag
+        )
+        """The pool routing the requests of this connector."""
+
+    async def _post(self, raw: str | bytes) -> bytes:
+        return await self.pool.post(raw)
+
+    async def _post_query(self, content: bytes) -> bytes:
+        return await self.pool.post(content, graphql=True)
+
+    def node_stats(self) -> dict[str, NodeStats]:
+        """Get the health, head and latency of every node of the pool.
+
+        Returns:
+            A dictionary mapping the url of each node to its ``NodeStats``.
+        """
+        return self.pool.stats()
 
+    async def aclose(self) -> None:
+        await self.pool.aclose()
+        await super().aclose()
 
 
 __all__ = [
     "GethHttpAbstract",
     "GethHttpCustomized",
     "GethHttpWeb3",
+    "GethWeb3Provider",
+    "GethHttpTransport",
+    "GethHttpLimiter",
+    "Priority",
+    "current_priority",
+    "use_priority",
     "GethCustomHttp",
     "GethEthHttp",
+    "GethEthNativeHttp",
     "GethNetHttp",
     "GethTxpoolHttp",
     "GethHttpConnector",
-    "GethGraphQL"
+    "GethHttpPool",
+    "GethHttpPoolConnector",
+    "GethNode",
+    "GethNativeHttpConnector",
+    "GethGraphQL",
+    "GethPlannedHttp",
+    "QueryPlanner"
 ]
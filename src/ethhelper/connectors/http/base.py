@@ -2,25 +2,41 @@ import abc
 from abc import (
     ABCMeta,
 )
+import asyncio
+from asyncio import (
+    Future,
+    Task,
+    TimerHandle,
+)
+from collections.abc import (
+    Iterable,
+)
+import functools
 from logging import (
     Logger,
 )
+import time
 import traceback
+from types import (
+    TracebackType,
+)
+import typing
 from typing import (
     Any,
+    TypeVar,
 )
 
-from httpx import (
-    AsyncClient,
-)
 import orjson
-from pydantic import (
-    ValidationError,
-)
 from web3 import (
-    AsyncHTTPProvider,
     AsyncWeb3,
 )
+from web3.providers.async_base import (
+    AsyncJSONBaseProvider,
+)
+from web3.types import (
+    RPCEndpoint,
+    RPCResponse,
+)
 
 from ethhelper.datatypes.geth import (
     GethError,
@@ -28,11 +44,93 @@ from ethhelper.datatypes.geth import (
     GethRequest,
     GethResponse,
     GethSuccessResponse,
+    GethWSResponse,
     IdNotMatch,
+    decode_response,
+)
+from ethhelper.datatypes.stats import (
+    BatchStats,
+    FlightStats,
+    LatencyStats,
 )
 from ethhelper.utils import (
     json,
 )
+from ethhelper.utils.batch import (
+    AdaptiveBatchSize,
+)
+from ethhelper.utils.cache import (
+    CacheStore,
+    MemoryCache,
+)
+from ethhelper.utils.chain import (
+    ChainTracker,
+)
+from ethhelper.utils.flight import (
+    SingleFlight,
+)
+from ethhelper.utils.latency import (
+    LatencyWindow,
+)
+
+from .cache import (
+    BLOCK_PARAMS,
+    CACHE_METHODS,
+    cache_key,
+    request_key,
+    result_block_hash,
+    result_height,
+)
+from .limiter import (
+    GethHttpLimiter,
+)
+from .transport import (
+    GethHttpTransport,
+)
+
+T = TypeVar("T", bound="GethHttpAbstract")
+
+HEDGE_METHODS = frozenset(
+    [
+        "eth_blockNumber",
+        "eth_call",
+        "eth_chainId",
+        "eth_estimateGas",
+        "eth_feeHistory",
+        "eth_gasPrice",
+        "eth_getBalance",
+        "eth_getBlockByHash",
+        "eth_getBlockByNumber",
+        "eth_getBlockReceipts",
+        "eth_getBlockTransactionCountByHash",
+        "eth_getBlockTransactionCountByNumber",
+        "eth_getCode",
+        "eth_getHeaderByHash",
+        "eth_getHeaderByNumber",
+        "eth_getLogs",
+        "eth_getRawTransactionByBlockHashAndIndex",
+        "eth_getRawTransactionByBlockNumberAndIndex",
+        "eth_getRawTransactionByHash",
+        "eth_getStorageAt",
+        "eth_getTransactionByBlockHashAndIndex",
+        "eth_getTransactionByBlockNumberAndIndex",
+        "eth_getTransactionByHash",
+        "eth_getTransactionCount",
+        "eth_getTransactionReceipt",
+        "eth_maxPriorityFeePerGas",
+        "eth_syncing",
+        "net_listening",
+        "net_peerCount",
+        "net_version",
+        "txpool_content",
+        "txpool_contentFrom",
+        "txpool_inspect",
+        "txpool_status",
+    ]
+)
+"""The idempotent read methods that may be hedged, or shared by concurrent
+callers.
+"""
 
 
 class GethHttpAbstract(metaclass=ABCMeta):
@@ -45,9 +143,47 @@ class GethHttpAbstract(metaclass=ABCMeta):
     The ``logger`` is used to assign a logger of the Python logging module to
     this class. Explicitly assigning a logger can be used to control the output
     location of the logger, which is convenient for debugging.
+
+    The ``transport`` is the pooled HTTP transport used to send requests. If
+    not provided, a default ``GethHttpTransport`` is created and owned by this
+    class, which means it will be closed by ``aclose``. A transport provided
+    explicitly can be shared by several connectors and must be closed by the
+    caller.
+
+    Requests of the idempotent read methods in ``HEDGE_METHODS`` can be
+    hedged by setting ``hedge_percentile``: when a request has not been
+    answered after that percentile of the recent latencies of its method, a
+    duplicate is sent and the first answer is taken. The latencies are those
+    of the original requests, which are left to finish when the duplicate
+    answers first, so hedging does not hide the slow requests from the delay.
+    Since the delay follows the observed latencies, duplicates are only sent
+    for the slowest requests.
+
+    The requests of all interfaces can be throttled by setting ``limiter`` to
+    a ``GethHttpLimiter``, which limits the requests per second and adapts the
+    number of requests in flight to the capacity of the Geth node.
+
+    The results of single requests that can never change, such as receipts,
+    or blocks and state pinned to a final block, are cached by setting
+    ``cache`` to a ``CacheStore``. A result is only admitted once its block is
+    ``cache_confirmations`` blocks deep, or finalized if
+    ``cache_confirmations`` is ``None``. If ``track_chain`` is given a
+    ``ChainTracker``, the results of the canonical blocks that are not final
+    yet are also cached, in ``head_cache``, until their block is orphaned,
+    and the requests of the ``latest`` block are pinned to the head of the
+    tracker.
+
+    Concurrent identical requests of the idempotent read methods in
+    ``HEDGE_METHODS``, and of GraphQL queries, share one request in flight
+    if ``single_flight`` is ``True``, see ``SingleFlight``.
     """
 
-    def __init__(self, url: str, logger: Logger) -> None:
+    def __init__(
+        self,
+        url: str,
+        logger: Logger,
+        transport: GethHttpTransport | None = None
+    ) -> None:
         self.url: str = url
         """The url giving from the constructor of this class.
 
@@ -60,6 +196,549 @@ class GethHttpAbstract(metaclass=ABCMeta):
         """The logger giving from the constructor of this class or default by
         ``logging.getLogger("GethHttpConnector")``
         """
+        self.own_transport: bool = transport is None
+        """Whether the transport is created by this class and should be
+        closed by ``aclose``.
+        """
+        if transport is None:
+            transport = GethHttpTransport()
+        self.transport: GethHttpTransport = transport
+        """The pooled HTTP transport shared by all interfaces of this class.
+        """
+        self.batch_sizes: dict[str, AdaptiveBatchSize] = {}
+        """The adaptive batch sizes of batched requests, by kind of request.
+        """
+        self.latencies: dict[str, LatencyWindow] = {}
+        """The recent latencies of single requests, by method."""
+        self.hedge_percentile: float | None = None
+        """The percentile of the recent latencies of a method after which a
+        request of that method is hedged, such as ``0.95``. ``None`` disables
+        hedging.
+        """
+        self.hedge_min_delay: float = 0.01
+        """The lower bound in seconds of the delay before a request is hedged.
+        """
+        self.outrun: set[Task[bytes]] = set()
+        """The hedged requests answered first by their duplicate, still
+        running to record their latency.
+        """
+        self.limiter: GethHttpLimiter | None = None
+        """The limiter throttling the requests of all interfaces. ``None``
+        disables throttling.
+        """
+        self.cache: CacheStore | None = None
+        """The cache of immutable results. ``None`` disables caching."""
+        self.cache_confirmations: int | None = 64
+        """The number of blocks after which a block is considered final by
+        the cache. ``None`` uses the ``finalized`` block of the Geth node.
+        """
+        self.cache_refresh: float = 12
+        """The minimum time in seconds between two requests of the final
+        block height by the cache.
+        """
+        self.final_height: int = -1
+        """The last known final block height, below which results are
+        cached.
+        """
+        self.final_height_at: float = 0
+        self.tracker: ChainTracker | None = None
+        """The tracker of the canonical chain near the head, see
+        ``track_chain``. ``None`` only caches final results.
+        """
+        self.head_cache: MemoryCache = MemoryCache(16 * 1024 * 1024)
+        """The cache of the results of the blocks that are not final yet,
+        kept apart from ``cache`` so that a persistent ``cache`` never holds
+        a result which may be orphaned.
+        """
+        self.head_keys: dict[int, list[tuple[str, bytes]]] = {}
+        """The keys of ``head_cache`` by block height, with the hash of the
+        block each result was verified against.
+        """
+        self.single_flight: bool = True
+        """Whether concurrent identical read requests share one request in
+        flight.
+        """
+        self.flights: SingleFlight = SingleFlight()
+        """The read requests in flight, by method and params."""
+        self.received_bytes: int = 0
+        """The total size in bytes of the responses received from the Geth
+        node, by all interfaces.
+        """
+
+    def batch_size(
+        self, key: str, initial: int, maximum: int = 1000
+    ) -> AdaptiveBatchSize:
+        """Get the adaptive batch size of a kind of batched request, creating
+        it if it does not exist yet.
+
+        Args:
+            key: The kind of batched request, usually the method name.
+            initial: The size of the first batch if it is created.
+            maximum: The upper bound of the batch size if it is created.
+
+        Returns:
+            The ``AdaptiveBatchSize`` of ``key``.
+        """
+        if key not in self.batch_sizes:
+            self.batch_sizes[key] = AdaptiveBatchSize(initial, maximum=maximum)
+        return self.batch_sizes[key]
+
+    def batch_stats(self) -> dict[str, BatchStats]:
+        """Get the chosen sizes and observations of all adaptive batch sizes.
+
+        Returns:
+            A dictionary mapping the kind of batched request to its
+            ``BatchStats``.
+        """
+        return {key: size.stats() for key, size in self.batch_sizes.items()}
+
+    def latency_stats(self) -> dict[str, LatencyStats]:
+        """Get the recent latencies and hedges of all methods sent singly.
+
+        Returns:
+            A dictionary mapping the method name to its ``LatencyStats``.
+        """
+        return {
+            method: window.stats() for method, window in self.latencies.items()
+        }
+
+    def flight_stats(self) -> FlightStats:
+        """Get the number of read requests sent and shared by concurrent
+        callers.
+
+        Returns:
+            The ``FlightStats`` of ``flights``.
+        """
+        return self.flights.stats()
+
+    def track_chain(self, tracker: ChainTracker) -> None:
+        """Cache the results of the blocks that are not final yet, following
+        the canonical chain by ``tracker``.
+
+        A result of a block above the final block height is admitted into
+        ``head_cache`` only if the block is tracked, the hash of the block in
+        the result, if any, is the tracked one, and no reorg happened while
+        the request was in flight. It is evicted when its block is orphaned,
+        and moved into ``cache`` once its block is final.
+
+        The ``latest`` block param of the methods in ``BLOCK_PARAMS`` is
+        replaced by the height of the head of the tracker while it is live,
+        so that these results are cached too.
+
+        Args:
+            tracker: The tracker, fed by a ``GethNewBlockSubscriber``.
+        """
+        self.tracker = tracker
+        tracker.add_listener(self.evict_orphaned)
+        if tracker.fetch_header is None:
+            tracker.fetch_header = self._fetch_header
+
+    async def _fetch_header(self, height: int) -> dict[str, Any]:
+        """Request the header of a canonical block, bypassing the caches.
+
+        Args:
+            height: The block height.
+
+        Returns:
+            The json header of the block.
+        """
+        response = decode_response(
+            orjson.loads(
+                await self.send_raw(
+                    json.encode_request(
+                        0, "eth_getHeaderByNumber", [hex(height)]
+                    ),
+                    "eth_getHeaderByNumber"
+                )
+            )
+        )
+        if isinstance(response, GethErrorResponse):
+            raise GethError(error=response.error)
+        assert isinstance(response, GethSuccessResponse)
+        return typing.cast(dict[str, Any], response.result)
+
+    def evict_orphaned(self, orphaned: dict[int, str]) -> None:
+        """Evict the results of orphaned blocks from ``head_cache``.
+
+        Args:
+            orphaned: A dictionary mapping the height to the hash of each
+                orphaned block.
+        """
+        evicted = 0
+        for height, block_hash in orphaned.items():
+            kept: list[tuple[str, bytes]] = []
+            for tagged, key in self.head_keys.pop(height, []):
+                if tagged == block_hash:
+                    self.head_cache.delete(key)
+                    evicted += 1
+                else:
+                    kept.append((tagged, key))
+            if len(kept) != 0:
+                self.head_keys[height] = kept
+        if evicted != 0:
+            self.logger.info(f"Evicted {evicted} results of orphaned blocks")
+
+    def pin_latest(self, method: str, params: list[Any]) -> list[Any]:
+        """Replace the ``latest`` block param of a request by the height of
+        the head of the ``tracker``, if it is live.
+
+        Args:
+            method: The method of the request.
+            params: The params of the request in the json form of Geth.
+
+        Returns:
+            The params, pinned to the head of the tracker if possible.
+        """
+        if (
+            self.tracker is None
+            or self.cache is None
+            or method not in BLOCK_PARAMS
+            or not self.tracker.is_live()
+        ):
+            return params
+        index = BLOCK_PARAMS[method]
+        if len(params) > index and params[index] == "latest":
+            params = list(params)
+            params[index] = hex(self.tracker.head)
+        elif len(params) == index:
+            params = [*params, hex(self.tracker.head)]
+        return params
+
+    def reorgs(self) -> int | None:
+        """Get the number of reorgs seen by the ``tracker``, to be passed to
+        ``cache_results`` for the requests sent now.
+
+        Returns:
+            The ``reorgs`` of the tracker, or ``None`` if there is none.
+        """
+        return None if self.tracker is None else self.tracker.reorgs
+
+    def cache_lookup(self, key: bytes) -> bytes | None:
+        """Get a cached result from ``cache`` or ``head_cache``.
+
+        Args:
+            key: The cache key of the request.
+
+        Returns:
+            The json encoded result, or ``None`` if it is not cached.
+        """
+        assert self.cache is not None
+        value = self.cache.get(key)
+        if value is None and self.tracker is not None:
+            value = self.head_cache.get(key)
+        return value
+
+    async def refresh_final_height(self) -> int:
+        """Request the height of the latest final block for the cache.
+
+        Returns:
+            The latest block height minus ``cache_confirmations``, or the
+            height of the ``finalized`` block if ``cache_confirmations`` is
+            ``None``.
+        """
+        self.final_height_at = time.monotonic()
+        if self.cache_confirmations is None:
+            method, params = "eth_getHeaderByNumber", ["finalized"]
+        else:
+            method, params = "eth_blockNumber", []
+        response = decode_response(
+            orjson.loads(
+                await self.send_raw(
+                    json.encode_request(0, method, params), method
+                )
+            )
+        )
+        if isinstance(response, GethErrorResponse):
+            raise GethError(error=response.error)
+        assert isinstance(response, GethSuccessResponse)
+        if self.cache_confirmations is None:
+            height = int(response.result["number"], 16)
+        else:
+            height = int(response.result, 16) - self.cache_confirmations
+        self.final_height = max(self.final_height, height)
+        return self.final_height
+
+    async def is_final(self, height: int) -> bool:
+        """Check whether a block is final for the cache.
+
+        The final block height is requested again only if ``height`` is above
+        the last known one and it was not requested in the last
+        ``cache_refresh`` seconds.
+
+        Args:
+            height: The block height.
+
+        Returns:
+            ``True`` if the block is at or below the final block height.
+        """
+        if (
+            height > self.final_height
+            and time.monotonic() - self.final_height_at >= self.cache_refresh
+        ):
+            try:
+                await self.refresh_final_height()
+            except Exception as e:
+                self.logger.warning(f"Failed to get the final block: {e!r}")
+        return height <= self.final_height
+
+    async def cache_result(
+        self,
+        key: bytes,
+        method: str,
+        params: list[Any],
+        result: Any,
+        reorgs: int | None = None
+    ) -> None:
+        """Put the result of a request into the cache if it is final, or into
+        the ``head_cache`` if it is verified by the ``tracker``.
+
+        Args:
+            key: The cache key of the request, see ``cache_key``.
+            method: The method of the request.
+            params: The params of the request in the json form of Geth.
+            result: The json decoded result.
+            reorgs: The ``reorgs`` when the request was sent. If ``None``, a
+                result which is not final is not cached.
+        """
+        await self.cache_results([(key, method, params, result)], reorgs)
+
+    async def cache_results(
+        self,
+        items: list[tuple[bytes, str, list[Any], Any]],
+        reorgs: int | None = None
+    ) -> None:
+        """Put the final results of many requests into the cache at once.
+
+        Args:
+            items: The tuples of the cache key, the method, the params and the
+                result of each request, see ``cache_result``.
+            reorgs: The ``reorgs`` when the requests were sent.
+        """
+        if self.cache is None:
+            return
+        heights = [
+            result_height(method, params, result)
+            for _, method, params, result in items
+        ]
+        highest = max((h for h in heights if h is not None), default=None)
+        if highest is None:
+            return
+        await self.is_final(highest)
+        self.cache.put_many(
+            [
+                (key, json.orjson_dumps_bytes(result))
+                for (key, _, _, result), height in zip(items, heights)
+                if height is not None and height <= self.final_height
+            ]
+        )
+        if self.tracker is None:
+            return
+        self._promote_final()
+        if reorgs != self.tracker.reorgs or highest <= self.final_height:
+            return
+        for (key, method, _, result), height in zip(items, heights):
+            if height is None or height <= self.final_height:
+                continue
+            block_hash = self.tracker.hash_at(height)
+            if block_hash is None:
+                continue
+            found = result_block_hash(method, result)
+            if found is not None and found != block_hash:
+                continue
+            self.head_cache.put(key, json.orjson_dumps_bytes(result))
+            self.head_keys.setdefault(height, []).append((block_hash, key))
+
+    def _promote_final(self) -> None:
+        """Move the results of the blocks which became final from
+        ``head_cache`` into ``cache``.
+
+        The logs of a block are dropped instead, since the final logs are
+        kept by range by ``CacheStore.put_logs``.
+        """
+        assert self.cache is not None
+        items: list[tuple[bytes, bytes]] = []
+        for height in [h for h in self.head_keys if h <= self.final_height]:
+            for _, key in self.head_keys.pop(height):
+                value = self.head_cache.entries.get(key)
+                if value is None:
+                    continue
+                self.head_cache.delete(key)
+                if not key.startswith(b"eth_getLogs"):
+                    items.append((key, value))
+        self.cache.put_many(items)
+
+    async def _post(self, raw: str | bytes) -> bytes:
+        """Post json content to the Geth node.
+
+        Args:
+            raw: The json content will be sent.
+
+        Returns:
+            The json content of the response in bytes.
+        """
+        return await self.transport.post(self.url, raw)
+
+    async def _post_limited(
+        self, raw: str | bytes, method: str | None = None
+    ) -> bytes:
+        """Post json content to the Geth node through the ``limiter``, if
+        any.
+
+        Args:
+            raw: The json content will be sent.
+            method: The method of the single request in ``raw``, if any, whose
+                latency tunes the concurrency limit of the ``limiter``.
+
+        Returns:
+            The json content of the response in bytes.
+        """
+        if self.limiter is None:
+            raw_res = await self._post(raw)
+        else:
+            async with self.limiter.slot(method):
+                raw_res = await self._post(raw)
+        self.received_bytes += len(raw_res)
+        return raw_res
+
+    @staticmethod
+    def _observe_latency(
+        window: LatencyWindow, start: float, task: Task[bytes]
+    ) -> None:
+        """Record the latency of a request started at ``start`` into
+        ``window`` once its task succeeds.
+
+        Args:
+            window: The recent latencies of the method of the request.
+            start: The ``time.monotonic`` when the request was sent.
+            task: The finished task of the request.
+        """
+        if not task.cancelled() and task.exception() is None:
+            window.observe(time.monotonic() - start)
+
+    def _outrun(self, primary: Task[bytes], pending: set[Task[bytes]]) -> None:
+        """Leave a hedged request to finish in ``outrun`` instead of
+        cancelling it with the other ``pending`` tasks.
+
+        Args:
+            primary: The task of the request answered first by its duplicate.
+            pending: The tasks to be cancelled.
+        """
+        if primary in pending:
+            pending.remove(primary)
+            self.outrun.add(primary)
+            primary.add_done_callback(self.outrun.discard)
+
+    async def _post_hedged(
+        self, raw: str | bytes, method: str, window: LatencyWindow
+    ) -> bytes:
+        """Post json content, and post it again if it is not answered within
+        the hedge delay of ``window``.
+
+        The latency of the first request is recorded into ``window`` when it
+        succeeds, even if the duplicate answers first, in which case the first
+        request is left to finish in ``outrun``.
+
+        Args:
+            raw: The json content will be sent.
+            method: The method of the single request in ``raw``.
+            window: The recent latencies of ``method``.
+
+        Returns:
+            The json content of the first response in bytes.
+        """
+        assert self.hedge_percentile is not None
+        delay = window.hedge_delay(self.hedge_percentile, self.hedge_min_delay)
+        start = time.monotonic()
+        if delay is None:
+            raw_res = await self._post_limited(raw, method)
+            window.observe(time.monotonic() - start)
+            return raw_res
+        primary = asyncio.create_task(self._post_limited(raw, method))
+        primary.add_done_callback(
+            functools.partial(self._observe_latency, window, start)
+        )
+        pending: set[Task[bytes]] = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if primary in done:
+                return primary.result()
+            window.hedges += 1
+            pending.add(asyncio.create_task(self._post_limited(raw, method)))
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        if task is not primary:
+                            window.hedge_wins += 1
+                            self._outrun(primary, pending)
+                        return task.result()
+            assert error is not None
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def send_raw(
+        self, raw: str | bytes, method: str | None = None
+    ) -> bytes:
+        """Send json content to Geth node and return the json content of the
+        response.
+
+        If ``method`` is given, the latency of the request is recorded for
+        that method, and the request is hedged if ``hedge_percentile`` is set
+        and ``method`` is in ``HEDGE_METHODS``.
+
+        Args:
+            raw: The json content will be sent.
+            method: The method of the single request in ``raw``, if any.
+
+        Returns:
+            The json content of the response in bytes.
+
+        Raises:
+            httpx.RequestError: Raised when an HTTP request fails.
+        """
+        self.logger.debug("SEND RAW %r", raw)
+        if method is None:
+            raw_res = await self._post_limited(raw)
+        else:
+            window = self.latencies.get(method)
+            if window is None:
+                window = self.latencies[method] = LatencyWindow()
+            if self.hedge_percentile is not None and method in HEDGE_METHODS:
+                raw_res = await self._post_hedged(raw, method, window)
+            else:
+                start = time.monotonic()
+                raw_res = await self._post_limited(raw, method)
+                window.observe(time.monotonic() - start)
+        self.logger.debug("RECV RAW %r", raw_res)
+        return raw_res
+
+    async def aclose(self) -> None:
+        """Close the HTTP transport if it is owned by this class.
+
+        A transport provided explicitly to the constructor is left open, since
+        it may still be used by other connectors.
+        """
+        for task in self.outrun:
+            task.cancel()
+        if self.own_transport and not self.transport.closed:
+            await self.transport.aclose()
+
+    async def __aenter__(self: T) -> T:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None = None,
+        exc_value: BaseException | None = None,
+        traceback: TracebackType | None = None,
+    ) -> None:
+        await self.aclose()
 
     @abc.abstractmethod
     async def is_connected(self) -> bool:
@@ -86,26 +765,63 @@ class GethHttpCustomized(GethHttpAbstract):
     The ``logger`` is used to assign a logger of the Python logging module to
     this class. Explicitly assigning a logger can be used to control the output
     location of the logger, which is convenient for debugging.
+
+    The ``transport`` is the pooled HTTP transport used to send requests.
+
+    Concurrent calls of ``send`` can be coalesced into JSON-RPC batches by
+    setting ``coalesce_window`` to a positive number of seconds. Calls made
+    within the window, or up to ``coalesce_max_size`` calls, are sent in one
+    HTTP request and each caller still receives its own result or
+    ``GethError``.
     """
 
-    def __init__(self, url: str, logger: Logger) -> None:
-        super().__init__(url, logger)
+    def __init__(
+        self,
+        url: str,
+        logger: Logger,
+        transport: GethHttpTransport | None = None
+    ) -> None:
+        super().__init__(url, logger, transport)
         self.id: int = 0
         """The id used when sending requests to Geth, an integer starting from
         ``1`` and incrementing for each request. Reset when it exceeds
         ``100000000``.
         """
+        self.coalesce_window: float = 0
+        """The time in seconds that ``send`` waits for other concurrent calls
+        to be sent together in one JSON-RPC batch. ``0`` disables coalescing.
+        """
+        self.coalesce_max_size: int = 100
+        """The maximum number of calls in one coalesced batch. A batch is sent
+        at once when it is full, without waiting for ``coalesce_window``.
+        """
+        self.pending: list[tuple[GethRequest, Future[Any]]] = []
+        """The requests waiting to be sent in the next coalesced batch."""
+        self.flush_handle: TimerHandle | None = None
+        self.flush_tasks: set[Task[None]] = set()
+
+    def next_id(self) -> int:
+        """Generate the id of the next request.
+
+        Returns:
+            An integer starting from ``1`` and incrementing for each request.
+        """
+        if self.id >= 100000000:
+            self.id = 0
+        self.id += 1
+        return self.id
 
-    def parse_response(self, raw_res: str) -> GethResponse:
+    def parse_response(self, raw_res: str | bytes) -> GethResponse:
         """Parse the content of the Geth node response.
 
-        This function will attempt to parse the input into a
-        ``GethSuccessResponse``, and failing that, into a
-        ``GethErrorResponse``.
+        The content is json decoded once and parsed into a
+        ``GethErrorResponse`` if it has an ``error`` key, otherwise into a
+        ``GethSuccessResponse``, see ``decode_response``. The ``result`` is
+        not validated, so a large result costs no more than its json decoding.
 
         Args:
             raw_res: the content of the HTTP response of the Geth node in
-                string form.
+                string or bytes form.
         
         Returns:
             An object of either GethSuccessResponse or GethErrorResponse,
@@ -113,18 +829,18 @@ class GethHttpCustomized(GethHttpAbstract):
             response or an error response.
         
         Raises:
-            pydantic.ValidationError: Raised when input data cannot be parsed
-                into either GethSuccessResponse or GethErrorResponse.
+            orjson.JSONDecodeError: Raised when the raw content cannot be json
+                decoded.
+            ValueError: Raised when the json decoded content is not a JSON-RPC
+                response.
         """
-        try:
-            response = GethSuccessResponse.parse_raw(raw_res)
-        except ValidationError:
-            response = GethErrorResponse.parse_raw(raw_res)
-        self.logger.debug(f"RECV {response}")
+        response = decode_response(orjson.loads(raw_res))
+        if isinstance(response, GethWSResponse):
+            raise ValueError("Unexpected JSON-RPC notification")
         return response
 
     def parse_multiple_responses(
-        self, raw_res: str
+        self, raw_res: str | bytes
     ) -> tuple[list[GethSuccessResponse], list[GethErrorResponse]]:
         """Parse the content of the Geth node responses.
 
@@ -133,14 +849,14 @@ class GethHttpCustomized(GethHttpAbstract):
         multiple. This function is used to parse multiple Geth responses from
         a single HTTP response.
 
-        This function will attempt to parse the input into a list. Afterwards,
-        this function assumes that the elements of this list are in the form of
-        ``GethSuccessResponse` or ``GethErrorResponse``, and use pydantic to
-        parse these elements.
+        The content is json decoded once into a list, whose elements are
+        routed by their keys as ``parse_response``. If Geth rejects the whole
+        batch with a single error, the error is returned as the only element
+        of the error list.
 
         Args:
             raw_res: the content of the HTTP response of the Geth node in
-                string form.
+                string or bytes form.
 
         Returns:
             A tuple with two lists. One is a list of GethSuccessResponse and
@@ -151,44 +867,59 @@ class GethHttpCustomized(GethHttpAbstract):
         Raises:
             orjson.JSONDecodeError: Raised when the raw content cannot be json
                 decoded.
-            pydantic.ValidationError: Raised when any element in json decoded
-                list cannot be parsed into either GethSuccessResponse or
-                GethErrorResponse.
+            ValueError: Raised when any element in the json decoded list is
+                not a JSON-RPC response.
         """
         raw_res_list = orjson.loads(raw_res)
+        if not isinstance(raw_res_list, list):
+            raw_res_list = [raw_res_list]
         success: list[GethSuccessResponse] = []
         errors: list[GethErrorResponse] = []
         for res in raw_res_list:
-            try:
-                response = GethSuccessResponse.parse_obj(res)
+            response = decode_response(res)
+            if isinstance(response, GethSuccessResponse):
                 success.append(response)
-            except ValidationError:
-                response = GethErrorResponse.parse_obj(res)
+            elif isinstance(response, GethErrorResponse):
                 errors.append(response)
-        self.logger.debug(f"RECV MULTIPLE {success} {errors}")
+            else:
+                raise ValueError("Unexpected JSON-RPC notification")
         return success, errors
 
-    async def send_raw(self, raw: str) -> str:
-        """Send json text to Geth node and return text of the response.
+    @staticmethod
+    def match_responses(
+        ids: Iterable[int | None],
+        success: list[GethSuccessResponse],
+        errors: list[GethErrorResponse],
+    ) -> dict[int | None, Any]:
+        """Match the responses of a batch to the ids of its requests.
+
+        Responses whose id was not sent are ignored. If Geth rejects the whole
+        batch with an error without id, that error is used for every id that
+        received no response.
 
         Args:
-            raw: The json text will be sent.
+            ids: The ids of the requests sent in the batch.
+            success: The success responses of the batch.
+            errors: The error responses of the batch.
 
         Returns:
-            A string of the json content of the response in text.
-
-        Raises:
-            httpx.RequestError: Raised when an HTTP request fails.
+            A dict from every id to its result, or to the ``GethError`` of its
+            error response, or to an ``IdNotMatch`` if Geth did not respond to
+            it.
         """
-        self.logger.debug(f"SEND RAW {raw}")
-        async with AsyncClient() as client:
-            res = await client.post(
-                f"{self.url}",
-                content=raw,
-                headers={"Content-Type": "application/json"}
+        responses: dict[int | None, Any] = {
+            suc.id: suc.result for suc in success
+        }
+        for err in errors:
+            responses[err.id] = GethError(error=err.error)
+        batch_error = responses.get(None)
+        return {
+            id: responses[id] if id in responses else (
+                batch_error or
+                IdNotMatch(f"Send id {id} but received no response")
             )
-            self.logger.debug(f"RECV RAW {res.text}")
-            return res.text
+            for id in ids
+        }
 
     async def send(self, method: str, params: list[Any] | None = None) -> Any:
         """Send a Geth request to Geth node and return the data of Geth
@@ -198,9 +929,14 @@ class GethHttpCustomized(GethHttpAbstract):
         stipulates that each request needs to provide a ``method`` and a series
         of ``parameters``. This function is the encapsulation of this behavior.
         An ``id`` is automatically generated inside the function. The function
-        will form a ``GethRequest`` object with the ``id`` and the input
-        ``method`` and ``params``, encode it into json text by pydantic and
-        send it to the Geth node.
+        will encode the ``id`` and the input ``method`` and ``params`` into
+        json bytes by ``encode_request`` and send it to the Geth node. If
+        ``coalesce_window`` is positive, the request is sent by
+        ``send_coalesced`` together with other concurrent requests. If the
+        result is in the ``cache``, no request is sent at all. If
+        ``single_flight`` is ``True`` and an identical read request is already
+        in flight, its result is shared instead of sending another one, so the
+        result must not be modified.
 
         Args:
             method: The method name of the Geth HTTP interface to call.
@@ -218,21 +954,57 @@ class GethHttpCustomized(GethHttpAbstract):
         """
         if params is None:
             params = []
-        self.logger.debug(f"SEND {method} {params}")
-        if self.id >= 100000000:
-            self.id = 0
-        self.id += 1
-        id = self.id
-        request = GethRequest(id=id, method=method, params=params)
-        raw_res = await self.send_raw(request.json())
-        response = self.parse_response(raw_res)
-        if isinstance(response, GethErrorResponse):
-            raise GethError(error=response.error)
-        if id != response.id:
-            raise IdNotMatch(
-                f"Send id {id} but received {response.id}"
+        self.logger.debug("SEND %s %s", method, params)
+        key: bytes | None = None
+        if self.cache is not None:
+            params = self.pin_latest(method, params)
+            key = cache_key(method, params)
+            if key is not None:
+                cached = self.cache_lookup(key)
+                if cached is not None:
+                    return orjson.loads(cached)
+        if self.single_flight and method in HEDGE_METHODS:
+            return await self.flights.do(
+                request_key(method, params),
+                functools.partial(self._send_uncached, method, params, key)
             )
-        return response.result
+        return await self._send_uncached(method, params, key)
+
+    async def _send_uncached(
+        self, method: str, params: list[Any], key: bytes | None
+    ) -> Any:
+        """Send a Geth request to Geth node, and put its result into the
+        ``cache`` if ``key`` is given.
+
+        Args:
+            method: The method name of the Geth HTTP interface to call.
+            params: A series of parameters used by Geth to make the request.
+            key: The cache key of the request, see ``cache_key``.
+
+        Returns:
+            The result returned by Geth, see ``send``.
+        """
+        reorgs = self.reorgs()
+        id = self.next_id()
+        if self.coalesce_window > 0:
+            result = await self.send_coalesced(
+                GethRequest.construct(id=id, method=method, params=params)
+            )
+        else:
+            raw_res = await self.send_raw(
+                json.encode_request(id, method, params), method
+            )
+            response = self.parse_response(raw_res)
+            if isinstance(response, GethErrorResponse):
+                raise GethError(error=response.error)
+            if id != response.id:
+                raise IdNotMatch(
+                    f"Send id {id} but received {response.id}"
+                )
+            result = response.result
+        if key is not None:
+            await self.cache_result(key, method, params, result, reorgs)
+        return result
 
     async def send_multiple(
         self, raw_requests: list[tuple[str, list[Any] | None]]
@@ -264,21 +1036,337 @@ class GethHttpCustomized(GethHttpAbstract):
                 decoded list cannot be parsed into either GethSuccessResponse
                 or GethErrorResponse.
         """
-        self.logger.debug(f"SEND MULTIPLE {raw_requests}")
-        requests: list[GethRequest] = []
-        for method, params in raw_requests:
-            if self.id >= 100000000:
-                self.id = 0
-            self.id += 1
-            if params is None:
-                params = []
-            req = GethRequest(id=self.id, method=method, params=params)
-            requests.append(req)
+        self.logger.debug("SEND MULTIPLE %s", raw_requests)
         raw_res = await self.send_raw(
-            json.orjson_dumps([req.dict() for req in requests])
+            json.encode_batch(
+                [
+                    json.encode_request(self.next_id(), method, params or [])
+                    for method, params in raw_requests
+                ]
+            )
         )
         return self.parse_multiple_responses(raw_res)
 
+    async def send_batch(
+        self,
+        raw_requests: list[tuple[str, list[Any] | None]],
+        retries: int = 0
+    ) -> list[Any]:
+        """Send multiple Geth requests in one JSON-RPC batch and return the
+        results in request order.
+
+        Unlike ``send_multiple``, the responses are matched to the requests by
+        id, since Geth does not promise the order of the responses in a batch.
+        A failed request does not fail the whole batch: its slot holds the
+        exception instead of the result. The failed slots, and only them, are
+        sent again in a new batch up to ``retries`` times. The results found
+        in the ``cache`` are not requested.
+
+        Args:
+            raw_requests: A list of tuples, where each tuple contains a string
+                ``method`` and a list of parameters ``params``. The parameters
+                can be ``None`` if there are no parameters for the method.
+            retries: The maximum number of times the failed slots are retried.
+
+        Returns:
+            A list with the same length and order as ``raw_requests``. Each
+            element is the result returned by Geth for that request, or an
+            exception of ``ethhelper.types.GethError`` if Geth responded with
+            an error, or of ``ethhelper.types.IdNotMatch`` if no response
+            matches the request id.
+
+        Raises:
+            httpx.RequestError: Raised when an HTTP request fails.
+            orjson.JSONDecodeError: Raised when the raw content cannot be json
+                decoded.
+        """
+        results: list[Any] = [None] * len(raw_requests)
+        reorgs = self.reorgs()
+        slots, keys = self._lookup_batch(raw_requests, results)
+        for attempt in range(retries + 1):
+            if len(slots) == 0:
+                break
+            if attempt > 0:
+                self.logger.info(
+                    f"Retry {len(slots)} failed requests of batch, "
+                    f"attempt {attempt}"
+                )
+            await self._send_batch_once(raw_requests, slots, results)
+            slots = [
+                slot for slot in slots if isinstance(results[slot], Exception)
+            ]
+        await self._cache_batch(raw_requests, keys, results, reorgs)
+        return results
+
+    def _lookup_batch(
+        self,
+        raw_requests: list[tuple[str, list[Any] | None]],
+        results: list[Any],
+    ) -> tuple[list[int], dict[int, bytes]]:
+        """Fill the results of a batch found in the ``cache``.
+
+        Args:
+            raw_requests: All requests, as the tuples of ``method`` and
+                ``params``.
+            results: The list receiving the results.
+
+        Returns:
+            The indexes of the requests to be sent, and the cache keys of the
+            requests to be sent whose results may be cached.
+        """
+        if self.cache is None:
+            return list(range(len(raw_requests))), {}
+        keys: dict[int, bytes] = {}
+        for slot, (method, params) in enumerate(raw_requests):
+            key = cache_key(method, params or [])
+            if key is not None:
+                keys[slot] = key
+        cached = self.cache.get_many(list(keys.values()))
+        hits: set[int] = set()
+        for slot, key in list(keys.items()):
+            value = cached.get(key)
+            if value is None and self.tracker is not None:
+                value = self.head_cache.get(key)
+            if value is not None:
+                results[slot] = orjson.loads(value)
+                hits.add(slot)
+                del keys[slot]
+        slots = [slot for slot in range(len(raw_requests)) if slot not in hits]
+        return slots, keys
+
+    async def _cache_batch(
+        self,
+        raw_requests: list[tuple[str, list[Any] | None]],
+        keys: dict[int, bytes],
+        results: list[Any],
+        reorgs: int | None,
+    ) -> None:
+        """Put the final results of a batch into the ``cache``.
+
+        Args:
+            raw_requests: All requests, as the tuples of ``method`` and
+                ``params``.
+            keys: The cache keys of the requests sent, see ``_lookup_batch``.
+            results: The results of all requests.
+            reorgs: The ``reorgs`` when the batch was sent.
+        """
+        if len(keys) == 0:
+            return
+        await self.cache_results(
+            [
+                (
+                    key,
+                    raw_requests[slot][0],
+                    raw_requests[slot][1] or [],
+                    results[slot]
+                )
+                for slot, key in keys.items()
+                if not isinstance(results[slot], Exception)
+            ],
+            reorgs
+        )
+
+    async def _send_batch_once(
+        self,
+        raw_requests: list[tuple[str, list[Any] | None]],
+        slots: list[int],
+        results: list[Any],
+    ) -> int:
+        """Send the requests of ``slots`` in one batch and store their results
+        or exceptions into the same slots of ``results``.
+
+        Args:
+            raw_requests: All requests, as the tuples of ``method`` and
+                ``params``.
+            slots: The indexes of the requests to be sent.
+            results: The list receiving the results.
+
+        Returns:
+            The size of the response in bytes.
+        """
+        ids: dict[int, int] = {}
+        requests: list[bytes] = []
+        for slot in slots:
+            method, params = raw_requests[slot]
+            id = self.next_id()
+            ids[id] = slot
+            requests.append(json.encode_request(id, method, params or []))
+        self.logger.debug(f"SEND BATCH {len(requests)} requests")
+        raw_res = await self.send_raw(json.encode_batch(requests))
+        success, errors = self.parse_multiple_responses(raw_res)
+        matched = self.match_responses(ids, success, errors)
+        for id, slot in ids.items():
+            results[slot] = matched[id]
+        return len(raw_res)
+
+    async def send_adaptive(
+        self,
+        raw_requests: list[tuple[str, list[Any] | None]],
+        key: str | None = None,
+        retries: int = 0,
+        initial: int = 100,
+    ) -> list[Any]:
+        """Send Geth requests in JSON-RPC batches of an adaptive size and
+        return the results in request order.
+
+        The requests are split into batches whose size is tuned by the
+        ``AdaptiveBatchSize`` of ``key`` from the observed latency and
+        response size. When Geth rejects a batch because the batch or the
+        response is too large, the size is halved and the rejected requests
+        are sent again in smaller batches, without counting as a retry. The
+        chosen sizes are reported by ``batch_stats``. The results found in the
+        ``cache`` are not requested.
+
+        Args:
+            raw_requests: A list of tuples, where each tuple contains a string
+                ``method`` and a list of parameters ``params``. The parameters
+                can be ``None`` if there are no parameters for the method.
+            key: The kind of the requests used to share the batch size between
+                calls. Defaults to the method of the first request.
+            retries: The maximum number of times a failed request is retried.
+            initial: The size of the first batch if the batch size of ``key``
+                does not exist yet.
+
+        Returns:
+            A list with the same length and order as ``raw_requests``, see
+            ``send_batch``.
+
+        Raises:
+            httpx.RequestError: Raised when an HTTP request fails.
+            orjson.JSONDecodeError: Raised when the raw content cannot be json
+                decoded.
+        """
+        results: list[Any] = [None] * len(raw_requests)
+        if len(raw_requests) == 0:
+            return results
+        if key is None:
+            key = raw_requests[0][0]
+        batch_size = self.batch_size(key, initial)
+        attempts = [0] * len(raw_requests)
+        reorgs = self.reorgs()
+        pending, keys = self._lookup_batch(raw_requests, results)
+        done = len(raw_requests) - len(pending)
+        while len(pending) != 0:
+            size = batch_size.size
+            slots, pending = pending[:size], pending[size:]
+            start = time.monotonic()
+            response_size = await self._send_batch_once(
+                raw_requests, slots, results
+            )
+            latency = time.monotonic() - start
+            failed = [
+                slot for slot in slots if isinstance(results[slot], Exception)
+            ]
+            if len(slots) > 1 and any(
+                "too large" in str(results[slot]) for slot in failed
+            ):
+                self.logger.info(
+                    f"Batch of {len(slots)} {key} is too large, split it"
+                )
+                batch_size.shrink(len(slots))
+                pending = failed + pending
+                done += len(slots) - len(failed)
+                continue
+            batch_size.observe(len(slots), latency, response_size)
+            for slot in failed:
+                attempts[slot] += 1
+                if attempts[slot] <= retries:
+                    pending.append(slot)
+            done += len(slots) - len(failed)
+            if len(raw_requests) > size:
+                self.logger.info(
+                    f"Batch {key} process: "
+                    f"{done / len(raw_requests) * 100:.2f} %"
+                )
+        await self._cache_batch(raw_requests, keys, results, reorgs)
+        return results
+
+    async def send_coalesced(self, request: GethRequest) -> Any:
+        """Queue a Geth request to be sent in a coalesced JSON-RPC batch and
+        wait for its result.
+
+        The first queued request schedules a flush after ``coalesce_window``
+        seconds. The queue is flushed at once when it reaches
+        ``coalesce_max_size`` requests. Responses are matched to the waiting
+        callers by id.
+
+        Args:
+            request: The Geth request to be sent.
+
+        Returns:
+            A basic type of object that represents the result returned by Geth
+            after executing the request.
+
+        Raises:
+            httpx.RequestError: Raised when the HTTP request of the batch
+                fails.
+            ethhelper.types.GethError: Raised when response is a Geth error.
+            ethhelper.types.IdNotMatch: Raised when no response matches the
+                request id.
+        """
+        loop = asyncio.get_running_loop()
+        future: Future[Any] = loop.create_future()
+        self.pending.append((request, future))
+        if len(self.pending) >= self.coalesce_max_size:
+            self.flush_pending()
+        elif self.flush_handle is None:
+            self.flush_handle = loop.call_later(
+                self.coalesce_window, self.flush_pending
+            )
+        return await future
+
+    def flush_pending(self) -> None:
+        """Send all queued requests of ``send_coalesced`` in one batch."""
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        batch, self.pending = self.pending, []
+        if len(batch) == 0:
+            return
+        task = asyncio.create_task(self._send_pending(batch))
+        self.flush_tasks.add(task)
+        task.add_done_callback(self.flush_tasks.discard)
+
+    async def _send_pending(
+        self, batch: list[tuple[GethRequest, Future[Any]]]
+    ) -> None:
+        """Send a coalesced batch and resolve the futures of its callers.
+
+        Args:
+            batch: The queued requests with the futures of their callers.
+        """
+        futures = {req.id: future for req, future in batch}
+        self.logger.debug(f"SEND COALESCED {len(batch)} requests")
+        try:
+            if len(batch) == 1:
+                raw_res = await self.send_raw(
+                    batch[0][0].encode(), batch[0][0].method
+                )
+                response = self.parse_response(raw_res)
+                if isinstance(response, GethSuccessResponse):
+                    success, errors = [response], []
+                else:
+                    success, errors = [], [response]
+            else:
+                raw_res = await self.send_raw(
+                    json.encode_batch([req.encode() for req, _ in batch])
+                )
+                success, errors = self.parse_multiple_responses(raw_res)
+        except Exception as e:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        matched = self.match_responses(futures, success, errors)
+        for id, future in futures.items():
+            if future.done():
+                continue
+            result = matched[id]
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
     async def is_connected(self) -> bool:
         """Checks the connectivity of the Geth node.
 
@@ -314,11 +1402,20 @@ class GethHttpWeb3(GethHttpAbstract):
     The ``logger`` is used to assign a logger of the Python logging module to
     this class. Explicitly assigning a logger can be used to control the output
     location of the logger, which is convenient for debugging.
+
+    The ``transport`` is the pooled HTTP transport used to send requests. The
+    requests of Web3.py are sent through it by ``GethWeb3Provider`` instead of
+    a separate session of ``web3.AsyncHTTPProvider``.
     """
 
-    def __init__(self, url: str, logger: Logger) -> None:
-        super().__init__(url, logger)
-        self.w3 = AsyncWeb3(AsyncHTTPProvider(self.url))
+    def __init__(
+        self,
+        url: str,
+        logger: Logger,
+        transport: GethHttpTransport | None = None
+    ) -> None:
+        super().__init__(url, logger, transport)
+        self.w3 = AsyncWeb3(GethWeb3Provider(self))
 
     async def is_connected(self) -> bool:
         """Checks the connectivity of the Geth node.
@@ -345,3 +1442,99 @@ class GethHttpWeb3(GethHttpAbstract):
                 "GethHttpWeb3 is not running in asyncio!"
             )
         return await connected
+
+
+class GethWeb3Provider(AsyncJSONBaseProvider):
+    """A Web3.py provider sending requests through the transport of a
+    connector.
+
+    The ``connector`` is the connector whose ``send_raw`` is used to send the
+    encoded requests of Web3.py, so that Web3.py shares the pooled transport
+    with the other interfaces.
+    """
+    def __init__(self, connector: GethHttpAbstract) -> None:
+        super().__init__()
+        self.connector = connector
+
+    def __str__(self) -> str:
+        return f"Geth connection {self.connector.url}"
+
+    async def make_request(
+        self, method: RPCEndpoint, params: Any
+    ) -> RPCResponse:
+        """Send a request of Web3.py to the Geth node, or answer it from the
+        ``cache`` of the connector, or from an identical read request in
+        flight if ``single_flight`` of the connector is ``True``.
+
+        Args:
+            method: The method name of the Geth HTTP interface to call.
+            params: A series of parameters formatted by Web3.py.
+
+        Returns:
+            The decoded JSON-RPC response.
+
+        Raises:
+            httpx.RequestError: Raised when an HTTP request fails.
+        """
+        raw = self.encode_rpc_request(method, params)
+        cache = self.connector.cache
+        shared = self.connector.single_flight and method in HEDGE_METHODS
+        if not shared and (cache is None or method not in CACHE_METHODS):
+            return typing.cast(
+                RPCResponse,
+                orjson.loads(await self.connector.send_raw(raw, method))
+            )
+        request = orjson.loads(raw)
+        key: bytes | None = None
+        if cache is not None:
+            pinned = self.connector.pin_latest(method, request["params"])
+            if pinned is not request["params"]:
+                request["params"] = pinned
+                raw = json.encode_request(request["id"], method, pinned)
+            key = cache_key(method, pinned)
+            if key is not None:
+                cached = self.connector.cache_lookup(key)
+                if cached is not None:
+                    return typing.cast(
+                        RPCResponse,
+                        {
+                            "jsonrpc": "2.0",
+                            "id": request["id"],
+                            "result": orjson.loads(cached),
+                        }
+                    )
+        if not shared:
+            return typing.cast(
+                RPCResponse,
+                await self._request(raw, method, request["params"], key)
+            )
+        response = await self.connector.flights.do(
+            ("web3", request_key(method, request["params"])),
+            functools.partial(
+                self._request, raw, method, request["params"], key
+            )
+        )
+        return typing.cast(RPCResponse, {**response, "id": request["id"]})
+
+    async def _request(
+        self, raw: bytes, method: str, params: list[Any], key: bytes | None
+    ) -> dict[str, Any]:
+        """Send an encoded request of Web3.py, and put its result into the
+        ``cache`` of the connector if ``key`` is given.
+
+        Args:
+            raw: The encoded request.
+            method: The method name of the request.
+            params: The params of the request in the json form of Geth.
+            key: The cache key of the request, see ``cache_key``.
+
+        Returns:
+            The decoded JSON-RPC response.
+        """
+        reorgs = self.connector.reorgs()
+        response = orjson.loads(await self.connector.send_raw(raw, method))
+        if key is not None and "result" in response:
+            await self.connector.cache_result(
+                key, method, params, response["result"], reorgs
+            )
+        return typing.cast(dict[str, Any], response)
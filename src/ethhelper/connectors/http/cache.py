@@ -0,0 +1,205 @@
+import typing
+from typing import (
+    Any,
+)
+
+import orjson
+
+from ethhelper.utils import (
+    json,
+)
+
+TX_METHODS = frozenset(
+    [
+        "eth_getTransactionByHash",
+        "eth_getTransactionReceipt",
+    ]
+)
+"""The methods whose result is immutable once its block is final."""
+
+IMMUTABLE_METHODS = frozenset(
+    [
+        "eth_chainId",
+        "eth_getBlockByHash",
+        "eth_getBlockTransactionCountByHash",
+        "eth_getHeaderByHash",
+        "eth_getRawTransactionByBlockHashAndIndex",
+        "eth_getRawTransactionByHash",
+        "eth_getTransactionByBlockHashAndIndex",
+    ]
+)
+"""The methods whose result never changes once it exists, since they are
+addressed by a hash of the content.
+"""
+
+BLOCK_PARAMS = {
+    "eth_call": 1,
+    "eth_getBalance": 1,
+    "eth_getBlockByNumber": 0,
+    "eth_getBlockReceipts": 0,
+    "eth_getBlockTransactionCountByNumber": 0,
+    "eth_getCode": 1,
+    "eth_getHeaderByNumber": 0,
+    "eth_getRawTransactionByBlockNumberAndIndex": 0,
+    "eth_getStorageAt": 2,
+    "eth_getTransactionByBlockNumberAndIndex": 0,
+    "eth_getTransactionCount": 1,
+}
+"""The methods whose result is immutable once the block given by one of their
+params is final, with the index of that param.
+"""
+
+CACHE_METHODS = TX_METHODS | IMMUTABLE_METHODS | BLOCK_PARAMS.keys()
+"""All methods whose results may be cached."""
+
+
+def block_height(block_id: Any) -> int | None:
+    """Get the height a block param of a request is pinned to.
+
+    Args:
+        block_id: The block param in the json form of Geth, a hex number, a
+            tag, a block hash, or an EIP-1898 object.
+
+    Returns:
+        The block height, ``-1`` if the block is given by its hash, or
+        ``None`` if the param is a moving tag such as ``latest``.
+    """
+    if isinstance(block_id, dict):
+        if "blockHash" in block_id:
+            return -1
+        block_id = block_id.get("blockNumber")
+    if isinstance(block_id, int):
+        return block_id
+    if not isinstance(block_id, str):
+        return None
+    if block_id == "earliest":
+        return 0
+    if not block_id.startswith("0x"):
+        return None
+    if len(block_id) == 66:
+        return -1
+    return int(block_id, 16)
+
+
+def request_key(method: str, params: list[Any]) -> bytes:
+    """Get the key of a request, equal for the requests with the same method
+    and params.
+
+    Args:
+        method: The method of the request.
+        params: The params of the request in the json form of Geth.
+
+    Returns:
+        The method and the canonical json params.
+    """
+    return method.encode() + orjson.dumps(
+        params, default=json.encode_my_class, option=orjson.OPT_SORT_KEYS
+    )
+
+
+def cache_key(method: str, params: list[Any]) -> bytes | None:
+    """Get the cache key of a request.
+
+    Args:
+        method: The method of the request.
+        params: The params of the request in the json form of Geth.
+
+    Returns:
+        The method and the canonical json params, or ``None`` if the result
+        of the request may change, so it is never cached.
+    """
+    if method not in CACHE_METHODS:
+        return None
+    index = BLOCK_PARAMS.get(method)
+    if index is not None and block_height(
+        params[index] if len(params) > index else "latest"
+    ) is None:
+        return None
+    return request_key(method, params)
+
+
+def result_height(method: str, params: list[Any], result: Any) -> int | None:
+    """Get the height of the block a result depends on.
+
+    Args:
+        method: The method of the request.
+        params: The params of the request in the json form of Geth.
+        result: The json decoded result.
+
+    Returns:
+        The block height, ``-1`` if the result can never change, or ``None``
+        if the result must not be cached, such as a missing or pending
+        object.
+    """
+    if result is None or (result == "0x" and "Raw" in method):
+        return None
+    if method in IMMUTABLE_METHODS:
+        return -1
+    if method in TX_METHODS:
+        number = result.get("blockNumber")
+        return None if number is None else int(number, 16)
+    index = BLOCK_PARAMS[method]
+    return block_height(params[index] if len(params) > index else "latest")
+
+
+def result_block_hash(method: str, result: Any) -> str | None:
+    """Get the hash of the block a result comes from, if the result tells it.
+
+    Args:
+        method: The method of the request.
+        result: The json decoded result.
+
+    Returns:
+        The block hash, or ``None`` if the result does not contain it, such
+        as the result of ``eth_call``.
+    """
+    if method in TX_METHODS:
+        return typing.cast(str | None, result.get("blockHash"))
+    if method in ("eth_getBlockByNumber", "eth_getHeaderByNumber"):
+        return typing.cast(str | None, result.get("hash"))
+    if method == "eth_getBlockReceipts" and len(result) != 0:
+        return typing.cast(str | None, result[0].get("blockHash"))
+    return None
+
+
+def log_filter_key(filter: dict[str, Any]) -> bytes:
+    """Get the key of the address and topics of a log filter, under which
+    the logs are cached by block range.
+
+    Args:
+        filter: The filter param of ``eth_getLogs`` in the json form of Geth,
+            whose block range is ignored.
+
+    Returns:
+        The canonical json of the lowercase address and topics, so that the
+        same filter always has the same key.
+    """
+    address = filter.get("address")
+    if isinstance(address, str):
+        address = address.lower()
+    elif address is not None:
+        address = sorted({addr.lower() for addr in address})
+    topics: list[Any] = []
+    for topic in filter.get("topics") or []:
+        if isinstance(topic, str):
+            topics.append(topic.lower())
+        elif topic is None:
+            topics.append(None)
+        else:
+            topics.append(sorted({top.lower() for top in topic}))
+    return orjson.dumps(
+        {"address": address, "topics": topics}, option=orjson.OPT_SORT_KEYS
+    )
+
+
+def block_logs_key(filter: bytes, height: int) -> bytes:
+    """Get the cache key of the logs of one block.
+
+    Args:
+        filter: The key of the log filter, see ``log_filter_key``.
+        height: The block height.
+
+    Returns:
+        The key of the logs of the block matching the filter.
+    """
+    return b"eth_getLogs" + filter + b"%d" % height
@@ -1,18 +1,25 @@
-from datetime import (
-    datetime,
-)
+import functools
 from logging import (
     Logger,
 )
 import traceback
+import typing
 from typing import (
     Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterator,
     Sequence,
 )
 
 from eth_typing import (
     BlockNumber,
 )
+from httpx import (
+    TimeoutException,
+)
+import orjson
 
 from ethhelper.datatypes.eth import (
     Address,
@@ -23,14 +30,28 @@ from ethhelper.datatypes.eth import (
 )
 from ethhelper.datatypes.geth import (
     GethError,
+    GethErrorDetail,
+)
+from ethhelper.utils import (
+    stream,
 )
 
+from .cache import (
+    block_logs_key,
+    log_filter_key,
+)
 from .eth import (
     GethEthHttp,
 )
+from .limiter import (
+    bulk,
+)
 from .net import (
     GethNetHttp,
 )
+from .transport import (
+    GethHttpTransport,
+)
 from .txpool import (
     GethTxpoolHttp,
 )
@@ -48,9 +69,16 @@ class GethCustomHttp(GethEthHttp, GethNetHttp, GethTxpoolHttp):
     The ``logger`` is used to assign a logger of the Python logging module to
     this class. Explicitly assigning a logger can be used to control the output
     location of the logger, which is convenient for debugging.
+
+    The ``transport`` is the pooled HTTP transport used to send requests.
     """
-    def __init__(self, url: str, logger: Logger) -> None:
-        super().__init__(url, logger)
+    def __init__(
+        self,
+        url: str,
+        logger: Logger,
+        transport: GethHttpTransport | None = None
+    ) -> None:
+        super().__init__(url, logger, transport)
 
     async def test_connection(self) -> bool:
         """Test connectivity to the Geth node via both Web3.py and the
@@ -76,6 +104,9 @@ class GethCustomHttp(GethEthHttp, GethNetHttp, GethTxpoolHttp):
         """Retrieve a list of logs from the Geth node using the given
         ``FilterParams``.
 
+        The logs are fetched by one ``eth_getLogs`` request through the
+        customized interface, without installing a filter on the node.
+
         Args:
             filter: A FilterParams object used to specify filter parameters for
                 the logs.
@@ -88,22 +119,67 @@ class GethCustomHttp(GethEthHttp, GethNetHttp, GethTxpoolHttp):
             ethhelper.types.GethError: Raised when the Geth node returns an
                 error.
         """
-        async_filter = await self.eth_filter(filter)
-        logs = await async_filter.get_all_entries()
-        await self.eth_uninstall_filter(async_filter)
+        logs = await self.send("eth_getLogs", [filter.to_geth()])
         return [Log.parse_obj(log) for log in logs]
 
+    @bulk
+    async def get_logs_multiple(
+        self, filters: list[FilterParams], retries: int = 2
+    ) -> list[list[Log]]:
+        """Retrieve the logs of several ``FilterParams`` by ``eth_getLogs``
+        requests packed into one JSON-RPC batch.
+
+        Args:
+            filters: A list of FilterParams objects, usually for different
+                block ranges.
+            retries: The maximum number of times the failed requests of the
+                batch are retried.
+
+        Returns:
+            A list of lists of Log objects, in the same order as ``filters``.
+
+        Raises:
+            ethhelper.types.GethError: Raised when the Geth node still returns
+                errors after retrying.
+            ethhelper.types.IdNotMatch: Raised when the Geth node still returns
+                no response for some filters after retrying.
+        """
+        responses = await self.send_batch(
+            [("eth_getLogs", [filter.to_geth()]) for filter in filters],
+            retries
+        )
+        self._raise_batch_errors(responses)
+        return [[Log.parse_obj(log) for log in logs] for logs in responses]
+
+    @bulk
     async def get_logs_by_blocks(
         self,
         start_height: BlockNumber,
         end_height: BlockNumber,
         address: Address | list[Address] | None = None,
         topics: Sequence[Hash32 | Sequence[Hash32]] | None = None,
-        step: int = 200
+        step: int | None = None,
+        concurrency: int = 4,
+        max_step: int = 100000,
+        target_logs: int = 5000
     ) -> list[Log]:
         """Retrieve a list of logs within a range of blocks specified by block
         heights.
 
+        The range is split into chunks fetched concurrently, with at most
+        ``concurrency`` requests in flight. A chunk that fails because it
+        contains too many logs (for example Geth's "query returned more than
+        10000 results") or times out is bisected and fetched again. The logs
+        are merged in ``(block_number, log_index)`` order.
+
+        If the ``cache`` of the connector keeps logs, such as a
+        ``SqliteCache``, the logs of the final part of the range are read
+        from it, and only the blocks it does not cover yet are fetched and
+        then added to it. The logs of the blocks above the final block height
+        are cached by block in the ``head_cache`` if the connector follows
+        the chain by ``track_chain``, and are fetched from the Geth node
+        otherwise.
+
         Args:
             start_height: The block height to start retrieving logs from.
             end_height: The block height to stop retrieving logs from.
@@ -111,7 +187,15 @@ class GethCustomHttp(GethEthHttp, GethNetHttp, GethTxpoolHttp):
             topics: A list of topics or nested lists of topics to filter the
                 logs by.
             step: The maximum number of blocks per request, preventing a single
-                request from requiring too much memory and taking too long.
+                request from requiring too much memory and taking too long. If
+                ``None``, the chunk size starts from ``200`` blocks and is
+                tuned adaptively: it grows in sparse regions towards
+                ``target_logs`` logs per chunk, up to ``max_step`` blocks, and
+                shrinks when a chunk is bisected.
+            concurrency: The maximum number of chunks fetched concurrently.
+            max_step: The upper bound of the adaptive chunk size.
+            target_logs: The number of logs per chunk that the adaptive chunk
+                size aims at.
 
         Returns:
             A list of Log objects parsed from the logs returned by the Geth
@@ -119,104 +203,543 @@ class GethCustomHttp(GethEthHttp, GethNetHttp, GethTxpoolHttp):
 
         Raises:
             ethhelper.types.GethError: Raised when the Geth node returns an
-                error.
+                error which cannot be solved by bisecting the chunk.
+        """
+        fetch = functools.partial(
+            self._fetch_logs_by_blocks,
+            address=address,
+            topics=topics,
+            step=step,
+            concurrency=concurrency,
+            max_step=max_step,
+            target_logs=target_logs
+        )
+        return await self._get_logs_cached(
+            start_height, end_height, address, topics, fetch
+        )
+
+    async def _get_logs_cached(
+        self,
+        start_height: BlockNumber,
+        end_height: BlockNumber,
+        address: Address | list[Address] | None,
+        topics: Sequence[Hash32 | Sequence[Hash32]] | None,
+        fetch: Callable[[BlockNumber, BlockNumber], Awaitable[list[Log]]]
+    ) -> list[Log]:
+        """Retrieve the logs within a range of blocks through the ``cache``
+        and the ``head_cache``, fetching only the blocks they do not cover.
+
+        See ``get_logs_by_blocks`` for the caches used.
+
+        Args:
+            start_height: The block height to start retrieving logs from.
+            end_height: The block height to stop retrieving logs from.
+            address: An address or list of addresses to filter the logs by.
+            topics: A list of topics or nested lists of topics to filter the
+                logs by.
+            fetch: The coroutine function fetching the logs of a range of
+                blocks from the Geth node.
+
+        Returns:
+            A list of Log objects in ``(block_number, log_index)`` order.
         """
-        if end_height - start_height > step:
-            results: list[Log] = []
+        cache = self.cache
+        if cache is None or (not cache.supports_logs and self.tracker is None):
+            return await fetch(start_height, end_height)
+        filter = FilterParams(  # type: ignore
+            address=address, topics=topics
+        )
+        key = log_filter_key(filter.to_geth())
+        final = BlockNumber(
+            end_height if await self.is_final(end_height)
+            else min(end_height, self.final_height)
+        )
+        results: list[Log] = []
+        if final >= start_height:
+            if cache.supports_logs:
+                results = await self._get_final_logs(
+                    key, start_height, final, fetch
+                )
+            else:
+                results = await fetch(start_height, final)
+        if final < end_height:
+            results += await self._get_head_logs(
+                key, BlockNumber(max(start_height, final + 1)), end_height,
+                fetch
+            )
+        return results
+
+    async def _get_final_logs(
+        self,
+        key: bytes,
+        start_height: BlockNumber,
+        end_height: BlockNumber,
+        fetch: Callable[[BlockNumber, BlockNumber], Awaitable[list[Log]]]
+    ) -> list[Log]:
+        """Retrieve the logs of a range of final blocks through the ``cache``,
+        fetching only the blocks it does not cover yet.
+
+        Args:
+            key: The key of the log filter, see ``log_filter_key``.
+            start_height: The block height to start retrieving logs from.
+            end_height: The block height to stop retrieving logs from.
+            fetch: The coroutine function fetching the logs of a range of
+                blocks from the Geth node.
+
+        Returns:
+            A list of Log objects in ``(block_number, log_index)`` order.
+        """
+        assert self.cache is not None
+        cache = self.cache
+        for start, end in cache.log_gaps(key, start_height, end_height):
+            logs = await fetch(BlockNumber(start), BlockNumber(end))
+            cache.put_logs(
+                key,
+                start,
+                end,
+                [
+                    (
+                        log.block_number,
+                        log.log_index,
+                        log.json(by_alias=True).encode()
+                    )
+                    for log in logs
+                ]
+            )
+        return [
+            Log.parse_raw(log)
+            for log in cache.get_logs(key, start_height, end_height)
+        ]
+
+    async def _get_head_logs(
+        self,
+        key: bytes,
+        start_height: BlockNumber,
+        end_height: BlockNumber,
+        fetch: Callable[[BlockNumber, BlockNumber], Awaitable[list[Log]]]
+    ) -> list[Log]:
+        """Retrieve the logs of a range of blocks that are not final yet
+        through the ``head_cache``, by block.
+
+        The blocks tracked by the ``tracker`` are looked up in the
+        ``head_cache``, and the runs of missing blocks are fetched and then
+        cached, unless a reorg happened meanwhile or the hash of a log is not
+        the tracked hash of its block. The other blocks are always fetched.
+
+        Args:
+            key: The key of the log filter, see ``log_filter_key``.
+            start_height: The block height to start retrieving logs from.
+            end_height: The block height to stop retrieving logs from.
+            fetch: The coroutine function fetching the logs of a range of
+                blocks from the Geth node.
+
+        Returns:
+            A list of Log objects in ``(block_number, log_index)`` order.
+        """
+        tracker = self.tracker
+        if tracker is None or not tracker.is_live():
+            return await fetch(start_height, end_height)
+        first = max(start_height, tracker.tail)
+        last = min(end_height, tracker.head)
+        results: list[Log] = []
+        if start_height < first:
+            results += await fetch(
+                start_height, BlockNumber(min(end_height, first - 1))
+            )
+        cached = {
+            height: self.head_cache.get(block_logs_key(key, height))
+            for height in range(first, last + 1)
+        }
+        height = first
+        while height <= last:
+            value = cached[height]
+            if value is not None:
+                results += [Log.parse_obj(log) for log in orjson.loads(value)]
+                height += 1
+                continue
+            end = height
+            while end < last and cached[end + 1] is None:
+                end += 1
+            reorgs = tracker.reorgs
+            logs = await fetch(BlockNumber(height), BlockNumber(end))
+            results += logs
+            if tracker.reorgs == reorgs:
+                self._cache_head_logs(key, height, end, logs)
+            height = end + 1
+        if last < end_height:
+            results += await fetch(
+                BlockNumber(max(start_height, last + 1)), end_height
+            )
+        return results
+
+    def _cache_head_logs(
+        self, key: bytes, start: int, end: int, logs: list[Log]
+    ) -> None:
+        """Put the logs of a range of tracked blocks into the ``head_cache``,
+        by block.
+
+        Args:
+            key: The key of the log filter, see ``log_filter_key``.
+            start: The first block of the range.
+            end: The last block of the range.
+            logs: All logs of the range.
+        """
+        assert self.tracker is not None
+        blocks: dict[int, list[Log]] = {
+            height: [] for height in range(start, end + 1)
+        }
+        for log in logs:
+            blocks[log.block_number].append(log)
+        for height, block_logs in blocks.items():
+            block_hash = self.tracker.hash_at(height)
+            if block_hash is None or any(
+                str(log.block_hash) != block_hash for log in block_logs
+            ):
+                continue
+            block_key = block_logs_key(key, height)
+            self.head_cache.put(
+                block_key,
+                b"[" + b",".join(
+                    log.json(by_alias=True).encode() for log in block_logs
+                ) + b"]"
+            )
+            self.head_keys.setdefault(height, []).append(
+                (block_hash, block_key)
+            )
+
+    async def _fetch_logs_by_blocks(
+        self,
+        start_height: BlockNumber,
+        end_height: BlockNumber,
+        address: Address | list[Address] | None,
+        topics: Sequence[Hash32 | Sequence[Hash32]] | None,
+        step: int | None,
+        concurrency: int,
+        max_step: int,
+        target_logs: int
+    ) -> list[Log]:
+        """Retrieve the logs within a range of blocks from the Geth node,
+        without the cache.
+
+        See ``get_logs_by_blocks`` for the arguments.
+
+        Returns:
+            A list of Log objects in ``(block_number, log_index)`` order.
+        """
+        size = 200 if step is None else step
+        self.logger.info(
+            f"Try to get logs from {start_height} to {end_height}, "
+            f"call per {size} blocks"
+        )
+        done = 0
+        total = end_height - start_height + 1
+
+        def bisected(start: int, end: int) -> None:
+            nonlocal size
             self.logger.info(
-                f"Try to get logs from {start_height} to {end_height}, "
-                f"call per {step} blocks"
+                f"Logs from {start} to {end} are too dense, bisect it"
             )
-            for i in range(start_height, end_height + 1, step + 1):
-                results += await self.get_logs_by_blocks(
+            size = max(1, min(size, (end - start + 1) // 2))
+
+        def fetched(start: int, end: int, logs: list[Log]) -> None:
+            nonlocal size, done
+            if step is None:
+                ratio = target_logs / max(len(logs), 1)
+                ratio = max(0.5, min(ratio, 2))
+                blocks = end - start + 1
+                size = max(1, min(int(blocks * ratio), max_step))
+            done += end - start + 1
+            self.logger.info(f"Get logs process: {done / total * 100:.2f} %")
+
+        return await stream.fetch_ranges(
+            start_height,
+            end_height,
+            lambda start, end: self._get_logs_chunk(
+                BlockNumber(start), BlockNumber(end), address, topics
+            ),
+            lambda: size,
+            self._is_logs_too_dense,
+            concurrency,
+            bisected,
+            fetched
+        )
+
+    async def iter_logs(
+        self,
+        start_height: BlockNumber,
+        end_height: BlockNumber,
+        address: Address | list[Address] | None = None,
+        topics: Sequence[Hash32 | Sequence[Hash32]] | None = None,
+        step: int = 2000,
+        prefetch: int = 4
+    ) -> AsyncIterator[list[Log]]:
+        """Iterate over the logs within a range of blocks chunk by chunk.
+
+        Unlike ``get_logs_by_blocks``, the logs are not collected in memory.
+        At most ``prefetch`` chunks are requested ahead of the consumer, and
+        no more are requested until the consumer takes the next chunk. A
+        chunk with too many logs is bisected transparently.
+
+        Args:
+            start_height: The block height to start retrieving logs from.
+            end_height: The block height to stop retrieving logs from.
+            address: An address or list of addresses to filter the logs by.
+            topics: A list of topics or nested lists of topics to filter the
+                logs by.
+            step: The number of blocks per chunk.
+            prefetch: The maximum number of chunks requested ahead of the
+                consumer.
+
+        Yields:
+            A list of Log objects of each chunk, in block order.
+
+        Raises:
+            ethhelper.types.GethError: Raised when the Geth node returns an
+                error which cannot be solved by bisecting the chunk.
+        """
+        def factories() -> Iterator[Callable[[], Awaitable[list[Log]]]]:
+            for i in range(start_height, end_height + 1, step):
+                yield functools.partial(
+                    self._get_logs_bisect,
                     BlockNumber(i),
-                    BlockNumber(min(end_height, i + step)),
+                    BlockNumber(min(end_height, i + step - 1)),
                     address,
-                    topics,
-                    step
+                    topics
                 )
-            return results
-        else:
-            self.logger.info(f"Get logs from {start_height} to {end_height}")
-            fliter_params = FilterParams(  # type: ignore
-                address = address,
-                from_block = start_height,  # type: ignore
-                to_block = end_height,  # type: ignore
-                topics = topics
+
+        async for logs in stream.prefetch(factories(), prefetch):
+            yield logs
+
+    @bulk
+    async def _get_logs_bisect(
+        self,
+        start_height: BlockNumber,
+        end_height: BlockNumber,
+        address: Address | list[Address] | None,
+        topics: Sequence[Hash32 | Sequence[Hash32]] | None
+    ) -> list[Log]:
+        """Retrieve the logs of one chunk of blocks, bisecting it while it has
+        too many logs.
+
+        Args:
+            start_height: The block height to start retrieving logs from.
+            end_height: The block height to stop retrieving logs from.
+            address: An address or list of addresses to filter the logs by.
+            topics: A list of topics or nested lists of topics to filter the
+                logs by.
+
+        Returns:
+            A list of Log objects.
+        """
+        try:
+            return await self._get_logs_chunk(
+                start_height, end_height, address, topics
+            )
+        except Exception as e:
+            if end_height == start_height or not self._is_logs_too_dense(e):
+                raise
+        middle = BlockNumber((start_height + end_height) // 2)
+        self.logger.info(
+            f"Logs from {start_height} to {end_height} are too dense, "
+            "bisect it"
+        )
+        logs = await self._get_logs_bisect(
+            start_height, middle, address, topics
+        )
+        logs.extend(
+            await self._get_logs_bisect(
+                BlockNumber(middle + 1), end_height, address, topics
             )
-            return await self.get_logs(fliter_params)
+        )
+        return logs
 
-    async def _binary_search(
-        self, start: BlockNumber, end: BlockNumber, target: int
-    ) -> BlockNumber:
+    async def _get_logs_chunk(
+        self,
+        start_height: BlockNumber,
+        end_height: BlockNumber,
+        address: Address | list[Address] | None,
+        topics: Sequence[Hash32 | Sequence[Hash32]] | None
+    ) -> list[Log]:
+        """Retrieve the logs of one chunk of blocks.
+
+        Args:
+            start_height: The block height to start retrieving logs from.
+            end_height: The block height to stop retrieving logs from.
+            address: An address or list of addresses to filter the logs by.
+            topics: A list of topics or nested lists of topics to filter the
+                logs by.
+
+        Returns:
+            A list of Log objects.
         """
-        Perform binary search to find the block height which is closest to the
-        target timestamp.
+        self.logger.debug(f"Get logs from {start_height} to {end_height}")
+        fliter_params = FilterParams(  # type: ignore
+            address = address,
+            from_block = start_height,  # type: ignore
+            to_block = end_height,  # type: ignore
+            topics = topics
+        )
+        return await self.get_logs(fliter_params)
+
+    def _is_logs_too_dense(self, exception: BaseException) -> bool:
+        """Check whether a chunk of logs failed because it is too large.
 
         Args:
-            start: The start block height to search from.
-            end: The end block height to search to.
-            target: The target timestamp to search for.
+            exception: The exception raised by fetching the chunk.
 
         Returns:
-            A ``BlockNumber`` instance that represents the block height which
-            is closest to the target timestamp.
+            ``True`` if the chunk should be bisected.
         """
-        middle = (start + end) // 2
-        ts = (await self.eth_get_block(BlockNumber(middle))).timestamp
-        if end - start <= 1:
-            if ts >= target:
-                return start
-            else:
-                return end
-        if ts == target:
-            return BlockNumber(middle)
-        if ts > target:
-            return await self._binary_search(
-                start, BlockNumber(middle), target
+        if isinstance(exception, TimeoutException):
+            return True
+        message = str(exception).lower()
+        return any(
+            hint in message for hint in (
+                "more than",
+                "too large",
+                "too many",
+                "limit exceeded",
+                "timeout",
+                "timed out",
             )
-        else:
-            return await self._binary_search(BlockNumber(middle), end, target)
+        )
 
-    async def get_height_after_ts(self, timestamp: int) -> BlockNumber:
+    async def _get_timestamps(
+        self, numbers: list[int]
+    ) -> dict[int, int | None]:
         """
-        Get the block height closest to the target timestamp.
+        Get the timestamps of blocks by one batch of header requests.
+
+        Args:
+            numbers: The block numbers.
+
+        Returns:
+            A dictionary mapping the block numbers to their timestamps, or to
+            ``None`` if the block does not exist yet.
+
+        Raises:
+            ethhelper.types.GethError: Raised when the Geth node returns
+                errors.
+        """
+        responses = await self.send_batch(
+            [("eth_getHeaderByNumber", [hex(number)]) for number in numbers],
+            retries=2
+        )
+        self._raise_batch_errors(responses)
+        return {
+            number: None if header is None else int(header["timestamp"], 16)
+            for number, header in zip(numbers, responses)
+        }
+
+    async def get_height_after_ts(
+        self,
+        timestamp: int,
+        probes: int = 32,
+        block_time: float = 12
+    ) -> BlockNumber:
+        """
+        Get the first block height whose timestamp is not earlier than the
+        target timestamp.
+
+        This function runs a k-ary interpolation search. Each round estimates
+        the position of the target by interpolating between the known bounds,
+        or from ``block_time`` (the fixed slot time after the Merge) while
+        only the upper bound is known, and sends ``probes`` block numbers
+        around the estimate in one batch of header-only requests. Usually the
+        height is found in two or three rounds.
 
         Args:
             timestamp: The target timestamp in seconds since the epoch.
+            probes: The number of blocks probed per round.
+            block_time: The expected seconds between two blocks.
 
         Returns:
             A ``BlockNumber`` instance that represents the block height closest
-            to the target timestamp.
+            to the target timestamp. If the target is after the latest block,
+            it is the height of the next block.
         """
-        height_now: int = await self.eth_block_number()
-        ts_now = int(datetime.now().timestamp())
-        if timestamp >= ts_now:
-            return BlockNumber(height_now + 1)
-        td = ts_now - timestamp
-        pos_lower = height_now - (td // 12) - 5
-        pos_upper = height_now - (td // 24) + 5
-        if pos_upper > height_now:
-            pos_upper = height_now
-        return await self._binary_search(
-            BlockNumber(pos_lower), BlockNumber(pos_upper), timestamp
+        head = await self.send("eth_getHeaderByNumber", ["latest"])
+        hi, hi_ts = int(head["number"], 16), int(head["timestamp"], 16)
+        if timestamp > hi_ts:
+            return BlockNumber(hi + 1)
+        lo, lo_ts = -1, None
+        rounds = 0
+        while hi - lo > 1:
+            rounds += 1
+            gap = hi - lo - 1
+            if gap <= probes * 2:
+                step = -(-gap // probes)
+                numbers = list(range(lo + 1, hi, step))
+            else:
+                if lo_ts is None:
+                    distance = (hi_ts - timestamp) / block_time
+                    estimate = hi - distance
+                    width = max(probes, distance * 0.1)
+                else:
+                    estimate = lo + (hi - lo) * (
+                        (timestamp - lo_ts) / (hi_ts - lo_ts)
+                    )
+                    width = max(probes, gap * 0.05)
+                step = max(1, int(width * 2 / probes))
+                numbers = sorted({
+                    min(hi - 1, max(lo + 1, int(estimate) + j * step))
+                    for j in range(-(probes // 2), probes - probes // 2)
+                })
+            timestamps = await self._get_timestamps(numbers)
+            for number in numbers:
+                ts = timestamps[number]
+                if ts is None or ts >= timestamp:
+                    if number < hi:
+                        hi, hi_ts = number, ts or hi_ts
+                elif number > lo:
+                    lo, lo_ts = number, ts
+        self.logger.debug(
+            f"Found height {hi} after {timestamp} in {rounds} rounds"
         )
+        return BlockNumber(hi)
 
+    @bulk
     async def get_blocks_by_numbers(
-        self, numbers: list[BlockNumber], step: int = 200
+        self,
+        numbers: list[BlockNumber],
+        step: int | None = None,
+        retries: int = 2
     ) -> list[Block]:
         """
         Get the blocks with the given block numbers.
 
+        The blocks are returned in the order of ``numbers``. If some blocks of
+        a batch fail, only those blocks are fetched again, up to ``retries``
+        times.
+
         Args:
             numbers: The block numbers.
             step: The maximum number of blocks per request, preventing a single
-                request from requiring too much memory and taking too long.
+                request from requiring too much memory and taking too long. If
+                ``None``, the number of blocks per request is tuned
+                adaptively by ``send_adaptive``.
+            retries: The maximum number of times the failed blocks of a batch
+                are retried.
 
         Returns:
             A list of ``Block`` instances that represent the blocks with the
             given block numbers.
+
+        Raises:
+            ethhelper.types.GethError: Raised when the Geth node still returns
+                errors after retrying.
+            ethhelper.types.IdNotMatch: Raised when the Geth node still returns
+                no response for some blocks after retrying.
         """
+        requests: list[tuple[str, list[Any] | None]] = [
+            ("eth_getBlockByNumber", [hex(number), False])
+            for number in numbers
+        ]
+        if step is None:
+            responses = await self.send_adaptive(
+                requests, retries=retries, initial=200
+            )
+            return self._parse_blocks(responses)
         if len(numbers) > step:
             results: list[Block] = []
             self.logger.info(
@@ -224,7 +747,7 @@ class GethCustomHttp(GethEthHttp, GethNetHttp, GethTxpoolHttp):
             )
             for i in range(0, len(numbers), step):
                 results += await self.get_blocks_by_numbers(
-                    numbers[i:min(i+step, len(numbers))], step
+                    numbers[i:min(i+step, len(numbers))], step, retries
                 )
                 self.logger.info(
                     "Get blocks process: "
@@ -232,16 +755,99 @@ class GethCustomHttp(GethEthHttp, GethNetHttp, GethTxpoolHttp):
                 )
             return results
         else:
-            requests: list[tuple[str, list[Any] | None]] = []
-            for number in numbers:
-                requests.append(("eth_getBlockByNumber", [hex(number), False]))
-            success, errors = await self.send_multiple(requests)
-            if len(errors) != 0:
-                raise GethError(error=[err.error for err in errors])
-            return [Block.parse_obj(suc.result) for suc in success]
+            responses = await self.send_batch(requests, retries)
+            return self._parse_blocks(responses)
+
+    async def iter_blocks(
+        self,
+        start: BlockNumber,
+        end: BlockNumber,
+        step: int | None = None,
+        prefetch: int = 4,
+        retries: int = 2
+    ) -> AsyncIterator[list[Block]]:
+        """Iterate over the blocks within a range of block numbers chunk by
+        chunk.
+
+        Unlike ``get_blocks_by_numbers_range``, the blocks are not collected
+        in memory. At most ``prefetch`` chunks are requested ahead of the
+        consumer, and no more are requested until the consumer takes the next
+        chunk.
 
+        Args:
+            start: The start block number.
+            end: The end block number.
+            step: The number of blocks per chunk. If ``None``, each chunk takes
+                the current adaptive batch size of ``eth_getBlockByNumber``.
+            prefetch: The maximum number of chunks requested ahead of the
+                consumer.
+            retries: The maximum number of times the failed blocks of a chunk
+                are retried.
+
+        Yields:
+            A list of ``Block`` instances of each chunk, in block order.
+
+        Raises:
+            ethhelper.types.GethError: Raised when the Geth node still returns
+                errors after retrying.
+        """
+        def factories() -> Iterator[Callable[[], Awaitable[list[Block]]]]:
+            i = start
+            while i <= end:
+                size = step
+                if size is None:
+                    size = self.batch_size("eth_getBlockByNumber", 200).size
+                j = min(end, i + size - 1)
+                yield functools.partial(
+                    self.get_blocks_by_numbers,
+                    [BlockNumber(n) for n in range(i, j + 1)],
+                    step,
+                    retries
+                )
+                i = BlockNumber(j + 1)
+
+        async for blocks in stream.prefetch(factories(), prefetch):
+            yield blocks
+
+    def _parse_blocks(self, responses: list[Any]) -> list[Block]:
+        """Parse the results of a batch of ``eth_getBlockByNumber``.
+
+        Args:
+            responses: The results in request order, see ``send_batch``.
+
+        Returns:
+            A list of ``Block`` instances in the same order.
+
+        Raises:
+            ethhelper.types.GethError: Raised when any slot is a Geth error.
+            ethhelper.types.IdNotMatch: Raised when any slot has no response.
+        """
+        self._raise_batch_errors(responses)
+        return [Block.parse_obj(res) for res in responses]
+
+    def _raise_batch_errors(self, responses: list[Any]) -> None:
+        """Raise the errors in the results of a batch.
+
+        Args:
+            responses: The results in request order, see ``send_batch``.
+
+        Raises:
+            ethhelper.types.GethError: Raised with all Geth errors when any
+                slot is a Geth error.
+            ethhelper.types.IdNotMatch: Raised when any slot has no response.
+        """
+        errors: list[GethErrorDetail] = []
+        for res in responses:
+            if isinstance(res, GethError):
+                errors.append(typing.cast(GethErrorDetail, res.error))
+            elif isinstance(res, Exception):
+                raise res
+        if len(errors) != 0:
+            raise GethError(error=errors)
+
+    @bulk
     async def get_blocks_by_numbers_range(
-        self, start: BlockNumber, end: BlockNumber, step: int = 200
+        self, start: BlockNumber, end: BlockNumber, step: int | None = None
     ) -> list[Block]:
         """
         Get the blocks with the given block numbers range.
@@ -250,7 +856,9 @@ class GethCustomHttp(GethEthHttp, GethNetHttp, GethTxpoolHttp):
             start: The start block number.
             end: The end block number.
             step: The maximum number of blocks per request, preventing a single
-                request from requiring too much memory and taking too long.
+                request from requiring too much memory and taking too long. If
+                ``None``, the number of blocks per request is tuned
+                adaptively.
 
         Returns:
             A list of ``Block`` instances that represent the blocks with the
@@ -258,4 +866,4 @@ class GethCustomHttp(GethEthHttp, GethNetHttp, GethTxpoolHttp):
         """
         return await self.get_blocks_by_numbers(
             [BlockNumber(i) for i in range(start, end + 1, 1)], step
-        )
\ No newline at end of file
+        )
@@ -48,6 +48,9 @@ from ethhelper.utils import (
 from .base import (
     GethHttpWeb3,
 )
+from .transport import (
+    GethHttpTransport,
+)
 
 
 class GethEthHttp(GethHttpWeb3):
@@ -65,9 +68,16 @@ class GethEthHttp(GethHttpWeb3):
     The ``logger`` is used to assign a logger of the Python logging module to
     this class. Explicitly assigning a logger can be used to control the output
     location of the logger, which is convenient for debugging.
+
+    The ``transport`` is the pooled HTTP transport used to send requests.
     """
-    def __init__(self, url: str, logger: Logger) -> None:
-        super().__init__(url, logger)
+    def __init__(
+        self,
+        url: str,
+        logger: Logger,
+        transport: GethHttpTransport | None = None
+    ) -> None:
+        super().__init__(url, logger, transport)
         self.eth: AsyncEth = self.w3.eth
         """Asynchronous Eth interface for Web3. Used to simplify the access
         path.
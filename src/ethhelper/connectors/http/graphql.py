@@ -1,26 +1,310 @@
+import functools
 from logging import (
     Logger,
 )
+import time
 import typing
 from typing import (
     Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Iterator,
+    Sequence,
+    TypeVar,
 )
 
 from eth_typing import (
     BlockNumber,
 )
 from httpx import (
-    AsyncClient,
+    TimeoutException,
 )
 import orjson
+from web3 import (
+    Web3,
+)
 
+from ethhelper.datatypes.base import (
+    Address,
+    BlockIdentifier,
+    Hash32,
+)
+from ethhelper.datatypes.eth import (
+    AccountState,
+    Block,
+    BlockHeader,
+    FilterParams,
+    Log,
+    Receipt,
+)
 from ethhelper.datatypes.geth import (
     GethGraphQLError,
 )
+from ethhelper.utils import (
+    convert,
+    stream,
+)
+from ethhelper.utils.batch import (
+    AdaptiveBatchSize,
+)
 
 from .base import (
     GethHttpAbstract,
 )
+from .cache import (
+    log_filter_key,
+)
+from .limiter import (
+    bulk,
+)
+from .transport import (
+    GethHttpTransport,
+)
+
+T = TypeVar("T")
+
+BLOCK_FIELDS: dict[str, str] = {
+    "number": "number",
+    "hash": "hash",
+    "parentHash": "parent { hash }",
+    "nonce": "nonce",
+    "miner": "miner { address }",
+    "timestamp": "timestamp",
+    "gasLimit": "gasLimit",
+    "gasUsed": "gasUsed",
+    "baseFeePerGas": "baseFeePerGas",
+    "difficulty": "difficulty",
+    "totalDifficulty": "totalDifficulty",
+    "extraData": "extraData",
+    "logsBloom": "logsBloom",
+    "mixHash": "mixHash",
+    "stateRoot": "stateRoot",
+    "receiptsRoot": "receiptsRoot",
+    "transactionsRoot": "transactionsRoot",
+    "transactionCount": "transactionCount",
+}
+"""The GraphQL selections of the block header fields, by JSON-RPC name."""
+
+INT_FIELDS = {
+    "number",
+    "timestamp",
+    "gasLimit",
+    "gasUsed",
+    "baseFeePerGas",
+    "difficulty",
+    "totalDifficulty",
+    "transactionCount",
+}
+"""The block header fields decoded into integers."""
+
+ACCOUNT_FIELDS: dict[str, str] = {
+    "balance": "balance",
+    "nonce": "transactionCount",
+    "code": "code",
+}
+"""The GraphQL selections of the fields of ``AccountState``."""
+
+
+def decode_block(block: dict[str, Any]) -> dict[str, Any]:
+    """Convert a block of a GraphQL field projection into the JSON-RPC field
+    names, with the integers decoded.
+
+    Args:
+        block: The block in the GraphQL result.
+
+    Returns:
+        The fields of the block by JSON-RPC name.
+    """
+    result: dict[str, Any] = {}
+    for key, value in block.items():
+        if key == "parent":
+            result["parentHash"] = None if value is None else value["hash"]
+        elif key == "miner":
+            result["miner"] = value["address"]
+        elif key in INT_FIELDS:
+            result[key] = convert.parse_hex_or_strint(value)
+        else:
+            result[key] = value
+    return result
+
+
+def log_selection(timestamp: bool) -> str:
+    """Get the GraphQL selection of the fields of a ``Log``.
+
+    Args:
+        timestamp: Whether to select the timestamp of the block too.
+
+    Returns:
+        The selection of the log fields.
+    """
+    return """
+        index
+        account { address }
+        topics
+        data
+        transaction {
+            hash
+            index
+            block { number hash %s }
+        }
+    """ % ("timestamp" if timestamp else "")
+
+
+def decode_log(log: dict[str, Any]) -> dict[str, Any]:
+    """Convert a log of a GraphQL query into the json form of ``eth_getLogs``.
+
+    Args:
+        log: The log in the GraphQL result, see ``log_selection``.
+
+    Returns:
+        The log by JSON-RPC name, with the ``timestamp`` of its block if it
+        was selected.
+    """
+    transaction = log["transaction"]
+    block = transaction["block"]
+    result = {
+        "blockNumber": convert.parse_hex_or_strint(block["number"]),
+        "blockHash": block["hash"],
+        "logIndex": convert.parse_hex_or_strint(log["index"]),
+        "address": log["account"]["address"],
+        "topics": log["topics"],
+        "data": log["data"],
+        "transactionHash": transaction["hash"],
+        "transactionIndex": convert.parse_hex_or_strint(transaction["index"]),
+        "removed": False,
+    }
+    if "timestamp" in block:
+        result["timestamp"] = convert.parse_hex_or_strint(block["timestamp"])
+    return result
+
+
+TRANSACTION_SELECTION = """
+    hash
+    nonce
+    index
+    from { address }
+    to { address }
+    value
+    gasPrice
+    maxFeePerGas
+    maxPriorityFeePerGas
+    gas
+    inputData
+    type
+    r
+    s
+    v
+    accessList { address storageKeys }
+    status
+    gasUsed
+    cumulativeGasUsed
+    effectiveGasPrice
+    createdContract { address }
+    logs { index account { address } topics data }
+"""
+"""The GraphQL selection of a transaction and its receipt."""
+
+
+def logs_bloom(logs: list[dict[str, Any]]) -> str:
+    """Compute the bloom filter of some logs, as in a receipt.
+
+    Args:
+        logs: The logs in the json form of ``eth_getLogs``.
+
+    Returns:
+        The 256 bytes bloom filter in hex.
+    """
+    bloom = 0
+    for log in logs:
+        for item in [log["address"], *log["topics"]]:
+            digest = Web3.keccak(hexstr=item)
+            for i in (0, 2, 4):
+                bloom |= 1 << ((digest[i] << 8 | digest[i + 1]) & 2047)
+    return "0x" + bloom.to_bytes(256, "big").hex()
+
+
+def decode_full_block(
+    block: dict[str, Any]
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Convert a block of a GraphQL query with its transactions and receipts
+    into the json form of ``eth_getBlockByNumber`` with full transactions and
+    of ``eth_getTransactionReceipt``.
+
+    Args:
+        block: The block in the GraphQL result, selected by all
+            ``BLOCK_FIELDS``, ``ommerHash``, ``ommers`` and the
+            ``TRANSACTION_SELECTION`` of its transactions.
+
+    Returns:
+        The block and the receipts of its transactions in order.
+    """
+    transactions = block.pop("transactions")
+    ommers = block.pop("ommers")
+    result = decode_block(block)
+    result["sha3Uncles"] = result.pop("ommerHash")
+    result["uncles"] = [ommer["hash"] for ommer in ommers or []]
+    result["transactions"] = []
+    receipts: list[dict[str, Any]] = []
+    for tx in transactions:
+        index = convert.parse_hex_or_strint(tx["index"])
+        to = None if tx["to"] is None else tx["to"]["address"]
+        sender = tx["from"]["address"]
+        logs = [
+            {
+                "blockNumber": result["number"],
+                "blockHash": result["hash"],
+                "logIndex": convert.parse_hex_or_strint(log["index"]),
+                "address": log["account"]["address"],
+                "topics": log["topics"],
+                "data": log["data"],
+                "transactionHash": tx["hash"],
+                "transactionIndex": index,
+                "removed": False,
+            }
+            for log in tx["logs"] or []
+        ]
+        result["transactions"].append({
+            "blockHash": result["hash"],
+            "blockNumber": result["number"],
+            "transactionIndex": index,
+            "hash": tx["hash"],
+            "from": sender,
+            "to": to,
+            "gas": tx["gas"],
+            "gasPrice": tx["gasPrice"],
+            "maxFeePerGas": tx["maxFeePerGas"],
+            "maxPriorityFeePerGas": tx["maxPriorityFeePerGas"],
+            "input": tx["inputData"],
+            "value": tx["value"],
+            "nonce": tx["nonce"],
+            "type": tx["type"],
+            "accessList": tx["accessList"],
+            "r": tx["r"],
+            "s": tx["s"],
+            "v": tx["v"],
+        })
+        receipts.append({
+            "blockNumber": result["number"],
+            "blockHash": result["hash"],
+            "contractAddress": (
+                None if tx["createdContract"] is None
+                else tx["createdContract"]["address"]
+            ),
+            "cumulativeGasUsed": tx["cumulativeGasUsed"],
+            "effectiveGasPrice": tx["effectiveGasPrice"],
+            "from": sender,
+            "gasUsed": tx["gasUsed"],
+            "logs": logs,
+            "logsBloom": logs_bloom(logs),
+            "status": tx["status"],
+            "to": to,
+            "transactionHash": tx["hash"],
+            "transactionIndex": index,
+            "type": tx["type"],
+        })
+    return result, receipts
 
 
 class GethGraphQL(GethHttpAbstract):
@@ -39,11 +323,17 @@ class GethGraphQL(GethHttpAbstract):
     The ``graphql_url`` is used to specify the URL for the GraphQL interface of
     the Geth node, usually in the form of ``http://host:port/graphql``. If not
     provided, it will generate from ``url`` by appending ``/graphql``.
+
+    The ``transport`` is the pooled HTTP transport used to send requests.
     """
     def __init__(
-        self, url: str, logger: Logger, graphql_url: str | None = None
+        self,
+        url: str,
+        logger: Logger,
+        graphql_url: str | None = None,
+        transport: GethHttpTransport | None = None
     ) -> None:
-        super().__init__(url, logger)
+        super().__init__(url, logger, transport)
         if graphql_url is None:
             if not url.endswith("/"):
                 url += "/"
@@ -51,6 +341,92 @@ class GethGraphQL(GethHttpAbstract):
         else:
             self.graphql_url = graphql_url
 
+    async def send_raw_query(self, query: str) -> bytes:
+        """
+        Sends a GraphQL query to the Geth node and returns the content of the
+        response.
+
+        If ``single_flight`` is ``True``, concurrent identical queries share
+        one request in flight. Mutations are always sent.
+
+        Args:
+            query: The GraphQL query string.
+
+        Returns:
+            The json content of the response in bytes.
+
+        Raises:
+            httpx.RequestError: Raised when an HTTP request fails.
+        """
+        self.logger.debug("SEND GRAPHQL QUERY %s", query)
+        content = orjson.dumps({"query": query})
+        if self.single_flight and not query.lstrip().startswith("mutation"):
+            raw_res = await self.flights.do(
+                ("graphql", content),
+                functools.partial(self._post_query_limited, content)
+            )
+        else:
+            raw_res = await self._post_query_limited(content)
+        self.logger.debug("RECV GRAPHQL RESULT %r", raw_res)
+        return typing.cast(bytes, raw_res)
+
+    async def _post_query_limited(self, content: bytes) -> bytes:
+        """Post the json content of a GraphQL query to the Geth node through
+        the ``limiter``, if any.
+
+        Args:
+            content: The json content will be sent.
+
+        Returns:
+            The json content of the response in bytes.
+        """
+        if self.limiter is None:
+            raw_res = await self._post_query(content)
+        else:
+            async with self.limiter.slot():
+                raw_res = await self._post_query(content)
+        self.received_bytes += len(raw_res)
+        return raw_res
+
+    async def _post_query(self, content: bytes) -> bytes:
+        """Post the json content of a GraphQL query to the Geth node.
+
+        Args:
+            content: The json content will be sent.
+
+        Returns:
+            The json content of the response in bytes.
+        """
+        return await self.transport.post(self.graphql_url, content)
+
+    def parse_query_result(self, raw_res: str | bytes) -> dict[str, Any]:
+        """
+        Parses the response of a GraphQL query.
+
+        Args:
+            raw_res: The json content of the response.
+
+        Returns:
+            A dictionary containing the data of the GraphQL query.
+
+        Raises:
+            GethGraphQLError: If the Geth node returns an error.
+            orjson.JSONDecodeError: If the content is not json, such as the
+                plain text 404 of a node without GraphQL service.
+        """
+        result = orjson.loads(raw_res)
+        if "errors" in result:
+            raise GethGraphQLError(
+                [err["message"] for err in result["errors"]],
+                typing.cast(dict[str, Any], result.get("data") or {}),
+            )
+        if "error" in result:
+            raise GethGraphQLError(
+                typing.cast(list[str], result["error"]["msg"]),
+                typing.cast(dict[str, Any], result["data"]),
+            )
+        return typing.cast(dict[str, Any], result["data"])
+
     async def send_query(self, query: str) -> dict[str, Any]:
         """
         Sends a GraphQL query to the Geth node.
@@ -64,21 +440,7 @@ class GethGraphQL(GethHttpAbstract):
         Raises:
             GethGraphQLError: If the Geth node returns an error.
         """
-        self.logger.debug(f"SEND GRAPHQL QUERY {query}")
-        async with AsyncClient() as client:
-            res = await client.post(
-                f"{self.graphql_url}",
-                content=orjson.dumps({ "query": query}).decode(),
-                headers={"Content-Type": "application/json"}
-            )
-            self.logger.debug(f"RECV GRAPHQL RESULT {res.text}")
-            result = orjson.loads(res.text)
-            if "error" in result:
-                raise GethGraphQLError(
-                    typing.cast(list[str], result["error"]["msg"]),
-                    typing.cast(dict[str, Any], result["data"]),
-                )
-            return result["data"]
+        return self.parse_query_result(await self.send_raw_query(query))
 
     async def get_block_ts_by_number(self, height: BlockNumber) -> int:
         """
@@ -103,11 +465,13 @@ class GethGraphQL(GethHttpAbstract):
         result = await self.send_query(query)
         return int(result["block"]["timestamp"], 0)
 
+    @bulk
     async def get_blocks_ts_by_numbers_range(
         self,
         from_height: BlockNumber,
         to_height: BlockNumber,
-        step: int = 5000
+        step: int | None = None,
+        concurrency: int = 4
     ) -> dict[BlockNumber, int]:
         """
         Retrieves the timestamps of blocks within a range of block numbers.
@@ -115,7 +479,11 @@ class GethGraphQL(GethHttpAbstract):
         Args:
             from_height: The starting block number.
             to_height: The ending block number.
-            step: The maximum number of blocks per request.
+            step: The maximum number of blocks per request. If ``None``, the
+                number of blocks per request is tuned adaptively from the
+                observed latency and response size, and halved when a request
+                fails or times out.
+            concurrency: The maximum number of requests in flight.
 
         Returns:
             A dictionary mapping block numbers to their corresponding
@@ -124,32 +492,762 @@ class GethGraphQL(GethHttpAbstract):
         Raises:
             GethGraphQLError: If the Geth node returns an error.
         """
-        total = to_height - from_height
-        if total > step:
-            result: dict[BlockNumber, int] = {}
-            self.logger.info(
-                f"Try to get {total + 1} blocks timestamp, "
-                f"call per {step} blocks"
-            )
-            for i in range(from_height, to_height, step + 1):
-                result |= await self.get_blocks_ts_by_numbers_range(
-                    BlockNumber(i),
-                    BlockNumber(min(i+step, to_height)),
-                    step
-                )
-                process = (min(i+step, to_height)-from_height+1)/(total+1)*100
-                self.logger.info(
-                    f"Get blocks timestamp process: {process:.2f} %"
+        blocks = await self._get_blocks_windows(
+            from_height, to_height, ("number", "timestamp"), step, concurrency
+        )
+        return {
+            BlockNumber(d["number"]): d["timestamp"] for d in blocks
+        }
+
+    @bulk
+    async def get_block_fields_by_numbers_range(
+        self,
+        from_height: BlockNumber,
+        to_height: BlockNumber,
+        fields: Sequence[str] = ("number", "timestamp"),
+        step: int | None = None,
+        concurrency: int = 4
+    ) -> dict[str, list[Any]]:
+        """
+        Retrieves some header fields of the blocks within a range of block
+        numbers, as one array per field.
+
+        Only the requested ``fields`` are queried, so a query of a few fields
+        transfers a fraction of the bytes of ``get_blocks_by_numbers``. The
+        range is split into windows fetched concurrently, with at most
+        ``concurrency`` requests in flight. A window which fails or times out
+        is bisected and fetched again.
+
+        Args:
+            from_height: The starting block number.
+            to_height: The ending block number.
+            fields: The JSON-RPC names of the header fields, see
+                ``BLOCK_FIELDS``. ``number`` is always included.
+            step: The maximum number of blocks per request. If ``None``, the
+                number of blocks per request is tuned adaptively for these
+                fields.
+            concurrency: The maximum number of requests in flight.
+
+        Returns:
+            A dictionary mapping each field to the list of its values, in
+            block order. Integers, such as ``gasUsed`` and ``baseFeePerGas``,
+            are decoded, and the other fields are kept as hex strings.
+
+        Raises:
+            ValueError: If a field is not in ``BLOCK_FIELDS``.
+            GethGraphQLError: If the Geth node returns an error.
+        """
+        fields = self._block_fields(fields)
+        blocks = await self._get_blocks_windows(
+            from_height, to_height, fields, step, concurrency
+        )
+        return {field: [d[field] for d in blocks] for field in fields}
+
+    @bulk
+    async def get_block_headers_by_numbers_range(
+        self,
+        from_height: BlockNumber,
+        to_height: BlockNumber,
+        fields: Sequence[str] = ("number", "timestamp"),
+        step: int | None = None,
+        concurrency: int = 4
+    ) -> list[BlockHeader]:
+        """
+        Retrieves some header fields of the blocks within a range of block
+        numbers, as ``BlockHeader`` instances.
+
+        See ``get_block_fields_by_numbers_range`` for the arguments.
+
+        Returns:
+            A list of ``BlockHeader`` instances in block order, with the
+            fields which were not requested set to ``None``.
+
+        Raises:
+            ValueError: If a field is not in ``BLOCK_FIELDS``.
+            GethGraphQLError: If the Geth node returns an error.
+        """
+        blocks = await self._get_blocks_windows(
+            from_height,
+            to_height,
+            self._block_fields(fields),
+            step,
+            concurrency
+        )
+        return [BlockHeader.parse_obj(d) for d in blocks]
+
+    async def iter_block_timestamps(
+        self,
+        from_height: BlockNumber,
+        to_height: BlockNumber,
+        step: int | None = None,
+        prefetch: int = 4
+    ) -> AsyncIterator[dict[BlockNumber, int]]:
+        """
+        Iterates over the timestamps of blocks within a range of block numbers
+        chunk by chunk.
+
+        Unlike ``get_blocks_ts_by_numbers_range``, the timestamps are not
+        collected in memory. At most ``prefetch`` chunks are requested ahead
+        of the consumer, and no more are requested until the consumer takes
+        the next chunk.
+
+        Args:
+            from_height: The starting block number.
+            to_height: The ending block number.
+            step: The number of blocks per chunk. If ``None``, each chunk takes
+                the current adaptive size of the GraphQL block timestamps
+                query.
+            prefetch: The maximum number of chunks requested ahead of the
+                consumer.
+
+        Yields:
+            A dictionary mapping block numbers to their corresponding
+            timestamps of each chunk, in block order.
+
+        Raises:
+            GethGraphQLError: If the Geth node returns an error.
+        """
+        def factories() -> Iterator[
+            Callable[[], Awaitable[dict[BlockNumber, int]]]
+        ]:
+            i = from_height
+            while i <= to_height:
+                size = step
+                if size is None:
+                    size = self._blocks_batch_size(
+                        ("number", "timestamp")
+                    ).size
+                j = BlockNumber(min(to_height, i + size - 1))
+                yield functools.partial(
+                    self.get_blocks_ts_by_numbers_range,
+                    i,
+                    j,
+                    step,
+                    1
                 )
-        else:
-            query = """
+                i = BlockNumber(j + 1)
+
+        async for result in stream.prefetch(factories(), prefetch):
+            yield result
+
+    async def get_block_with_receipts(
+        self, height: BlockNumber
+    ) -> tuple[Block, list[Receipt]]:
+        """
+        Retrieves a block with its full transactions and their receipts by
+        one GraphQL query, instead of one ``eth_getTransactionReceipt`` per
+        transaction.
+
+        Args:
+            height: The block number.
+
+        Returns:
+            A tuple of the ``Block`` with ``Transaction`` instances and the
+            ``Receipt`` instances of its transactions in order, whose logs
+            are decoded into ``Log`` instances.
+
+        Raises:
+            GethGraphQLError: If the Geth node returns an error, or the block
+                does not exist yet.
+        """
+        r = await self.send_query(self._full_blocks_query(height, height))
+        if len(r["blocks"]) == 0:
+            raise GethGraphQLError([f"block {height} not found"], r)
+        block, receipts = decode_full_block(r["blocks"][0])
+        return (
+            Block.parse_obj(block),
+            [Receipt.parse_obj(receipt) for receipt in receipts]
+        )
+
+    @bulk
+    async def get_blocks_with_receipts_by_numbers_range(
+        self,
+        from_height: BlockNumber,
+        to_height: BlockNumber,
+        step: int | None = None,
+        concurrency: int = 4
+    ) -> list[tuple[Block, list[Receipt]]]:
+        """
+        Retrieves the blocks within a range of block numbers with their full
+        transactions and receipts, by one GraphQL query per window.
+
+        The range is split into windows fetched concurrently, with at most
+        ``concurrency`` requests in flight. A window which fails or times out
+        is bisected and fetched again.
+
+        Args:
+            from_height: The starting block number.
+            to_height: The ending block number.
+            step: The maximum number of blocks per request. If ``None``, the
+                number of blocks per request is tuned adaptively.
+            concurrency: The maximum number of requests in flight.
+
+        Returns:
+            A list of tuples of each ``Block`` and its ``Receipt`` instances,
+            see ``get_block_with_receipts``, in block order.
+
+        Raises:
+            GethGraphQLError: If the Geth node returns an error for a window
+                of one block.
+        """
+        async def fetch(
+            start: BlockNumber,
+            end: BlockNumber,
+            batch_size: AdaptiveBatchSize | None
+        ) -> list[tuple[Block, list[Receipt]]]:
+            raw_res = await self._send_window_query(
+                self._full_blocks_query(start, end),
+                end - start + 1,
+                batch_size
+            )
+            r = self.parse_query_result(raw_res)
+            results: list[tuple[Block, list[Receipt]]] = []
+            for d in r["blocks"]:
+                block, receipts = decode_full_block(d)
+                results.append((
+                    Block.parse_obj(block),
+                    [Receipt.parse_obj(receipt) for receipt in receipts]
+                ))
+            return results
+
+        return await self._get_windows(
+            from_height,
+            to_height,
+            fetch,
+            step,
+            self.batch_size("graphql_full_blocks", 10, maximum=1000),
+            concurrency
+        )
+
+    def _full_blocks_query(
+        self, from_height: BlockNumber, to_height: BlockNumber
+    ) -> str:
+        return """
+        query {
+            blocks (from: %d, to: %d) {
+                %s
+                ommerHash
+                ommers { hash }
+                transactions {
+                    %s
+                }
+            }
+        }
+        """ % (
+            from_height,
+            to_height,
+            " ".join(BLOCK_FIELDS.values()),
+            TRANSACTION_SELECTION
+        )
+
+    @bulk
+    async def get_logs_graphql(
+        self,
+        filter: FilterParams,
+        step: int | None = None,
+        concurrency: int = 4
+    ) -> list[Log]:
+        """
+        Retrieves the logs matching a ``FilterParams`` by GraphQL.
+
+        Each log is fetched with its block number, block hash and transaction
+        hash in one query, like ``eth_getLogs``. The block range is split into
+        windows fetched concurrently, with at most ``concurrency`` requests in
+        flight, and a window which fails or times out is bisected. A
+        ``latest`` or missing bound is the head of the Geth node.
+
+        Args:
+            filter: A FilterParams object used to specify filter parameters for
+                the logs.
+            step: The maximum number of blocks per request. If ``None``, the
+                number of blocks per request is tuned adaptively for the
+                address and topics of the filter.
+            concurrency: The maximum number of requests in flight.
+
+        Returns:
+            A list of Log objects in ``(block_number, log_index)`` order.
+
+        Raises:
+            ValueError: If a bound of the filter is a tag other than
+                ``earliest`` and ``latest``.
+            GethGraphQLError: If the Geth node returns an error.
+        """
+        logs = await self._get_logs_graphql(filter, False, step, concurrency)
+        return [Log.parse_obj(log) for log in logs]
+
+    @bulk
+    async def get_logs_ts_graphql(
+        self,
+        filter: FilterParams,
+        step: int | None = None,
+        concurrency: int = 4
+    ) -> list[tuple[Log, int]]:
+        """
+        Retrieves the logs matching a ``FilterParams`` with the timestamps of
+        their blocks by GraphQL, in the same queries.
+
+        See ``get_logs_graphql`` for the arguments.
+
+        Returns:
+            A list of tuples of a Log object and the timestamp of its block,
+            in ``(block_number, log_index)`` order.
+
+        Raises:
+            ValueError: If a bound of the filter is a tag other than
+                ``earliest`` and ``latest``.
+            GethGraphQLError: If the Geth node returns an error.
+        """
+        logs = await self._get_logs_graphql(filter, True, step, concurrency)
+        return [(Log.parse_obj(log), log["timestamp"]) for log in logs]
+
+    async def _get_logs_graphql(
+        self,
+        filter: FilterParams,
+        timestamp: bool,
+        step: int | None,
+        concurrency: int
+    ) -> list[dict[str, Any]]:
+        """
+        Retrieves the logs matching a ``FilterParams`` by GraphQL.
+
+        Args:
+            filter: The filter parameters.
+            timestamp: Whether to fetch the timestamps of the blocks too.
+            step: The maximum number of blocks per request.
+            concurrency: The maximum number of requests in flight.
+
+        Returns:
+            The logs in the json form of ``eth_getLogs``, see ``decode_log``.
+        """
+        params = filter.to_geth()
+        criteria = self._log_criteria(params)
+        selection = log_selection(timestamp)
+        if "blockHash" in params:
+            r = await self.send_query("""
             query {
-                blocks (from: %d, to: %d) {
-                    number
-                    timestamp
+                block (hash: "%s") {
+                    logs (filter: {%s}) {
+                        %s
+                    }
                 }
             }
-            """ % (from_height, to_height)
-            r = await self.send_query(query)
-            result = {d["number"]: int(d["timestamp"], 0) for d in r["blocks"]}
+            """ % (params["blockHash"], criteria, selection))
+            if r["block"] is None:
+                return []
+            return [decode_log(d) for d in r["block"]["logs"]]
+        bounds = [
+            self._log_bound(params.get(key))
+            for key in ("fromBlock", "toBlock")
+        ]
+        if None in bounds:
+            head = await self.send_query("query { block { number } }")
+            number = convert.parse_hex_or_strint(head["block"]["number"])
+            bounds = [number if bound is None else bound for bound in bounds]
+
+        async def fetch(
+            start: BlockNumber,
+            end: BlockNumber,
+            batch_size: AdaptiveBatchSize | None
+        ) -> list[dict[str, Any]]:
+            raw_res = await self._send_window_query(
+                """
+                query {
+                    logs (filter: {fromBlock: %d, toBlock: %d, %s}) {
+                        %s
+                    }
+                }
+                """ % (start, end, criteria, selection),
+                end - start + 1,
+                batch_size
+            )
+            r = self.parse_query_result(raw_res)
+            return [decode_log(d) for d in r["logs"]]
+
+        return await self._get_windows(
+            BlockNumber(typing.cast(int, bounds[0])),
+            BlockNumber(typing.cast(int, bounds[1])),
+            fetch,
+            step,
+            self.batch_size(
+                "graphql_logs:" + log_filter_key(params).decode(),
+                2000,
+                maximum=100000
+            ),
+            concurrency
+        )
+
+    def _log_criteria(self, params: dict[str, Any]) -> str:
+        """Get the GraphQL filter criteria of the address and topics of a log
+        filter.
+
+        Args:
+            params: The json form of the filter, see ``FilterParams.to_geth``.
+
+        Returns:
+            The ``addresses`` and ``topics`` fields of the criteria.
+        """
+        address = params.get("address")
+        if isinstance(address, str):
+            address = [address]
+        topics = [
+            [] if topic is None else [topic] if isinstance(topic, str)
+            else topic
+            for topic in params.get("topics") or []
+        ]
+        return "addresses: %s, topics: %s" % (
+            orjson.dumps(address or []).decode(),
+            orjson.dumps(topics).decode()
+        )
+
+    def _log_bound(self, block: str | None) -> int | None:
+        """Get the block number of a bound of a log filter.
+
+        Args:
+            block: The bound in the json form of Geth.
+
+        Returns:
+            The block number, or ``None`` for the head.
+
+        Raises:
+            ValueError: If the bound is a tag other than ``earliest`` and
+                ``latest``.
+        """
+        if block is None or block == "latest":
+            return None
+        if block == "earliest":
+            return 0
+        if block.startswith("0x"):
+            return int(block, 16)
+        raise ValueError(f"{block} is not supported by GraphQL log queries")
+
+    async def get_accounts_state(
+        self,
+        addresses: Sequence[Address],
+        block_identifier: BlockIdentifier = "latest",
+        fields: Sequence[str] = ("balance", "nonce", "code"),
+        step: int | None = None,
+        concurrency: int = 4
+    ) -> dict[Address, AccountState]:
+        """
+        Retrieves the state of many accounts at one block by aliased GraphQL
+        ``account`` queries, many accounts per query.
+
+        All queries are pinned to the same block, so the states are
+        consistent: ``latest`` is resolved to the number of the head once
+        before the queries are sent. At most ``concurrency`` queries are in
+        flight, and a query which fails or times out is split in half and
+        sent again.
+
+        Args:
+            addresses: The addresses of the accounts.
+            block_identifier: The block number or hash, ``earliest`` or
+                ``latest``.
+            fields: The fields of ``AccountState`` to fetch, any of
+                ``balance``, ``nonce`` and ``code``.
+            step: The maximum number of accounts per query. If ``None``, the
+                number of accounts per query is tuned adaptively for these
+                fields.
+            concurrency: The maximum number of queries in flight.
+
+        Returns:
+            A dictionary mapping each address to its ``AccountState``, with
+            the fields which were not requested set to ``None``.
+
+        Raises:
+            ValueError: If a field is not in ``ACCOUNT_FIELDS``, or the block
+                identifier is a tag other than ``earliest`` and ``latest``.
+            GethGraphQLError: If the Geth node returns an error for a query
+                of one account.
+        """
+        unknown = [field for field in fields if field not in ACCOUNT_FIELDS]
+        if len(unknown) != 0:
+            raise ValueError(f"Unknown account fields: {unknown}")
+        if isinstance(block_identifier, Hash32):
+            block = 'hash: "%s"' % block_identifier
+        elif isinstance(block_identifier, int):
+            block = "number: %d" % block_identifier
+        elif block_identifier == "earliest":
+            block = "number: 0"
+        elif block_identifier == "latest":
+            head = await self.send_query("query { block { number } }")
+            block = "number: %d" % convert.parse_hex_or_strint(
+                head["block"]["number"]
+            )
+        else:
+            raise ValueError(
+                f"{block_identifier} is not supported by GraphQL account "
+                "queries"
+            )
+        selection = " ".join(ACCOUNT_FIELDS[field] for field in fields)
+        batch_size = self.batch_size(
+            "graphql_accounts:" + ",".join(fields), 500, maximum=5000
+        )
+
+        def factories() -> Iterator[
+            Callable[[], Awaitable[list[dict[str, Any]]]]
+        ]:
+            i = 0
+            while i < len(addresses):
+                size = batch_size.size if step is None else step
+                yield functools.partial(
+                    self._get_accounts_bisect,
+                    addresses[i:i + size],
+                    block,
+                    selection,
+                    batch_size if step is None else None
+                )
+                i += size
+
+        result: dict[Address, AccountState] = {}
+        async for accounts in stream.prefetch(factories(), concurrency):
+            for account in accounts:
+                state = AccountState.parse_obj(account)
+                result[state.address] = state
         return result
+
+    async def _get_accounts_bisect(
+        self,
+        addresses: Sequence[Address],
+        block: str,
+        selection: str,
+        batch_size: AdaptiveBatchSize | None
+    ) -> list[dict[str, Any]]:
+        """
+        Retrieves the state of some accounts by one aliased query, splitting
+        it in half while it fails or times out.
+
+        Args:
+            addresses: The addresses of the accounts.
+            block: The argument of the GraphQL ``block`` query.
+            selection: The GraphQL selection of the account fields.
+            batch_size: The adaptive size observing the query, if any.
+
+        Returns:
+            The accounts by the names of ``AccountState``.
+        """
+        aliases = " ".join(
+            'a%d: account (address: "%s") { %s }' % (i, address, selection)
+            for i, address in enumerate(addresses)
+        )
+        try:
+            raw_res = await self._send_window_query(
+                "query { block (%s) { %s } }" % (block, aliases),
+                len(addresses),
+                batch_size
+            )
+            r = self.parse_query_result(raw_res)
+        except (GethGraphQLError, TimeoutException):
+            if len(addresses) == 1:
+                raise
+            self.logger.info(f"Query of {len(addresses)} accounts failed")
+            if batch_size is not None:
+                batch_size.shrink(len(addresses))
+            middle = len(addresses) // 2
+            return [
+                *await self._get_accounts_bisect(
+                    addresses[:middle], block, selection, batch_size
+                ),
+                *await self._get_accounts_bisect(
+                    addresses[middle:], block, selection, batch_size
+                ),
+            ]
+        if r["block"] is None:
+            raise GethGraphQLError([f"block {block} not found"], r)
+        accounts: list[dict[str, Any]] = []
+        for i, address in enumerate(addresses):
+            account = r["block"]["a%d" % i]
+            accounts.append({
+                "address": address,
+                "balance": account.get("balance"),
+                "nonce": account.get("transactionCount"),
+                "code": account.get("code"),
+            })
+        return accounts
+
+    def _block_fields(self, fields: Sequence[str]) -> tuple[str, ...]:
+        """Check the requested header fields and put ``number`` first.
+
+        Args:
+            fields: The JSON-RPC names of the header fields.
+
+        Returns:
+            The fields without duplicates, starting with ``number``.
+
+        Raises:
+            ValueError: If a field is not in ``BLOCK_FIELDS``.
+        """
+        unknown = [field for field in fields if field not in BLOCK_FIELDS]
+        if len(unknown) != 0:
+            raise ValueError(f"Unknown block fields: {unknown}")
+        return tuple(dict.fromkeys(["number", *fields]))
+
+    def _blocks_batch_size(self, fields: Sequence[str]) -> AdaptiveBatchSize:
+        """Get the adaptive number of blocks per query of some header fields.
+
+        Args:
+            fields: The JSON-RPC names of the header fields.
+
+        Returns:
+            The ``AdaptiveBatchSize`` of the query of these fields.
+        """
+        return self.batch_size(
+            "graphql_blocks:" + ",".join(fields), 5000, maximum=100000
+        )
+
+    def _blocks_query(
+        self,
+        from_height: BlockNumber,
+        to_height: BlockNumber,
+        fields: Sequence[str]
+    ) -> str:
+        return """
+        query {
+            blocks (from: %d, to: %d) {
+                %s
+            }
+        }
+        """ % (
+            from_height,
+            to_height,
+            " ".join(BLOCK_FIELDS[field] for field in fields)
+        )
+
+    async def _get_windows(
+        self,
+        from_height: BlockNumber,
+        to_height: BlockNumber,
+        fetch: Callable[
+            [BlockNumber, BlockNumber, AdaptiveBatchSize | None],
+            Coroutine[Any, Any, list[T]]
+        ],
+        step: int | None,
+        batch_size: AdaptiveBatchSize,
+        concurrency: int
+    ) -> list[T]:
+        """
+        Retrieves the items of a range of block numbers in concurrent windows.
+
+        The windows take ``step`` blocks, or ``batch_size`` blocks if ``step``
+        is ``None``. A window which fails or times out is bisected and fetched
+        again.
+
+        Args:
+            from_height: The starting block number.
+            to_height: The ending block number.
+            fetch: The coroutine function fetching the items of one window by
+                one query, observing the query by the batch size it is given.
+            step: The maximum number of blocks per request.
+            batch_size: The adaptive number of blocks per request, used if
+                ``step`` is ``None``.
+            concurrency: The maximum number of requests in flight.
+
+        Returns:
+            The items of all windows, in block order.
+
+        Raises:
+            GethGraphQLError: If the Geth node returns an error for a window
+                of one block.
+        """
+        adaptive = batch_size if step is None else None
+        total = to_height - from_height + 1
+        done = 0
+
+        def bisected(start: int, end: int) -> None:
+            self.logger.info(f"Window from {start} to {end} failed, split it")
+            if adaptive is not None:
+                adaptive.shrink(end - start + 1)
+
+        def fetched(start: int, end: int, items: list[T]) -> None:
+            nonlocal done
+            done += end - start + 1
+            self.logger.info(
+                f"Get windows process: {done / total * 100:.2f} %"
+            )
+
+        return await stream.fetch_ranges(
+            from_height,
+            to_height,
+            lambda start, end: fetch(
+                BlockNumber(start), BlockNumber(end), adaptive
+            ),
+            lambda: batch_size.size if step is None else step,
+            lambda exception: isinstance(
+                exception, (GethGraphQLError, TimeoutException)
+            ),
+            concurrency,
+            bisected,
+            fetched
+        )
+
+    async def _get_blocks_windows(
+        self,
+        from_height: BlockNumber,
+        to_height: BlockNumber,
+        fields: Sequence[str],
+        step: int | None,
+        concurrency: int
+    ) -> list[dict[str, Any]]:
+        """
+        Retrieves some header fields of the blocks within a range of block
+        numbers in concurrent windows, see ``_get_windows``.
+
+        Args:
+            from_height: The starting block number.
+            to_height: The ending block number.
+            fields: The JSON-RPC names of the header fields, see
+                ``BLOCK_FIELDS``.
+            step: The maximum number of blocks per request. If ``None``, the
+                adaptive size of the query of these fields is used.
+            concurrency: The maximum number of requests in flight.
+
+        Returns:
+            The blocks in block order, by the JSON-RPC names of the fields,
+            see ``decode_block``.
+        """
+        async def fetch(
+            start: BlockNumber,
+            end: BlockNumber,
+            batch_size: AdaptiveBatchSize | None
+        ) -> list[dict[str, Any]]:
+            raw_res = await self._send_window_query(
+                self._blocks_query(start, end, fields),
+                end - start + 1,
+                batch_size
+            )
+            r = self.parse_query_result(raw_res)
+            return [decode_block(d) for d in r["blocks"]]
+
+        return await self._get_windows(
+            from_height,
+            to_height,
+            fetch,
+            step,
+            self._blocks_batch_size(fields),
+            concurrency
+        )
+
+    async def _send_window_query(
+        self,
+        query: str,
+        blocks: int,
+        batch_size: AdaptiveBatchSize | None
+    ) -> bytes:
+        """
+        Sends the GraphQL query of one window, observing its latency and
+        response size by ``batch_size``, if any.
+
+        Args:
+            query: The GraphQL query string.
+            blocks: The number of blocks of the window.
+            batch_size: The adaptive size observing the query.
+
+        Returns:
+            The json content of the response in bytes.
+        """
+        start_time = time.monotonic()
+        raw_res = await self.send_raw_query(query)
+        if batch_size is not None:
+            batch_size.observe(
+                blocks, time.monotonic() - start_time, len(raw_res)
+            )
+        return raw_res
@@ -0,0 +1,360 @@
+import asyncio
+from asyncio import (
+    Future,
+    TimerHandle,
+)
+from collections import (
+    deque,
+)
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterator,
+)
+from contextlib import (
+    asynccontextmanager,
+    contextmanager,
+)
+from contextvars import (
+    ContextVar,
+)
+from enum import (
+    IntEnum,
+)
+import functools
+import time
+from typing import (
+    ParamSpec,
+    TypeVar,
+)
+
+from httpx import (
+    HTTPError,
+)
+
+from ethhelper.datatypes.stats import (
+    LimiterStats,
+)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+class Priority(IntEnum):
+    """The priority lanes of the requests of a ``GethHttpLimiter``."""
+    REALTIME = 0
+    """Latency-critical calls, such as the calls of a trading path."""
+    NORMAL = 1
+    """The default lane."""
+    BULK = 2
+    """Background work, such as backfills, filling the spare capacity."""
+
+
+_priority: ContextVar[Priority | None] = ContextVar(
+    "ethhelper_priority", default=None
+)
+
+
+def current_priority() -> Priority:
+    """Get the priority of the requests sent by the current task.
+
+    Returns:
+        The priority set by ``use_priority``, or ``Priority.NORMAL``.
+    """
+    priority = _priority.get()
+    return Priority.NORMAL if priority is None else priority
+
+
+@contextmanager
+def use_priority(priority: Priority, default: bool = False) -> Iterator[None]:
+    """Send the requests made within the block with ``priority``.
+
+        >>> with use_priority(Priority.REALTIME):
+        ...     await connector.eth_call(tx)
+
+    The priority is kept in a context variable, so it follows the calls and
+    the tasks created within the block.
+
+    Args:
+        priority: The priority lane of the requests.
+        default: If ``True``, a priority already set by an outer block is
+            kept.
+    """
+    if default and _priority.get() is not None:
+        yield
+        return
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def bulk(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+    """Send the requests of a coroutine function in the ``BULK`` lane,
+    unless the caller has set a priority.
+
+    Args:
+        func: The coroutine function.
+
+    Returns:
+        The wrapped coroutine function.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        with use_priority(Priority.BULK, default=True):
+            return await func(*args, **kwargs)
+    return wrapper
+
+
+class GethHttpLimiter:
+    """A client-side limiter of the requests sent to a Geth node.
+
+    The requests per second are limited by a token bucket refilled at
+    ``rate`` tokens per second and holding up to ``burst`` tokens. ``None``
+    (the default) leaves the rate unlimited.
+
+    The requests in flight are limited by an adaptive concurrency limit,
+    tuned by additive increase and multiplicative decrease (AIMD). Starting at
+    ``initial``, the limit grows by about one request per round trip while the
+    limit is in use and the node answers as fast as it does when idle. When
+    the latency of a request exceeds ``tolerance`` times the idle latency of
+    its kind, the limit is multiplied by ``backoff``, and when a request fails
+    with an HTTP error or a 5xx status, it is halved. The limit stays within
+    ``minimum`` and ``maximum``, and is decreased at most once per round trip,
+    since the requests sent before a decrease are still seeing the old load.
+
+    The idle latency of each kind of request, usually its method name, is the
+    lowest latency observed for it, drifting up towards the latest latencies
+    by ``drift`` of the gap per second, so that a node becoming slower for
+    good is not seen as overloaded forever. Requests without a kind,
+    such as batches whose latency depends on their size, only adjust the limit
+    by their errors.
+
+    Each request is sent in a ``Priority`` lane, taken from ``use_priority``.
+    Waiting requests are started by lane, ``REALTIME`` first, and in arrival
+    order within a lane, so a realtime call never queues behind bulk work.
+    Moreover, ``BULK`` requests only use the concurrency limit minus a
+    ``reserve`` fraction of it, keeping some slots free for the higher lanes
+    while bulk work fills the rest.
+
+    One limiter can be shared by several connectors of the same node.
+    """
+    def __init__(
+        self,
+        rate: float | None = None,
+        burst: int = 10,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 256,
+        tolerance: float = 2,
+        backoff: float = 0.9,
+        drift: float = 0.01,
+        reserve: float = 0.25,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.refilled_at = time.monotonic()
+        self.refill_handle: TimerHandle | None = None
+        self.limit = float(max(minimum, min(initial, maximum)))
+        """The current concurrency limit, whose integer part is the number of
+        requests allowed in flight.
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.drift = drift
+        self.reserve = reserve
+        self.inflight = 0
+        """The number of requests in flight."""
+        self.waiters: dict[Priority, deque[Future[None]]] = {
+            priority: deque() for priority in Priority
+        }
+        """The requests waiting for a token or a slot, by lane, in arrival
+        order.
+        """
+        self.baselines: dict[str, tuple[float, float]] = {}
+        """The idle latency in seconds of each kind of request, with the time
+        it was last updated.
+        """
+        self.decreased_at = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.decreases = 0
+
+    def capacity(self, priority: Priority) -> int:
+        """Get the number of requests in flight a lane may start under.
+
+        Args:
+            priority: The lane.
+
+        Returns:
+            The concurrency limit, minus the reserved slots for ``BULK``.
+        """
+        limit = int(self.limit)
+        if priority == Priority.BULK:
+            return max(1, limit - int(limit * self.reserve))
+        return limit
+
+    def _take_token(self) -> bool:
+        if self.rate is None:
+            return True
+        now = time.monotonic()
+        self.tokens = min(
+            float(self.burst),
+            self.tokens + (now - self.refilled_at) * self.rate
+        )
+        self.refilled_at = now
+        if self.tokens < 1:
+            if self.refill_handle is None:
+                self.refill_handle = asyncio.get_running_loop().call_later(
+                    (1 - self.tokens) / self.rate, self._refilled
+                )
+            return False
+        self.tokens -= 1
+        return True
+
+    def _refilled(self) -> None:
+        self.refill_handle = None
+        self._wake()
+
+    def _wake(self) -> None:
+        for priority, waiters in self.waiters.items():
+            while waiters:
+                if waiters[0].done():
+                    waiters.popleft()
+                    continue
+                if self.inflight >= self.capacity(priority):
+                    break
+                if not self._take_token():
+                    return
+                self.inflight += 1
+                waiters.popleft().set_result(None)
+
+    async def acquire(self, priority: Priority | None = None) -> float:
+        """Wait for a token and a free slot under the concurrency limit.
+
+        Every successful ``acquire`` must be followed by a ``release``.
+
+        Args:
+            priority: The lane of the request. If ``None``, it is
+                ``current_priority()``.
+
+        Returns:
+            The time the request is allowed to start, to be passed to
+            ``release``.
+        """
+        if priority is None:
+            priority = current_priority()
+        if (
+            self.inflight < self.capacity(priority)
+            and not any(self.waiters[p] for p in Priority if p <= priority)
+            and self._take_token()
+        ):
+            self.inflight += 1
+            return time.monotonic()
+        waiter: Future[None] = asyncio.get_running_loop().create_future()
+        self.waiters[priority].append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.inflight -= 1
+                self._wake()
+            elif waiter in self.waiters[priority]:
+                self.waiters[priority].remove(waiter)
+            raise
+        return time.monotonic()
+
+    def release(
+        self,
+        start: float,
+        key: str | None = None,
+        latency: float | None = None,
+        error: bool = False,
+    ) -> None:
+        """Free the slot of a finished request and tune the concurrency limit.
+
+        Args:
+            start: The start time returned by ``acquire``.
+            key: The kind of the request, usually its method name, or ``None``
+                if its latency should not tune the limit.
+            latency: The latency of the request in seconds, or ``None`` if it
+                did not complete.
+            error: Whether the request failed in a way that suggests the node
+                is overloaded.
+        """
+        saturated = self.inflight >= self.capacity(Priority.BULK)
+        self.inflight -= 1
+        self.requests += 1
+        if error:
+            self.errors += 1
+            self._decrease(start, 0.5)
+        elif latency is not None and key is not None:
+            now = time.monotonic()
+            baseline, updated_at = self.baselines.get(key, (latency, now))
+            weight = min(1.0, self.drift * (now - updated_at))
+            baseline = min(latency, baseline + weight * (latency - baseline))
+            self.baselines[key] = (baseline, now)
+            if latency > baseline * self.tolerance:
+                self._decrease(start, self.backoff)
+            elif saturated:
+                self.limit = min(
+                    float(self.maximum), self.limit + 1 / self.limit
+                )
+        self._wake()
+
+    def _decrease(self, start: float, factor: float) -> None:
+        if start < self.decreased_at:
+            return
+        self.decreased_at = time.monotonic()
+        self.decreases += 1
+        self.limit = max(float(self.minimum), self.limit * factor)
+
+    @asynccontextmanager
+    async def slot(
+        self, key: str | None = None, priority: Priority | None = None
+    ) -> AsyncIterator[None]:
+        """Hold a slot of the limiter for the duration of a request.
+
+            >>> async with limiter.slot("eth_call"):
+            ...     await transport.post(url, content)
+
+        An ``httpx.HTTPError`` raised by the request counts as an overload
+        signal, and other exceptions, such as cancellation, only free the
+        slot.
+
+        Args:
+            key: The kind of the request, see ``release``.
+            priority: The lane of the request, see ``acquire``.
+        """
+        start = await self.acquire(priority)
+        latency: float | None = None
+        error = False
+        try:
+            yield
+            latency = time.monotonic() - start
+        except HTTPError:
+            error = True
+            raise
+        finally:
+            self.release(start, key, latency, error)
+
+    def stats(self) -> LimiterStats:
+        """Get the current state of this limiter.
+
+        Returns:
+            A ``LimiterStats`` object with the limits and the counters.
+        """
+        return LimiterStats(
+            limit=int(self.limit),
+            inflight=self.inflight,
+            waiting=sum(len(waiters) for waiters in self.waiters.values()),
+            rate=self.rate,
+            requests=self.requests,
+            errors=self.errors,
+            decreases=self.decreases,
+        )
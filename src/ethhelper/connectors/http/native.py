@@ -0,0 +1,400 @@
+import asyncio
+from typing import (
+    Any,
+)
+
+from eth_typing import (
+    BlockNumber,
+)
+from web3.exceptions import (
+    BlockNotFound,
+    TimeExhausted,
+    TransactionNotFound,
+)
+from web3.types import (
+    ENS,
+    BlockParams,
+    Nonce,
+)
+
+from ethhelper.datatypes.base import (
+    Address,
+    BlockIdentifier,
+    Gas,
+    Hash32,
+    HexBytes,
+    Wei,
+)
+from ethhelper.datatypes.eth import (
+    Block,
+    FeeHistory,
+    Receipt,
+    SyncStatus,
+    Transaction,
+    TxParams,
+)
+from ethhelper.datatypes.geth import (
+    CallOverride,
+)
+from ethhelper.utils import (
+    convert,
+)
+
+from .base import (
+    GethHttpCustomized,
+)
+from .eth import (
+    GethEthHttp,
+)
+
+
+class GethEthNativeHttp(GethEthHttp, GethHttpCustomized):
+    """Class for interacting with an Ethereum node using HTTP with the Geth
+    JSON-RPC API, without Web3.py.
+
+    This class overrides the methods of ``GethEthHttp`` to send them by the
+    customized JSON-RPC interface of ``GethHttpCustomized`` and parse the raw
+    json results directly into ETHHelper types. The middlewares and result
+    formatters of Web3.py, and the conversion of their results into ETHHelper
+    types, are skipped, which saves most of the CPU time spent on block,
+    transaction and receipt heavy workloads.
+
+    The results are the same as ``GethEthHttp``, and the same Web3.py
+    exceptions are raised for missing blocks, transactions and receipts. ENS
+    names, CCIP read and filters are not supported natively, so these calls
+    still fall back to Web3.py.
+
+    The ``url`` is used to indicate the path of the HTTP service of the Geth
+    node, usually in the form of ``http://host:port/``. The use of third-party
+    nodes may be out of the ordinary.
+
+    The ``logger`` is used to assign a logger of the Python logging module to
+    this class. Explicitly assigning a logger can be used to control the output
+    location of the logger, which is convenient for debugging.
+
+    The ``transport`` is the pooled HTTP transport used to send requests.
+    """
+    async def eth_accounts(self) -> list[Address]:
+        return [Address(addr) for addr in await self.send("eth_accounts", [])]
+
+    async def eth_hashrate(self) -> int:
+        return int(await self.send("eth_hashrate", []), 16)
+
+    async def eth_block_number(self) -> BlockNumber:
+        return BlockNumber(int(await self.send("eth_blockNumber", []), 16))
+
+    async def eth_chain_id(self) -> int:
+        return int(await self.send("eth_chainId", []), 16)
+
+    async def eth_gas_price(self) -> Wei:
+        return Wei(await self.send("eth_gasPrice", []))
+
+    async def eth_max_priority_fee_per_gas(self) -> Wei:
+        return Wei(await self.send("eth_maxPriorityFeePerGas", []))
+
+    async def eth_mining(self) -> bool:
+        return await self.send("eth_mining", [])
+
+    async def eth_syncing(self) -> SyncStatus | bool:
+        result = await self.send("eth_syncing", [])
+        if isinstance(result, bool):
+            return result
+        return SyncStatus.parse_obj(result)
+
+    async def eth_fee_history(
+        self,
+        block_count: int,
+        newest_block: BlockParams | BlockNumber,
+        reward_percentiles: list[float] | None = None,
+    ) -> FeeHistory:
+        return FeeHistory.parse_obj(
+            await self.send(
+                "eth_feeHistory",
+                [
+                    hex(block_count),
+                    convert.block_id_to_geth(newest_block),
+                    reward_percentiles or []
+                ]
+            )
+        )
+
+    async def eth_call(
+        self,
+        transaction: TxParams,
+        block_identifier: BlockIdentifier = "latest",
+        state_override: CallOverride = {},
+        ccip_read_enabled: bool = False,
+    ) -> HexBytes:
+        if ccip_read_enabled or not self._is_native_tx(transaction):
+            return await super().eth_call(
+                transaction, block_identifier, state_override,
+                ccip_read_enabled
+            )
+        params: list[Any] = [
+            transaction.to_geth(), convert.block_id_to_geth(block_identifier)
+        ]
+        if state_override:
+            params.append(
+                {
+                    addr: override.to_geth()
+                    for addr, override in state_override.items()
+                }
+            )
+        return HexBytes(await self.send("eth_call", params))
+
+    async def eth_estimate_gas(
+        self,
+        transaction: TxParams,
+        block_identifier: BlockIdentifier = "latest"
+    ) -> Gas:
+        if not self._is_native_tx(transaction):
+            return await super().eth_estimate_gas(
+                transaction, block_identifier
+            )
+        return Gas(
+            int(
+                await self.send(
+                    "eth_estimateGas",
+                    [
+                        transaction.to_geth(),
+                        convert.block_id_to_geth(block_identifier)
+                    ]
+                ),
+                16
+            )
+        )
+
+    async def eth_get_transaction(
+        self, transaction_hash: Hash32
+    ) -> Transaction:
+        result = await self.send(
+            "eth_getTransactionByHash", [str(transaction_hash)]
+        )
+        if result is None:
+            raise TransactionNotFound(
+                f"Transaction with hash: '{transaction_hash}' not found."
+            )
+        return Transaction.parse_obj(result)
+
+    async def eth_get_raw_transaction(
+        self, transaction_hash: Hash32
+    ) -> HexBytes:
+        result = await self.send(
+            "eth_getRawTransactionByHash", [str(transaction_hash)]
+        )
+        if result is None or result == "0x":
+            raise TransactionNotFound(
+                f"Transaction with hash: '{transaction_hash}' not found."
+            )
+        return HexBytes(result)
+
+    async def eth_get_transaction_by_block(
+        self, block_identifier: BlockIdentifier, index: int
+    ) -> Transaction:
+        result = await self.send(
+            self._by_block("eth_getTransactionByBlock{}AndIndex",
+                           block_identifier),
+            [convert.block_id_to_geth(block_identifier), hex(index)]
+        )
+        if result is None:
+            raise TransactionNotFound(
+                f"Transaction index: {index} on block id: "
+                f"{block_identifier!r} not found."
+            )
+        return Transaction.parse_obj(result)
+
+    async def eth_get_raw_transaction_by_block(
+        self, block_identifier: BlockIdentifier, index: int
+    ) -> HexBytes:
+        result = await self.send(
+            self._by_block("eth_getRawTransactionByBlock{}AndIndex",
+                           block_identifier),
+            [convert.block_id_to_geth(block_identifier), hex(index)]
+        )
+        if result is None or result == "0x":
+            raise TransactionNotFound(
+                f"Transaction index: {index} on block id: "
+                f"{block_identifier!r} not found."
+            )
+        return HexBytes(result)
+
+    async def eth_get_transaction_cnt_by_block(
+        self, block_identifier: BlockIdentifier
+    ) -> int:
+        result = await self.send(
+            self._by_block("eth_getBlockTransactionCountBy{}",
+                           block_identifier),
+            [convert.block_id_to_geth(block_identifier)]
+        )
+        if result is None:
+            raise BlockNotFound(
+                f"Block with id: {block_identifier!r} not found."
+            )
+        return int(result, 16)
+
+    async def eth_send_transaction(self, transaction: TxParams) -> HexBytes:
+        if not self._is_native_tx(transaction):
+            return await super().eth_send_transaction(transaction)
+        return HexBytes(
+            await self.send("eth_sendTransaction", [transaction.to_geth()])
+        )
+
+    async def eth_get_balance(
+        self,
+        account: Address | ENS,
+        block_identifier: BlockIdentifier = "latest"
+    ) -> Wei:
+        if not isinstance(account, Address):
+            return await super().eth_get_balance(account, block_identifier)
+        return Wei(
+            await self.send(
+                "eth_getBalance",
+                [str(account), convert.block_id_to_geth(block_identifier)]
+            )
+        )
+
+    async def eth_get_code(
+        self,
+        account: Address | ENS,
+        block_identifier: BlockIdentifier = "latest"
+    ) -> HexBytes:
+        if not isinstance(account, Address):
+            return await super().eth_get_code(account, block_identifier)
+        return HexBytes(
+            await self.send(
+                "eth_getCode",
+                [str(account), convert.block_id_to_geth(block_identifier)]
+            )
+        )
+
+    async def eth_get_account_nonce(
+        self,
+        account: Address | ENS,
+        block_identifier: BlockIdentifier = "latest"
+    ) -> Nonce:
+        if not isinstance(account, Address):
+            return await super().eth_get_account_nonce(
+                account, block_identifier
+            )
+        return Nonce(
+            int(
+                await self.send(
+                    "eth_getTransactionCount",
+                    [str(account), convert.block_id_to_geth(block_identifier)]
+                ),
+                16
+            )
+        )
+
+    async def eth_get_block(
+        self,
+        block_identifier: BlockIdentifier,
+        full_transactions: bool = False
+    ) -> Block:
+        result = await self.send(
+            self._by_block("eth_getBlockBy{}", block_identifier),
+            [convert.block_id_to_geth(block_identifier), full_transactions]
+        )
+        if result is None:
+            raise BlockNotFound(
+                f"Block with id: {block_identifier!r} not found."
+            )
+        return Block.parse_obj(result)
+
+    async def eth_get_storage_at(
+        self,
+        account: Address | ENS,
+        position: int,
+        block_identifier: BlockIdentifier = "latest",
+    ) -> HexBytes:
+        if not isinstance(account, Address):
+            return await super().eth_get_storage_at(
+                account, position, block_identifier
+            )
+        return HexBytes(
+            await self.send(
+                "eth_getStorageAt",
+                [
+                    str(account),
+                    hex(position),
+                    convert.block_id_to_geth(block_identifier)
+                ]
+            )
+        )
+
+    async def eth_send_raw_transaction(
+        self, transaction: HexBytes
+     ) -> Hash32:
+        return Hash32(
+            await self.send("eth_sendRawTransaction", [str(transaction)])
+        )
+
+    async def eth_wait_for_transaction_receipt(
+        self,
+        transaction_hash: Hash32,
+        timeout: float = 120,
+        poll_latency: float = 0.1
+    ) -> Receipt:
+        async def poll() -> Receipt:
+            while True:
+                result = await self.send(
+                    "eth_getTransactionReceipt", [str(transaction_hash)]
+                )
+                if result is not None:
+                    return Receipt.parse_obj(result)
+                await asyncio.sleep(poll_latency)
+
+        try:
+            return await asyncio.wait_for(poll(), timeout)
+        except asyncio.TimeoutError:
+            raise TimeExhausted(
+                f"Transaction {transaction_hash} is not in the chain after "
+                f"{timeout} seconds"
+            )
+
+    async def eth_get_transaction_receipt(
+        self, transaction_hash: Hash32
+    ) -> Receipt:
+        result = await self.send(
+            "eth_getTransactionReceipt", [str(transaction_hash)]
+        )
+        if result is None:
+            raise TransactionNotFound(
+                f"Transaction with hash: '{transaction_hash}' not found."
+            )
+        return Receipt.parse_obj(result)
+
+    async def eth_sign(
+        self, account: Address | ENS, data: HexBytes
+    ) -> HexBytes:
+        if not isinstance(account, Address):
+            return await super().eth_sign(account, data)
+        return HexBytes(await self.send("eth_sign", [str(account), str(data)]))
+
+    def _by_block(self, method: str, block_identifier: BlockIdentifier) -> str:
+        """Choose the ``ByHash`` or ``ByNumber`` variant of a method.
+
+        Args:
+            method: The method name with a ``{}`` placeholder.
+            block_identifier: The block identifier.
+
+        Returns:
+            The method name for the type of the block identifier.
+        """
+        if isinstance(block_identifier, Hash32):
+            return method.format("Hash")
+        return method.format("Number")
+
+    def _is_native_tx(self, transaction: TxParams) -> bool:
+        """Whether a transaction can be sent without Web3.py, that is, it has
+        no ENS names.
+
+        Args:
+            transaction: The transaction parameters.
+
+        Returns:
+            ``True`` if ``to`` and ``from`` are addresses or unset.
+        """
+        return isinstance(transaction.to, Address) and (
+            transaction.from_ is None or isinstance(transaction.from_, Address)
+        )
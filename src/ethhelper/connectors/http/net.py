@@ -9,6 +9,9 @@ from web3.net import (
 from .base import (
     GethHttpWeb3,
 )
+from .transport import (
+    GethHttpTransport,
+)
 
 
 class GethNetHttp(GethHttpWeb3):
@@ -25,9 +28,16 @@ class GethNetHttp(GethHttpWeb3):
     The ``logger`` is used to assign a logger of the Python logging module to
     this class. Explicitly assigning a logger can be used to control the output
     location of the logger, which is convenient for debugging.
+
+    The ``transport`` is the pooled HTTP transport used to send requests.
     """
-    def __init__(self, url: str, logger: Logger) -> None:
-        super().__init__(url, logger)
+    def __init__(
+        self,
+        url: str,
+        logger: Logger,
+        transport: GethHttpTransport | None = None
+    ) -> None:
+        super().__init__(url, logger, transport)
         self.net: AsyncNet = self.w3.net
         """Asynchronous Net interface for Web3. Used to simplify the access
         path.
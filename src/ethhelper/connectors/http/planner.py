@@ -0,0 +1,452 @@
+import functools
+from logging import (
+    Logger,
+)
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Sequence,
+    TypeVar,
+)
+
+from eth_typing import (
+    BlockNumber,
+)
+from httpx import (
+    HTTPError,
+)
+import orjson
+
+from ethhelper.datatypes.base import (
+    Address,
+    BlockIdentifier,
+    Hash32,
+)
+from ethhelper.datatypes.eth import (
+    AccountState,
+    BlockHeader,
+    FilterParams,
+    Log,
+)
+from ethhelper.datatypes.geth import (
+    GethError,
+    GethGraphQLError,
+)
+from ethhelper.datatypes.stats import (
+    PlanStats,
+)
+from ethhelper.utils import (
+    convert,
+)
+from ethhelper.utils.planner import (
+    QueryPlanner,
+)
+
+from .cache import (
+    log_filter_key,
+)
+from .custom import (
+    GethCustomHttp,
+)
+from .graphql import (
+    ACCOUNT_FIELDS,
+    GethGraphQL,
+)
+from .transport import (
+    GethHttpTransport,
+)
+
+R = TypeVar("R")
+
+RPC_ACCOUNT_METHODS: dict[str, str] = {
+    "balance": "eth_getBalance",
+    "nonce": "eth_getTransactionCount",
+    "code": "eth_getCode",
+}
+"""The JSON-RPC methods of the fields of ``AccountState``."""
+
+BACKEND_ERRORS: tuple[type[Exception], ...] = (
+    GethError,
+    GethGraphQLError,
+    HTTPError,
+    orjson.JSONDecodeError,
+)
+"""The errors after which a query falls back to another backend. A node
+without GraphQL service answers its GraphQL url by a plain text 404, which
+cannot be json decoded.
+"""
+
+
+class GethPlannedHttp(GethGraphQL, GethCustomHttp):
+    """An HTTP interface for Geth nodes that inherits from ``GethGraphQL``
+    and ``GethCustomHttp``, and runs each range query by the backend which is
+    cheaper on this node.
+
+    The ``query_*`` methods can be answered both by GraphQL and by JSON-RPC.
+    The ``planner`` measures the items per second and the response bytes per
+    item of each backend for each kind of query, and then sends the queries
+    to the faster one, measuring the other again from time to time. A query
+    whose backend fails, for example because the node has no GraphQL
+    service, falls back to the other backend. The costs and the reason of
+    each choice are reported by ``plan_stats``.
+
+    The response bytes are counted by ``received_bytes``, so they include
+    the responses of the other requests sent concurrently.
+    """
+    def __init__(
+        self,
+        url: str,
+        logger: Logger,
+        graphql_url: str | None = None,
+        transport: GethHttpTransport | None = None
+    ) -> None:
+        super().__init__(url, logger, graphql_url, transport)
+        self.planner: QueryPlanner = QueryPlanner()
+        """The chooser of the backend of each query."""
+
+    def plan_stats(self) -> dict[str, PlanStats]:
+        """Get the measured costs and the last choice of every kind of query.
+
+        Returns:
+            A dictionary mapping the kind of query to its ``PlanStats``.
+        """
+        return self.planner.stats()
+
+    async def query_block_headers(
+        self,
+        from_height: BlockNumber,
+        to_height: BlockNumber,
+        fields: Sequence[str] = ("number", "timestamp")
+    ) -> list[BlockHeader]:
+        """
+        Retrieves some header fields of the blocks within a range of block
+        numbers, by ``get_block_headers_by_numbers_range`` or by batches of
+        ``eth_getHeaderByNumber``, whichever is cheaper.
+
+        Args:
+            from_height: The starting block number.
+            to_height: The ending block number.
+            fields: The JSON-RPC names of the header fields, see
+                ``BLOCK_FIELDS``. ``transactionCount`` is only fetched by
+                GraphQL.
+
+        Returns:
+            A list of ``BlockHeader`` instances in block order, up to the head
+            of the node, with the fields which were not requested set to
+            ``None``.
+
+
+        Raises:
+            ValueError: If a field is not in ``BLOCK_FIELDS``.
+        """
+        fields = self._block_fields(fields)
+        runs: dict[str, Callable[[], Awaitable[list[BlockHeader]]]] = {
+            "graphql": functools.partial(
+                self.get_block_headers_by_numbers_range,
+                from_height,
+                to_height,
+                fields
+            ),
+        }
+        if "transactionCount" not in fields:
+            runs["jsonrpc"] = functools.partial(
+                self._get_headers_rpc, from_height, to_height, fields
+            )
+        return await self._run_planned(
+            "headers:" + ",".join(fields),
+            to_height - from_height + 1,
+            runs
+        )
+
+    async def query_block_timestamps(
+        self, from_height: BlockNumber, to_height: BlockNumber
+    ) -> dict[BlockNumber, int]:
+        """
+        Retrieves the timestamps of blocks within a range of block numbers by
+        the cheaper backend, see ``query_block_headers``.
+
+        Args:
+            from_height: The starting block number.
+            to_height: The ending block number.
+
+        Returns:
+            A dictionary mapping block numbers to their corresponding
+            timestamps.
+        """
+        headers = await self.query_block_headers(
+            from_height, to_height, ("timestamp",)
+        )
+        return {
+            header.number: header.timestamp
+            for header in headers if header.timestamp is not None
+        }
+
+    async def query_logs(
+        self,
+        start_height: BlockNumber,
+        end_height: BlockNumber,
+        address: Address | list[Address] | None = None,
+        topics: Sequence[Hash32 | Sequence[Hash32]] | None = None
+    ) -> list[Log]:
+        """
+        Retrieves the logs within a range of blocks, by ``get_logs_graphql``
+        or by ``eth_getLogs`` as ``get_logs_by_blocks``, whichever is cheaper
+        for the density of the logs of this address and topics.
+
+        The logs in the ``cache`` and the ``head_cache`` are read as by
+        ``get_logs_by_blocks``, and only the blocks they do not cover are
+        fetched by the chosen backend. Only these fetches are measured, so
+        the cache hits do not count as the throughput of a backend.
+
+        Args:
+            start_height: The block height to start retrieving logs from.
+            end_height: The block height to stop retrieving logs from.
+            address: An address or list of addresses to filter the logs by.
+            topics: A list of topics or nested lists of topics to filter the
+                logs by.
+
+        Returns:
+            A list of Log objects in ``(block_number, log_index)`` order.
+        """
+        filter = FilterParams(  # type: ignore
+            address=address, topics=topics
+        )
+        operation = "logs:" + log_filter_key(filter.to_geth()).decode()
+
+        async def fetch(start: BlockNumber, end: BlockNumber) -> list[Log]:
+            return await self._run_planned(
+                operation,
+                end - start + 1,
+                {
+                    "graphql": functools.partial(
+                        self.get_logs_graphql,
+                        FilterParams(  # type: ignore
+                            address=address,
+                            from_block=start,
+                            to_block=end,
+                            topics=topics
+                        )
+                    ),
+                    "jsonrpc": functools.partial(
+                        self._fetch_logs_by_blocks,
+                        start,
+                        end,
+                        address,
+                        topics,
+                        step=None,
+                        concurrency=4,
+                        max_step=100000,
+                        target_logs=5000
+                    ),
+                }
+            )
+
+        return await self._get_logs_cached(
+            start_height, end_height, address, topics, fetch
+        )
+
+    async def query_accounts_state(
+        self,
+        addresses: Sequence[Address],
+        block_identifier: BlockIdentifier = "latest",
+        fields: Sequence[str] = ("balance", "nonce", "code")
+    ) -> dict[Address, AccountState]:
+        """
+        Retrieves the state of many accounts at one block, by
+        ``get_accounts_state`` or by batches of ``eth_getBalance``,
+        ``eth_getTransactionCount`` and ``eth_getCode``, whichever is cheaper.
+
+        Args:
+            addresses: The addresses of the accounts.
+            block_identifier: The block number or hash, ``earliest`` or
+                ``latest``, which is resolved to the number of the head.
+            fields: The fields of ``AccountState`` to fetch, any of
+                ``balance``, ``nonce`` and ``code``.
+
+        Returns:
+            A dictionary mapping each address to its ``AccountState``, with
+            the fields which were not requested set to ``None``.
+
+        Raises:
+            ValueError: If a field is not in ``ACCOUNT_FIELDS``.
+        """
+        unknown = [field for field in fields if field not in ACCOUNT_FIELDS]
+        if len(unknown) != 0:
+            raise ValueError(f"Unknown account fields: {unknown}")
+        if isinstance(block_identifier, str) and block_identifier == "latest":
+            block_identifier = BlockNumber(
+                int(await self.send("eth_blockNumber", []), 16)
+            )
+        return await self._run_planned(
+            "accounts:" + ",".join(fields),
+            len(addresses),
+            {
+                "graphql": functools.partial(
+                    self.get_accounts_state,
+                    addresses,
+                    block_identifier,
+                    fields
+                ),
+                "jsonrpc": functools.partial(
+                    self._get_accounts_rpc, addresses, block_identifier, fields
+                ),
+            }
+        )
+
+    async def _run_planned(
+        self,
+        operation: str,
+        items: int,
+        runs: dict[str, Callable[[], Awaitable[R]]]
+    ) -> R:
+        """
+        Run a query by the backend chosen by the ``planner``, falling back to
+        the other backends if it fails.
+
+        Args:
+            operation: The kind of query, see ``QueryPlanner.choose``.
+            items: The number of items of the query, such as blocks.
+            runs: The coroutine functions running the query, by backend.
+
+        Returns:
+            The result of the query.
+
+        Raises:
+            GethError: If every backend failed, the error of the last one.
+            GethGraphQLError: If every backend failed, the error of the last
+                one.
+            httpx.HTTPError: If every backend failed, the error of the last
+                one.
+            orjson.JSONDecodeError: If every backend failed, the error of the
+                last one.
+        """
+        backend = self.planner.choose(operation, list(runs))
+        self.logger.debug(
+            f"Run {operation} by {backend}: "
+            f"{self.planner.reasons[operation]}"
+        )
+        order = [backend, *[other for other in runs if other != backend]]
+        for backend in order[:-1]:
+            try:
+                return await self._run_measured(
+                    operation, backend, items, runs[backend]
+                )
+            except BACKEND_ERRORS as e:
+                self.logger.warning(
+                    f"{operation} failed by {backend}, fall back: {e!r}"
+                )
+        return await self._run_measured(
+            operation, order[-1], items, runs[order[-1]]
+        )
+
+    async def _run_measured(
+        self,
+        operation: str,
+        backend: str,
+        items: int,
+        run: Callable[[], Awaitable[R]]
+    ) -> R:
+        """
+        Run a query by one backend and record its cost in the ``planner``.
+
+        Args:
+            operation: The kind of query.
+            backend: The backend.
+            items: The number of items of the query.
+            run: The coroutine function running the query by this backend.
+
+        Returns:
+            The result of the query.
+        """
+        received = self.received_bytes
+        start_time = time.monotonic()
+        try:
+            result = await run()
+        except BACKEND_ERRORS:
+            self.planner.fail(operation, backend)
+            raise
+        self.planner.observe(
+            operation,
+            backend,
+            items,
+            time.monotonic() - start_time,
+            self.received_bytes - received
+        )
+        return result
+
+    async def _get_headers_rpc(
+        self,
+        from_height: BlockNumber,
+        to_height: BlockNumber,
+        fields: Sequence[str]
+    ) -> list[BlockHeader]:
+        """
+        Retrieves some header fields of the blocks within a range of block
+        numbers by adaptive batches of ``eth_getHeaderByNumber``.
+
+        Args:
+            from_height: The starting block number.
+            to_height: The ending block number.
+            fields: The JSON-RPC names of the header fields.
+
+        Returns:
+            A list of ``BlockHeader`` instances in block order, up to the head
+            of the node, as ``get_block_headers_by_numbers_range``.
+        """
+        requests: list[tuple[str, list[Any] | None]] = [
+            ("eth_getHeaderByNumber", [hex(number)])
+            for number in range(from_height, to_height + 1)
+        ]
+        responses = await self.send_adaptive(
+            requests, retries=2, initial=200
+        )
+        self._raise_batch_errors(responses)
+        headers: list[BlockHeader] = []
+        for header in responses:
+            if header is None:
+                break
+            headers.append(
+                BlockHeader.parse_obj(
+                    {field: header.get(field) for field in fields}
+                )
+            )
+        return headers
+
+    async def _get_accounts_rpc(
+        self,
+        addresses: Sequence[Address],
+        block_identifier: BlockIdentifier,
+        fields: Sequence[str]
+    ) -> dict[Address, AccountState]:
+        """
+        Retrieves the state of many accounts at one block by adaptive batches
+        of JSON-RPC requests, one per account and field.
+
+        Args:
+            addresses: The addresses of the accounts.
+            block_identifier: The block number or hash.
+            fields: The fields of ``AccountState`` to fetch.
+
+        Returns:
+            A dictionary mapping each address to its ``AccountState``.
+        """
+        block = convert.block_id_to_geth(block_identifier)
+        requests: list[tuple[str, list[Any] | None]] = [
+            (RPC_ACCOUNT_METHODS[field], [str(address), block])
+            for address in addresses
+            for field in fields
+        ]
+        responses = await self.send_adaptive(
+            requests, retries=2, initial=200
+        )
+        self._raise_batch_errors(responses)
+        result: dict[Address, AccountState] = {}
+        for i, address in enumerate(addresses):
+            values = responses[i * len(fields):(i + 1) * len(fields)]
+            state = AccountState.parse_obj(
+                {"address": address, **dict(zip(fields, values))}
+            )
+            result[state.address] = state
+        return result
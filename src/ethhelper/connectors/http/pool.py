@@ -0,0 +1,300 @@
+import asyncio
+from asyncio import (
+    Task,
+)
+from logging import (
+    Logger,
+)
+import time
+from types import (
+    TracebackType,
+)
+
+from httpx import (
+    HTTPStatusError,
+    TransportError,
+)
+import orjson
+
+from ethhelper.datatypes.stats import (
+    NodeStats,
+)
+from ethhelper.utils import (
+    json,
+)
+
+from .transport import (
+    GethHttpTransport,
+)
+
+HEALTH_CHECK = json.encode_batch(
+    [
+        json.encode_request(1, "eth_syncing", []),
+        json.encode_request(2, "eth_blockNumber", []),
+    ]
+)
+
+
+class GethNode:
+    """The state of one Geth node of a ``GethHttpPool``.
+
+    The ``url`` and ``graphql_url`` are the JSON-RPC and GraphQL endpoints of
+    the node. The ``alpha`` is the smoothing factor of the moving average of
+    the latency.
+    """
+    def __init__(self, url: str, graphql_url: str, alpha: float = 0.2) -> None:
+        self.url = url
+        self.graphql_url = graphql_url
+        self.alpha = alpha
+        self.checked = False
+        """Whether the node has been health checked at least once."""
+        self.healthy = True
+        """Whether the last health check or request of the node succeeded and
+        the node is not syncing.
+        """
+        self.syncing = False
+        self.head = 0
+        """The latest block number of the node at the last health check."""
+        self.latency = 0.0
+        """The moving average of the latency of the node in seconds."""
+        self.inflight = 0
+        """The number of requests in flight to the node."""
+        self.requests = 0
+        self.failures = 0
+        self.last_error: str | None = None
+
+    def observe(self, latency: float) -> None:
+        """Record the latency of a successful request.
+
+        Args:
+            latency: The latency of the request in seconds.
+        """
+        if self.requests == 0 and not self.checked:
+            self.latency = latency
+        else:
+            self.latency += self.alpha * (latency - self.latency)
+
+    def fail(self, error: BaseException) -> None:
+        """Record a failed request and mark the node unhealthy until its next
+        successful health check.
+
+        Args:
+            error: The exception of the failed request.
+        """
+        self.failures += 1
+        self.healthy = False
+        self.last_error = repr(error)
+
+    def score(self) -> float:
+        """The expected latency of the next request to the node, which grows
+        with the requests in flight, so that concurrent requests are spread
+        over the nodes.
+        """
+        return self.latency * (self.inflight + 1)
+
+    def stats(self, best_head: int) -> NodeStats:
+        """Get the current state of this node.
+
+        Args:
+            best_head: The highest head of all nodes of the pool.
+
+        Returns:
+            A ``NodeStats`` object of this node.
+        """
+        return NodeStats(
+            url=self.url,
+            healthy=self.healthy,
+            syncing=self.syncing,
+            head=self.head,
+            lag=max(0, best_head - self.head),
+            latency=self.latency,
+            inflight=self.inflight,
+            requests=self.requests,
+            failures=self.failures,
+            last_error=self.last_error,
+        )
+
+
+class GethHttpPool:
+    """A pool of Geth nodes with health checks, latency-aware routing and
+    failover.
+
+    Every ``check_interval`` seconds, each node is sent ``eth_syncing`` and
+    ``eth_blockNumber`` in one batch. A node is eligible when its last check
+    or request succeeded, it is not syncing and its head is at most
+    ``max_lag`` blocks behind the highest head of the pool. Each request goes
+    to the eligible node with the lowest moving average latency, weighted by
+    the requests already in flight to it, so latency-sensitive calls stay on
+    the fastest node while concurrent bulk requests spread over the others.
+
+    A request failing with a transport error, or an HTTP 5xx status, is sent
+    again to the next best node, until every node has been tried. The
+    failed node is skipped until its next successful health check.
+
+    The ``urls`` are the JSON-RPC endpoints of the nodes, and the
+    ``graphql_urls`` their GraphQL endpoints, by default ``url`` appended
+    with ``graphql``. The ``transport`` is shared by all nodes.
+    """
+    def __init__(
+        self,
+        urls: list[str],
+        logger: Logger,
+        transport: GethHttpTransport,
+        graphql_urls: list[str] | None = None,
+        check_interval: float = 5,
+        max_lag: int = 2,
+    ) -> None:
+        if len(urls) == 0:
+            raise ValueError("GethHttpPool needs at least one url.")
+        if graphql_urls is None:
+            graphql_urls = [
+                (url if url.endswith("/") else url + "/") + "graphql"
+                for url in urls
+            ]
+        self.nodes: list[GethNode] = [
+            GethNode(url, graphql_url)
+            for url, graphql_url in zip(urls, graphql_urls)
+        ]
+        """The nodes of the pool, in the order of ``urls``."""
+        self.logger = logger
+        self.transport = transport
+        self.check_interval = check_interval
+        self.max_lag = max_lag
+        self.check_task: Task[None] | None = None
+
+    @property
+    def best_head(self) -> int:
+        """The highest head of all healthy nodes."""
+        return max(
+            (node.head for node in self.nodes if node.healthy), default=0
+        )
+
+    async def check(self, node: GethNode) -> None:
+        """Health check a node and update its state.
+
+        Args:
+            node: The node to be checked.
+        """
+        start = time.monotonic()
+        try:
+            raw_res = await self.transport.post(node.url, HEALTH_CHECK)
+            results = {res["id"]: res for res in orjson.loads(raw_res)}
+            syncing = results[1]["result"]
+            head = int(results[2]["result"], 16)
+        except Exception as e:
+            if node.healthy:
+                self.logger.warning(f"Geth node {node.url} is down: {e!r}")
+            node.fail(e)
+        else:
+            node.observe(time.monotonic() - start)
+            node.syncing = syncing is not False
+            node.head = head
+            if not node.healthy and not node.syncing:
+                self.logger.info(f"Geth node {node.url} is up.")
+            node.healthy = not node.syncing
+        node.checked = True
+
+    async def check_all(self) -> None:
+        """Health check all nodes concurrently."""
+        await asyncio.gather(*[self.check(node) for node in self.nodes])
+
+    async def _check_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.check_all()
+
+    async def start(self) -> None:
+        """Check all nodes and start the background health checks, if not
+        started yet.
+        """
+        if self.check_task is not None:
+            return
+        self.check_task = asyncio.create_task(self._check_loop())
+        await self.check_all()
+
+    def candidates(self) -> list[GethNode]:
+        """Rank the nodes for the next request.
+
+        Returns:
+            The eligible nodes by ascending ``score``, followed by the other
+            nodes by ascending number of failures, as fallbacks.
+        """
+        best_head = self.best_head
+        eligible = [
+            node for node in self.nodes
+            if node.healthy and best_head - node.head <= self.max_lag
+        ]
+        others = [node for node in self.nodes if node not in eligible]
+        eligible.sort(key=GethNode.score)
+        others.sort(key=lambda node: (node.syncing, node.failures))
+        return eligible + others
+
+    async def post(self, content: str | bytes, graphql: bool = False) -> bytes:
+        """Post json content to the best node, failing over to the next nodes
+        on transport errors.
+
+        Args:
+            content: The json content will be sent.
+            graphql: Whether to post to the GraphQL endpoint instead of the
+                JSON-RPC endpoint.
+
+        Returns:
+            The content of the response in bytes.
+
+        Raises:
+            httpx.TransportError: Raised when the request fails on all nodes.
+            httpx.HTTPStatusError: Raised when all nodes answer an HTTP 5xx
+                status.
+        """
+        if self.check_task is None:
+            await self.start()
+        error: Exception | None = None
+        for node in self.candidates():
+            url = node.graphql_url if graphql else node.url
+            node.inflight += 1
+            start = time.monotonic()
+            try:
+                raw_res = await self.transport.post(url, content)
+            except (TransportError, HTTPStatusError) as e:
+                self.logger.warning(f"Request to {url} failed: {e!r}")
+                node.fail(e)
+                error = e
+                continue
+            finally:
+                node.inflight -= 1
+                node.requests += 1
+            node.observe(time.monotonic() - start)
+            return raw_res
+        assert error is not None
+        raise error
+
+    def stats(self) -> dict[str, NodeStats]:
+        """Get the current state of all nodes.
+
+        Returns:
+            A dictionary mapping the url of each node to its ``NodeStats``.
+        """
+        best_head = self.best_head
+        return {node.url: node.stats(best_head) for node in self.nodes}
+
+    async def aclose(self) -> None:
+        """Stop the background health checks."""
+        if self.check_task is None:
+            return
+        self.check_task.cancel()
+        try:
+            await self.check_task
+        except asyncio.CancelledError:
+            pass
+        self.check_task = None
+
+    async def __aenter__(self) -> "GethHttpPool":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None = None,
+        exc_value: BaseException | None = None,
+        traceback: TracebackType | None = None,
+    ) -> None:
+        await self.aclose()
@@ -0,0 +1,105 @@
+from types import (
+    TracebackType,
+)
+
+from httpx import (
+    AsyncClient,
+    Limits,
+    Timeout,
+)
+
+
+class GethHttpTransport:
+    """A pooled, long-lived HTTP transport shared by all HTTP interfaces.
+
+    ``GethHttpTransport`` owns a single ``httpx.AsyncClient`` whose connections
+    are kept alive and reused between requests, so JSON-RPC, GraphQL and
+    Web3.py calls no longer pay for a new TCP (and TLS) handshake each time.
+    One transport can be shared by several connectors.
+
+    The ``timeout`` is the default timeout in seconds for reading, writing and
+    acquiring a connection from the pool, and ``connect_timeout`` is the
+    timeout in seconds for establishing a new connection.
+
+    The ``max_connections`` and ``max_keepalive_connections`` limit the total
+    number of connections and the number of idle connections kept in the
+    pool. Idle connections are closed after ``keepalive_expiry`` seconds.
+
+    The ``http2`` enables HTTP/2 if the server supports it. It requires the
+    optional ``h2`` package, which can be installed by ``httpx[http2]``.
+
+    The ``compression`` controls whether gzip compressed responses are
+    negotiated with the server by the ``Accept-Encoding`` header.
+    """
+    def __init__(
+        self,
+        timeout: float = 30,
+        connect_timeout: float = 5,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30,
+        http2: bool = False,
+        compression: bool = True,
+    ) -> None:
+        self.client: AsyncClient = AsyncClient(
+            timeout=Timeout(timeout, connect=connect_timeout),
+            limits=Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            http2=http2,
+            headers={
+                "Content-Type": "application/json",
+                "Accept-Encoding": "gzip" if compression else "identity",
+            },
+        )
+        """The underlying ``httpx.AsyncClient`` holding the connection pool.
+        """
+
+    @property
+    def closed(self) -> bool:
+        """Whether this transport has been closed."""
+        return self.client.is_closed
+
+    async def post(self, url: str, content: str | bytes) -> bytes:
+        """Post json content to ``url`` and return the content of the
+        response.
+
+        The content is returned as the raw bytes, without decoding it into
+        text, since the json decoder takes bytes directly.
+
+        Args:
+            url: The url the content will be posted to.
+            content: The json content will be sent.
+
+        Returns:
+            The content of the response in bytes.
+
+        Raises:
+            httpx.RequestError: Raised when an HTTP request fails.
+            httpx.HTTPStatusError: Raised when the server answers an HTTP 5xx
+                status, which never carries a JSON-RPC response.
+        """
+        res = await self.client.post(url, content=content)
+        if res.is_server_error:
+            res.raise_for_status()
+        return res.content
+
+    async def aclose(self) -> None:
+        """Close all connections of this transport.
+
+        The transport cannot be used anymore after it is closed.
+        """
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "GethHttpTransport":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None = None,
+        exc_value: BaseException | None = None,
+        traceback: TracebackType | None = None,
+    ) -> None:
+        await self.aclose()
@@ -16,9 +16,7 @@ from typing import (
     Any,
 )
 
-from pydantic import (
-    ValidationError,
-)
+import orjson
 from websockets import (
     client,
 )
@@ -26,9 +24,12 @@ from websockets import (
 from ethhelper.datatypes.geth import (
     GethError,
     GethErrorResponse,
-    GethRequest,
     GethSuccessResponse,
     GethWSResponse,
+    decode_response,
+)
+from ethhelper.utils import (
+    json,
 )
 
 
@@ -104,26 +105,18 @@ class GethSubscriber(metaclass=ABCMeta):
             requests.
         """
         self.id += 1
-        data = GethRequest(id=self.id, method=method, params=params).json()
-        self.logger.debug(f"SEND {data}")
-        await self.ws.send(data)
+        data = json.encode_request(self.id, method, params)
+        self.logger.debug("SEND %r", data)
+        await self.ws.send(data.decode())
         return self.id
 
     async def _recieve_loop(self) -> None:
         """The loop that listens for messages from the Geth node."""
         async for data in self.ws:
-            if isinstance(data, bytes):
-                data = data.decode()
-            self.logger.debug(f"RECV {data}")
-            response: GethWSResponse | GethSuccessResponse | GethErrorResponse
-            try:
-                response = GethWSResponse.parse_raw(data)
-            except ValidationError:
-                try:
-                    response = GethSuccessResponse.parse_raw(data)
-                except ValidationError:
-                    response = GethErrorResponse.parse_raw(data)
-                    raise GethError(error=response.error)
+            self.logger.debug("RECV %r", data)
+            response = decode_response(orjson.loads(data))
+            if isinstance(response, GethErrorResponse):
+                raise GethError(error=response.error)
             await self.handle(response)
 
     async def subscribe(self, param: str) -> int:
@@ -19,6 +19,9 @@ from ethhelper.datatypes.geth import (
     GethWSResponse,
     NoSubscribeToken,
 )
+from ethhelper.utils.chain import (
+    ChainTracker,
+)
 
 from .base import (
     GethSubscriber,
@@ -26,10 +29,23 @@ from .base import (
 
 
 class GethNewBlockSubscriber(GethSubscriber):
-    def __init__(self, url: str, logger: Logger | None = None) -> None:
+    """A subscriber of the new heads of a Geth node.
+
+    Each new head is passed to ``on_block``. If ``tracker`` is given, each
+    new head is first added to it, so that the caches following the tracker
+    evict the results of the blocks orphaned by a reorg before ``on_block``
+    runs.
+    """
+    def __init__(
+        self,
+        url: str,
+        logger: Logger | None = None,
+        tracker: ChainTracker | None = None
+    ) -> None:
         if logger is None:
             logger = logging.getLogger("GethNewBlockSubsriber")
         super().__init__(url, logger)
+        self.tracker = tracker
 
     async def subscribe_new_block(self) -> None:
         """Subscribe to new block notifications on the Geth node."""
@@ -85,7 +101,10 @@ class GethNewBlockSubscriber(GethSubscriber):
             await self.on_other(data)
             return
 
-        await self.on_block(Block.parse_obj(data.params.result))
+        block = Block.parse_obj(data.params.result)
+        if self.tracker is not None:
+            await self.tracker.add_block(block)
+        await self.on_block(block)
 
     @abstractmethod
     async def on_block(self, block: Block) -> None:
@@ -187,7 +187,7 @@ class HexBytes:
         if isinstance(value, bytes) or \
                 (isinstance(value, str) and value.startswith("0x")):
             return cls(value)
-        return value
+        raise TypeError(f"{type(value).__name__} is not a hex string.")
 
 
 class Hash32(HexBytes):
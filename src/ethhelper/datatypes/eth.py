@@ -1,5 +1,6 @@
 import typing
 from typing import (
+    Any,
     NewType,
     Sequence,
 )
@@ -65,6 +66,10 @@ class SyncStatus(BaseModel):
     starting_block: int = Field(alias="startingBlock")
     """The block number at which the node started syncing."""
 
+    int_val = convert.int_validator(
+        "current_block", "highest_block", "starting_block"
+    )
+
     class Config:
         allow_population_by_field_name = True
         arbitrary_types_allowed = True
@@ -86,6 +91,8 @@ class FeeHistory(BaseModel):
     ``None`` if rewards are not available.
     """
 
+    int_val = convert.int_validator("oldest_block")
+
     class Config:
         allow_population_by_field_name = True
         arbitrary_types_allowed = True
@@ -153,6 +160,23 @@ class TxParams(BaseModel):
             td["value"] = typing.cast(Wei, td["value"]).to_web3()
         return typing.cast(Web3TxParams, td)
 
+    def to_geth(self) -> dict[str, Any]:
+        """Convert the transaction parameters to the json form of the
+        transaction object of Geth JSON-RPC API, such as ``eth_call``.
+
+        Returns:
+            A dictionary which can be json encoded and sent to Geth.
+        """
+        td = self.dict(by_alias=True, exclude_none=True)
+        for key, value in td.items():
+            if isinstance(value, HexBytes):
+                td[key] = str(value)
+            elif isinstance(value, IntStr):
+                td[key] = hex(value.value)
+            elif isinstance(value, int):
+                td[key] = hex(value)
+        return td
+
     class Config:
         allow_population_by_field_name = True
         arbitrary_types_allowed = True
@@ -207,7 +231,8 @@ class Transaction(BaseModel):
     # vaildators
     int_val = convert.int_validator(
         "block_number", "gas", "gas_price", "max_fee_per_gas", "v",
-        "max_priority_fee_per_gas", "nonce", "value", "type", "chain_id"
+        "max_priority_fee_per_gas", "nonce", "value", "type", "chain_id",
+        "transaction_index"
     )
 
     class Config:
@@ -303,6 +328,75 @@ class Block(BaseModel):
         json_dumps = json.orjson_dumps
 
 
+class BlockHeader(BaseModel):
+    """Some header fields of a block, as fetched by a GraphQL field projection.
+
+    Only ``number`` is always present. The other fields are ``None`` unless
+    they were requested.
+    """
+    number: BlockNumber
+    """The number of this block, starting at 0 for the genesis block."""
+    hash: Hash32 | None = None
+    """The hash (32 bytes) of this block."""
+    parent_hash: Hash32 | None = Field(None, alias="parentHash")
+    """The hash (32 bytes) of the parent block of this block."""
+    nonce: HexBytes | None = None
+    """The block nonce, a sequence (8 bytes) determined by the miner."""
+    miner: Address | None = None
+    """The address (20 bytes) of the account that mined this block."""
+    timestamp: int | None = None
+    """The unix timestamp at which this block was mined."""
+    gas_limit: Gas | None = Field(None, alias="gasLimit")
+    """The maximum amount of gas that was available to transactions in this
+        block.
+    """
+    gas_used: Gas | None = Field(None, alias="gasUsed")
+    """The amount of gas that was used to execute transactions in this block.
+    """
+    base_fee_per_gas: Wei | None = Field(None, alias="baseFeePerGas")
+    """The fee per unit of gas burned by the protocol in this block."""
+    difficulty: IntStr | None = None
+    """The difficulty (in hashes) of mining this block."""
+    total_difficulty: IntStr | None = Field(None, alias="totalDifficulty")
+    """The sum of all difficulty values up to and including this block."""
+    extra_data: HexBytes | None = Field(None, alias="extraData")
+    """Additional data provided by the miner."""
+    logs_bloom: HexBytes | None = Field(None, alias="logsBloom")
+    """A bloom filter of the logs of this block."""
+    mix_hash: Hash32 | None = Field(None, alias="mixHash")
+    """The hash (32 bytes) used as an input to the PoW process, or the RANDAO
+        value after the Merge.
+    """
+    state_root: HexBytes | None = Field(None, alias="stateRoot")
+    """The keccak256 hash (32 bytes) of the state trie after this block was
+        processed.
+    """
+    receipts_root: HexBytes | None = Field(None, alias="receiptsRoot")
+    """The keccak256 hash (32 bytes) of the trie of transaction receipts in
+        this block.
+    """
+    transactions_root: HexBytes | None = Field(
+        None, alias="transactionsRoot"
+    )
+    """The keccak256 hash (32 bytes) of the root of the trie of transactions in
+        this block.
+    """
+    transaction_count: int | None = Field(None, alias="transactionCount")
+    """The number of transactions in this block."""
+    # vaildators
+    int_val = convert.int_validator(
+        "number", "timestamp", "gas_limit", "gas_used", "base_fee_per_gas",
+        "difficulty", "total_difficulty", "transaction_count"
+    )
+
+    class Config:
+        allow_population_by_field_name = True
+        arbitrary_types_allowed = True
+        frozen = True
+        json_loads = orjson.loads
+        json_dumps = json.orjson_dumps
+
+
 class Log(BaseModel):
     """A published Ethereum event log."""
     block_number: BlockNumber = Field(alias="blockNumber")
@@ -365,8 +459,9 @@ class Receipt(BaseModel):
     status: int
     """The status code of this transaction, where 0 represents success and
     non-zero represents failure."""
-    to: Address
-    """The address of the account or contract that received this transaction.
+    to: Address | None
+    """The address of the account or contract that received this transaction,
+    or ``None`` for a contract creation.
     """
     transaction_hash: Hash32 = Field(alias="transactionHash")
     """The hash of the transaction that generated this receipt."""
@@ -391,6 +486,31 @@ class Receipt(BaseModel):
         json_dumps = json.orjson_dumps
 
 
+class AccountState(BaseModel):
+    """The state of an account at a block.
+
+    Only ``address`` is always present. The other fields are ``None`` unless
+    they were requested.
+    """
+    address: Address
+    """The address of the account."""
+    balance: Wei | None = None
+    """The balance of the account in Wei."""
+    nonce: Nonce | None = None
+    """The number of transactions sent from the account."""
+    code: HexBytes | None = None
+    """The code of the account, empty for an externally owned account."""
+    # vaildators
+    int_val = convert.int_validator("balance", "nonce")
+
+    class Config:
+        allow_population_by_field_name = True
+        arbitrary_types_allowed = True
+        frozen = True
+        json_loads = orjson.loads
+        json_dumps = json.orjson_dumps
+
+
 class FilterParams(BaseModel):
     """Parameters used for creating Ethereum filters."""
     address: Address | list[Address] | None = None
@@ -455,6 +575,37 @@ class FilterParams(BaseModel):
                 td["topics"] = [str(top) for top in td["topics"]]
         return typing.cast(Web3FilterParams, td)
 
+    def to_geth(self) -> dict[str, Any]:
+        """Converts the ``FilterParams`` object to the json form of the
+        filter parameter of ``eth_getLogs``.
+
+        Returns:
+            A dictionary which can be json encoded and sent to Geth.
+        """
+        td = self.dict(by_alias=True, exclude_none=True)
+        if "address" in td:
+            if isinstance(td["address"], Address):
+                td["address"] = str(td["address"])
+            else:
+                td["address"] = [str(addr) for addr in td["address"]]
+        if "blockHash" in td:
+            td["blockHash"] = str(td["blockHash"])
+            if "fromBlock" in td or "toBlock" in td:
+                raise ValueError(
+                    "You should only choose one of blockHash or "
+                    "fromBlock/toBlock as filter params"
+                )
+        for key in ("fromBlock", "toBlock"):
+            if key in td:
+                td[key] = convert.block_id_to_geth(td[key])
+        if "topics" in td:
+            td["topics"] = [
+                str(top) if isinstance(top, Hash32) else
+                [str(top2) for top2 in top]
+                for top in td["topics"]
+            ]
+        return td
+
     class Config:
         allow_population_by_field_name = True
         arbitrary_types_allowed = True
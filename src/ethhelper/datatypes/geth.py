@@ -57,6 +57,15 @@ class GethRequest(BaseModel):
     params: list[Any]
     """A list of parameters to pass to the RPC method."""
 
+    def encode(self) -> bytes:
+        """Encode the request into json bytes by ``encode_request``, without
+        going through pydantic.
+
+        Returns:
+            The json encoded request.
+        """
+        return json.encode_request(self.id, self.method, self.params)
+
     class Config:
         allow_population_by_field_name = True
         arbitrary_types_allowed = True
@@ -106,6 +115,8 @@ class GethErrorDetail(BaseModel):
 class GethError(Exception):
     """An exception representing an error response from the Geth client."""
     def __init__(self, error: GethErrorDetail | list[GethErrorDetail]) -> None:
+        self.error = error
+        """The error detail, or the list of error details of a batch."""
         if isinstance(error, list):
             super().__init__([f"{err.code}: {err.message}" for err in error])
         else:
@@ -193,6 +204,50 @@ class GethWSResponse(BaseModel):
         json_dumps = json.orjson_dumps
 
 
+def decode_response(
+    data: Any
+) -> GethSuccessResponse | GethErrorResponse | GethWSResponse:
+    """Build the response model of a json decoded JSON-RPC message.
+
+    The message is routed by its keys: ``error`` to ``GethErrorResponse``,
+    ``params`` to ``GethWSResponse`` and ``result`` to
+    ``GethSuccessResponse``. The ``result`` is taken as it is without
+    validation, so a large result is never copied or walked through.
+
+    Args:
+        data: The json decoded message.
+
+    Returns:
+        The response model of the message.
+
+    Raises:
+        ValueError: Raised when the message is not a JSON-RPC response.
+    """
+    if not isinstance(data, dict):
+        raise ValueError(f"Not a JSON-RPC response: {data!r:.200}")
+    if "error" in data:
+        return GethErrorResponse.parse_obj(data)
+    if "params" in data:
+        params = data["params"]
+        if not isinstance(params, dict) or "subscription" not in params:
+            raise ValueError(f"Not a JSON-RPC notification: {data!r:.200}")
+        return GethWSResponse.construct(
+            jsonrpc=data.get("jsonrpc", "2.0"),
+            method=data.get("method", "eth_subscription"),
+            params=GethWSItem.construct(
+                subscription=params["subscription"],
+                result=params.get("result"),
+            ),
+        )
+    if "result" in data:
+        return GethSuccessResponse.construct(
+            jsonrpc=data.get("jsonrpc", "2.0"),
+            id=data.get("id"),
+            result=data["result"],
+        )
+    raise ValueError(f"Not a JSON-RPC response: {data!r:.200}")
+
+
 class CallOverrideParams(BaseModel):
     """A class representing override parameters for a contract function call.
     """
@@ -222,6 +277,22 @@ class CallOverrideParams(BaseModel):
             td["code"] = typing.cast(HexBytes, td["code"]).value
         return typing.cast(Web3CallOverrideParams, td)
 
+    def to_geth(self) -> dict[str, Any]:
+        """Converts the ``CallOverrideParams`` instance to the json form of the
+        state override of Geth JSON-RPC API.
+
+        Returns:
+            A dictionary which can be json encoded and sent to Geth.
+        """
+        td = self.dict(by_alias=True, exclude_none=True)
+        if "balance" in td:
+            td["balance"] = hex(typing.cast(Wei, td["balance"]).value)
+        if "nonce" in td:
+            td["nonce"] = hex(td["nonce"])
+        if "code" in td:
+            td["code"] = str(td["code"])
+        return td
+
     class Config:
         allow_population_by_field_name = True
         arbitrary_types_allowed = True
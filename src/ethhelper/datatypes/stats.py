@@ -0,0 +1,193 @@
+import orjson
+from pydantic import (
+    BaseModel,
+)
+
+from ethhelper.utils import (
+    json,
+)
+
+
+class BatchStats(BaseModel):
+    """A class that represents the state of an adaptive batch size."""
+    size: int
+    """The batch size chosen for the next batch."""
+    minimum: int
+    """The lower bound of the batch size."""
+    maximum: int
+    """The upper bound of the batch size, lowered when the Geth node rejects
+    a batch as too large.
+    """
+    batches: int
+    """The number of batches observed."""
+    items: int
+    """The number of items in all observed batches."""
+    splits: int
+    """The number of times a batch was rejected as too large and split."""
+    latency: float
+    """The moving average of the latency of a batch in seconds."""
+    item_bytes: float
+    """The moving average of the response size of one item in bytes."""
+
+    class Config:
+        allow_population_by_field_name = True
+        arbitrary_types_allowed = True
+        frozen = True
+        json_loads = orjson.loads
+        json_dumps = json.orjson_dumps
+
+
+class NodeStats(BaseModel):
+    """A class that represents the state of a Geth node of a pool."""
+    url: str
+    """The JSON-RPC endpoint of the node."""
+    healthy: bool
+    """Whether the last health check or request of the node succeeded and the
+    node is not syncing.
+    """
+    syncing: bool
+    """Whether the node was syncing at the last health check."""
+    head: int
+    """The latest block number of the node at the last health check."""
+    lag: int
+    """The number of blocks the node is behind the highest head of the pool.
+    """
+    latency: float
+    """The moving average of the latency of the node in seconds."""
+    inflight: int
+    """The number of requests in flight to the node."""
+    requests: int
+    """The number of requests sent to the node."""
+    failures: int
+    """The number of failed requests and health checks of the node."""
+    last_error: str | None
+    """The last error of the node, if any."""
+
+    class Config:
+        allow_population_by_field_name = True
+        arbitrary_types_allowed = True
+        frozen = True
+        json_loads = orjson.loads
+        json_dumps = json.orjson_dumps
+
+
+class LatencyStats(BaseModel):
+    """A class that represents the recent latencies of one method."""
+    requests: int
+    """The number of requests of the method."""
+    samples: int
+    """The number of recent latencies the percentiles are computed from."""
+    p50: float
+    """The median of the recent latencies in seconds."""
+    p95: float
+    """The 95th percentile of the recent latencies in seconds."""
+    p99: float
+    """The 99th percentile of the recent latencies in seconds."""
+    hedges: int
+    """The number of requests for which a duplicate was sent."""
+    hedge_wins: int
+    """The number of hedged requests answered first by the duplicate."""
+
+    class Config:
+        allow_population_by_field_name = True
+        arbitrary_types_allowed = True
+        frozen = True
+        json_loads = orjson.loads
+        json_dumps = json.orjson_dumps
+
+
+class LimiterStats(BaseModel):
+    """A class that represents the state of a ``GethHttpLimiter``."""
+    limit: int
+    """The current number of requests allowed in flight."""
+    inflight: int
+    """The number of requests in flight."""
+    waiting: int
+    """The number of requests waiting for a token or a slot, in all lanes.
+    """
+    rate: float | None
+    """The limit of requests per second, if any."""
+    requests: int
+    """The number of finished requests."""
+    errors: int
+    """The number of requests failed with an HTTP error."""
+    decreases: int
+    """The number of times the concurrency limit was decreased."""
+
+    class Config:
+        allow_population_by_field_name = True
+        arbitrary_types_allowed = True
+        frozen = True
+        json_loads = orjson.loads
+        json_dumps = json.orjson_dumps
+
+
+class CacheStats(BaseModel):
+    """A class that represents the state of a response cache."""
+    hits: int
+    """The number of lookups answered by the cache."""
+    misses: int
+    """The number of lookups not answered by the cache."""
+    entries: int
+    """The number of cached results."""
+    size: int
+    """The total size in bytes of the cached keys and results."""
+    max_size: int
+    """The size in bytes above which entries are evicted, or ``0`` if the
+    cache is unbounded.
+    """
+    evictions: int
+    """The number of entries evicted to stay within ``max_size``."""
+
+    class Config:
+        allow_population_by_field_name = True
+        arbitrary_types_allowed = True
+        frozen = True
+        json_loads = orjson.loads
+        json_dumps = json.orjson_dumps
+
+
+class FlightStats(BaseModel):
+    """A class that represents the requests shared by concurrent callers."""
+    started: int
+    """The number of requests sent."""
+    shared: int
+    """The number of callers answered by a request already in flight instead
+    of their own.
+    """
+    inflight: int
+    """The number of requests in flight."""
+
+    class Config:
+        allow_population_by_field_name = True
+        arbitrary_types_allowed = True
+        frozen = True
+        json_loads = orjson.loads
+        json_dumps = json.orjson_dumps
+
+
+class PlanStats(BaseModel):
+    """A class that represents the choices of a ``QueryPlanner`` for one
+    operation.
+    """
+    choice: str | None
+    """The backend chosen last, or ``None`` if none was chosen yet."""
+    reason: str
+    """Why the last backend was chosen."""
+    choices: int
+    """The number of times a backend was chosen."""
+    samples: dict[str, int]
+    """The number of calls observed by backend."""
+    throughput: dict[str, float]
+    """The moving average of the items per second by backend."""
+    item_bytes: dict[str, float]
+    """The moving average of the response bytes per item by backend."""
+    failures: dict[str, int]
+    """The number of failed calls by backend."""
+
+    class Config:
+        allow_population_by_field_name = True
+        arbitrary_types_allowed = True
+        frozen = True
+        json_loads = orjson.loads
+        json_dumps = json.orjson_dumps
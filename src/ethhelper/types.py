@@ -10,7 +10,9 @@ from .datatypes.base import (
 from .datatypes.eth import (
     AccessEntry,
     AccessList,
+    AccountState,
     Block,
+    BlockHeader,
     FeeHistory,
     FilterParams,
     Log,
@@ -35,6 +37,15 @@ from .datatypes.geth import (
     IdNotMatch,
     NoSubscribeToken,
 )
+from .datatypes.stats import (
+    BatchStats,
+    CacheStats,
+    FlightStats,
+    LatencyStats,
+    LimiterStats,
+    NodeStats,
+    PlanStats,
+)
 from .datatypes.txpool import (
     TxpoolContent,
     TxpoolContentFrom,
@@ -58,8 +69,10 @@ __all__ = [
     "TxParams",
     "Transaction",
     "Block",
+    "BlockHeader",
     "Log",
     "Receipt",
+    "AccountState",
     "FilterParams",
     "CallOverride",
     "CallOverrideParams",
@@ -75,6 +88,13 @@ __all__ = [
     "GethWSResponse",
     "IdNotMatch",
     "NoSubscribeToken",
+    "BatchStats",
+    "CacheStats",
+    "FlightStats",
+    "LatencyStats",
+    "LimiterStats",
+    "NodeStats",
+    "PlanStats",
     "TxpoolContent",
     "TxpoolContentFrom",
     "TxpoolInspect",
@@ -0,0 +1,98 @@
+from ethhelper.datatypes.stats import (
+    BatchStats,
+)
+
+
+class AdaptiveBatchSize:
+    """A batch size tuned from the observed latency and response size.
+
+    After each batch, the size moves towards the number of items that would
+    take ``target_latency`` seconds or ``target_bytes`` bytes of response,
+    whichever is smaller, growing at most twice per batch. When the Geth node
+    rejects a batch as too large, ``shrink`` halves the size and lowers the
+    upper bound, which then recovers slowly while batches succeed.
+
+    The ``initial`` is the size of the first batch, bounded by ``minimum`` and
+    ``maximum``. The ``alpha`` is the smoothing factor of the moving averages.
+    """
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: int = 1000,
+        target_latency: float = 2,
+        target_bytes: int = 8 * 1024 * 1024,
+        alpha: float = 0.3,
+    ) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+        self.ceiling = maximum
+        self.size = max(minimum, min(initial, maximum))
+        self.target_latency = target_latency
+        self.target_bytes = target_bytes
+        self.alpha = alpha
+        self.batches = 0
+        self.items = 0
+        self.splits = 0
+        self.latency = 0.0
+        self.item_latency = 0.0
+        self.item_bytes = 0.0
+
+    def _average(self, old: float, new: float) -> float:
+        if self.batches == 0:
+            return new
+        return old + self.alpha * (new - old)
+
+    def observe(self, items: int, latency: float, size: int) -> None:
+        """Record a successful batch and tune the next batch size.
+
+        Args:
+            items: The number of items in the batch.
+            latency: The time taken by the batch in seconds.
+            size: The size of the response in bytes.
+        """
+        if items <= 0:
+            return
+        self.latency = self._average(self.latency, latency)
+        self.item_latency = self._average(self.item_latency, latency / items)
+        self.item_bytes = self._average(self.item_bytes, size / items)
+        self.batches += 1
+        self.items += items
+        if items >= self.ceiling and self.ceiling < self.maximum:
+            self.ceiling = min(
+                self.maximum, self.ceiling + max(1, self.ceiling // 8)
+            )
+        ideal = float(self.ceiling)
+        if self.item_latency > 0:
+            ideal = min(ideal, self.target_latency / self.item_latency)
+        if self.item_bytes > 0:
+            ideal = min(ideal, self.target_bytes / self.item_bytes)
+        self.size = max(self.minimum, min(int(ideal), self.size * 2))
+
+    def shrink(self, items: int) -> None:
+        """Halve the batch size after a batch of ``items`` was rejected as too
+        large.
+
+        Args:
+            items: The number of items in the rejected batch.
+        """
+        self.splits += 1
+        self.ceiling = max(self.minimum, items // 2)
+        self.size = min(self.size, self.ceiling)
+
+    def stats(self) -> BatchStats:
+        """Get the current state of this batch size.
+
+        Returns:
+            A ``BatchStats`` object with the chosen size and the observations.
+        """
+        return BatchStats(
+            size=self.size,
+            minimum=self.minimum,
+            maximum=self.ceiling,
+            batches=self.batches,
+            items=self.items,
+            splits=self.splits,
+            latency=self.latency,
+            item_bytes=self.item_bytes,
+        )
@@ -0,0 +1,210 @@
+import abc
+from abc import (
+    ABCMeta,
+)
+from collections import (
+    OrderedDict,
+)
+
+from ethhelper.datatypes.stats import (
+    CacheStats,
+)
+
+
+class CacheStore(metaclass=ABCMeta):
+    """A store of the json encoded results of immutable requests.
+
+    The keys are the method and the canonical json params of a request, and
+    the values the json encoded results. Only results that can never change
+    are put into a store, so a store never needs to invalidate them, but it
+    may evict them at any time.
+
+    A store may also keep the logs of ranges of blocks by filter, in which
+    case ``supports_logs`` is ``True`` and it implements ``log_gaps``,
+    ``get_logs`` and ``put_logs``.
+
+    Subclasses must implement ``get``, ``put`` and ``stats``.
+    """
+    supports_logs: bool = False
+    """Whether this store keeps logs."""
+
+    @abc.abstractmethod
+    def get(self, key: bytes) -> bytes | None:
+        """Get a cached result.
+
+        Args:
+            key: The key of the request.
+
+        Returns:
+            The json encoded result, or ``None`` if it is not cached.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def put(self, key: bytes, value: bytes) -> None:
+        """Cache a result.
+
+        Args:
+            key: The key of the request.
+            value: The json encoded result.
+        """
+        raise NotImplementedError()
+
+    def get_many(self, keys: list[bytes]) -> dict[bytes, bytes]:
+        """Get many cached results.
+
+        Args:
+            keys: The keys of the requests.
+
+        Returns:
+            A dictionary mapping the keys found to their json encoded results.
+        """
+        results: dict[bytes, bytes] = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                results[key] = value
+        return results
+
+    def put_many(self, items: list[tuple[bytes, bytes]]) -> None:
+        """Cache many results.
+
+        Args:
+            items: The tuples of the key and the json encoded result.
+        """
+        for key, value in items:
+            self.put(key, value)
+
+    def log_gaps(
+        self, filter: bytes, start: int, end: int
+    ) -> list[tuple[int, int]]:
+        """Get the ranges of blocks whose logs are not cached.
+
+        Args:
+            filter: The key of the log filter, see ``log_filter_key``.
+            start: The first block of the range.
+            end: The last block of the range.
+
+        Returns:
+            The uncached ranges within ``[start, end]`` as tuples of the first
+            and the last block, in block order.
+        """
+        return [(start, end)]
+
+    def get_logs(self, filter: bytes, start: int, end: int) -> list[bytes]:
+        """Get the cached logs of a range of blocks.
+
+        Args:
+            filter: The key of the log filter.
+            start: The first block of the range.
+            end: The last block of the range.
+
+        Returns:
+            The json encoded logs in ``(block_number, log_index)`` order.
+        """
+        raise NotImplementedError()
+
+    def put_logs(
+        self,
+        filter: bytes,
+        start: int,
+        end: int,
+        logs: list[tuple[int, int, bytes]]
+    ) -> None:
+        """Cache all logs of a range of blocks and mark the range as covered.
+
+        Args:
+            filter: The key of the log filter.
+            start: The first block of the range.
+            end: The last block of the range.
+            logs: All logs of the range, as tuples of the block number, the
+                log index and the json encoded log.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def stats(self) -> CacheStats:
+        """Get the size and the hit and miss counters of this store.
+
+        Returns:
+            A ``CacheStats`` object of this store.
+        """
+        raise NotImplementedError()
+
+
+class MemoryCache(CacheStore):
+    """An in-memory ``CacheStore`` bounded by the size of its entries.
+
+    The entries are evicted in least recently used order once the total size
+    of their keys and values exceeds ``max_bytes``. A value larger than
+    ``max_item_bytes``, by default a quarter of ``max_bytes``, is not cached,
+    so that a few huge blocks cannot flush the whole cache.
+
+    One ``MemoryCache`` can be shared by several connectors of the same chain.
+    """
+    def __init__(
+        self, max_bytes: int = 64 * 1024 * 1024,
+        max_item_bytes: int | None = None
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.max_item_bytes = (
+            max_bytes // 4 if max_item_bytes is None else max_item_bytes
+        )
+        self.entries: OrderedDict[bytes, bytes] = OrderedDict()
+        """The cached entries, from the least to the most recently used."""
+        self.size = 0
+        """The total size in bytes of the keys and values of all entries."""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: bytes) -> bytes | None:
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key: bytes, value: bytes) -> None:
+        size = len(key) + len(value)
+        if size > self.max_item_bytes:
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.size -= len(key) + len(old)
+        self.entries[key] = value
+        self.size += size
+        while self.size > self.max_bytes:
+            evicted_key, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted_key) + len(evicted)
+            self.evictions += 1
+
+    def delete(self, key: bytes) -> None:
+        """Drop an entry, if any.
+
+        Args:
+            key: The key of the request.
+        """
+        value = self.entries.pop(key, None)
+        if value is not None:
+            self.size -= len(key) + len(value)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self.entries.clear()
+        self.size = 0
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            entries=len(self.entries),
+            size=self.size,
+            max_size=self.max_bytes,
+            evictions=self.evictions,
+        )
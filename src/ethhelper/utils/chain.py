@@ -0,0 +1,162 @@
+from collections.abc import (
+    Awaitable,
+    Callable,
+)
+import logging
+from logging import (
+    Logger,
+)
+import time
+from typing import (
+    Any,
+)
+
+from ethhelper.datatypes.eth import (
+    Block,
+)
+
+
+class ChainTracker:
+    """A tracker of the canonical chain near the head.
+
+    The hashes of the last ``depth`` blocks are kept by height, fed by
+    ``add_block`` with each new head, usually by a ``GethNewBlockSubscriber``
+    given this tracker. When the parent hash of a new head does not match the
+    tracked block below it, or a new head replaces tracked blocks, the
+    replaced blocks are orphaned: ``reorgs`` is incremented and every
+    listener is called with the orphaned heights and hashes, so that the
+    caches can evict the results of these blocks.
+
+    To find how deep a reorg goes, the headers below the new head are
+    requested by ``fetch_header`` until one matches the tracked chain. If it
+    is ``None``, every tracked block below the mismatch is assumed orphaned.
+    A connector given this tracker sets it to its own request, unless already
+    set.
+
+    The tracker is live while it received a head in the last ``max_age``
+    seconds. A tracker which is not live is not used to pin ``latest``
+    requests, since its head may be far behind the chain.
+    """
+    def __init__(
+        self,
+        depth: int = 128,
+        max_age: float = 30,
+        logger: Logger | None = None
+    ) -> None:
+        self.depth = depth
+        self.max_age = max_age
+        if logger is None:
+            logger = logging.getLogger("ChainTracker")
+        self.logger = logger
+        self.hashes: dict[int, str] = {}
+        """The hashes of the tracked canonical blocks, by height."""
+        self.head = -1
+        """The height of the current head, or ``-1`` if none was added."""
+        self.updated_at = 0.0
+        self.reorgs = 0
+        """The number of reorgs seen, which changes whenever blocks are
+        orphaned.
+        """
+        self.listeners: list[Callable[[dict[int, str]], None]] = []
+        """The functions called with the orphaned heights and hashes of each
+        reorg.
+        """
+        self.fetch_header: Callable[
+            [int], Awaitable[dict[str, Any]]
+        ] | None = None
+        """The coroutine function getting the json header of a canonical
+        block by height, used to find the fork point of a reorg.
+        """
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    @property
+    def tail(self) -> int:
+        """The height of the lowest tracked block, or ``-1`` if none."""
+        return min(self.hashes, default=-1)
+
+    def is_live(self) -> bool:
+        """Check whether a head was added in the last ``max_age`` seconds.
+
+        Returns:
+            ``True`` if the tracker follows the chain.
+        """
+        return (
+            self.head >= 0
+            and time.monotonic() - self.updated_at < self.max_age
+        )
+
+    def hash_at(self, height: int) -> str | None:
+        """Get the hash of a canonical block.
+
+        Args:
+            height: The block height.
+
+        Returns:
+            The hash of the block, or ``None`` if the height is not tracked.
+        """
+        return self.hashes.get(height)
+
+    def add_listener(self, listener: Callable[[dict[int, str]], None]) -> None:
+        """Call ``listener`` with the orphaned blocks of each reorg.
+
+        Args:
+            listener: A function taking a dictionary mapping the height to
+                the hash of each orphaned block.
+        """
+        self.listeners.append(listener)
+
+    async def add_block(self, block: Block) -> None:
+        """Add a new head.
+
+        This method is called by ``GethNewBlockSubscriber`` before its
+        ``on_block`` if the subscriber is given this tracker.
+
+        Args:
+            block: The new head.
+        """
+        number = block.number
+        block_hash = str(block.hash)
+        self.updated_at = time.monotonic()
+        if self.hashes.get(number) == block_hash:
+            return
+        orphaned = {
+            height: tracked for height, tracked in self.hashes.items()
+            if height >= number
+        }
+        height = number - 1
+        expected = str(block.parent_hash)
+        while height in self.hashes and self.hashes[height] != expected:
+            orphaned[height] = self.hashes[height]
+            self.hashes[height] = expected
+            if self.fetch_header is None:
+                for lower in [h for h in self.hashes if h < height]:
+                    orphaned[lower] = self.hashes.pop(lower)
+                break
+            try:
+                header = await self.fetch_header(height)
+            except Exception as e:
+                self.logger.warning(
+                    f"Failed to get the header {height} of a reorg: {e!r}"
+                )
+                for lower in [h for h in self.hashes if h < height]:
+                    orphaned[lower] = self.hashes.pop(lower)
+                break
+            expected = header["parentHash"]
+            height -= 1
+        for height in orphaned:
+            if height >= number:
+                del self.hashes[height]
+        self.hashes[number] = block_hash
+        self.head = number
+        for height in [h for h in self.hashes if h <= number - self.depth]:
+            del self.hashes[height]
+        if len(orphaned) == 0:
+            return
+        self.reorgs += 1
+        self.logger.warning(
+            f"Reorg at {min(orphaned)}, {len(orphaned)} blocks orphaned"
+        )
+        for listener in self.listeners:
+            listener(orphaned)
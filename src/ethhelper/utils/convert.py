@@ -36,6 +36,14 @@ def block_id_transfer(
     return block_identifier
 
 
+def block_id_to_geth(block_identifier: BlockIdentifier) -> str:
+    if isinstance(block_identifier, Hash32):
+        return str(block_identifier)
+    if isinstance(block_identifier, int):
+        return hex(block_identifier)
+    return block_identifier
+
+
 def address_transfer(address: Address | ENS) -> Web3Address | ENS:
     if isinstance(address, Address):
         return address.to_web3()
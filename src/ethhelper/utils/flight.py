@@ -0,0 +1,95 @@
+import asyncio
+from asyncio import (
+    Task,
+)
+from collections.abc import (
+    Awaitable,
+    Callable,
+    Hashable,
+)
+from typing import (
+    Any,
+)
+
+from ethhelper.datatypes.stats import (
+    FlightStats,
+)
+
+
+class SingleFlight:
+    """Shares the calls in flight among the concurrent callers with the same
+    key.
+
+    The first caller of a key starts the call as a task, and the callers of
+    the same key arriving while it is in flight wait for that task instead of
+    starting their own, so they all receive the same result or exception. The
+    key is forgotten as soon as the call finishes, so a later caller starts a
+    new call. Nothing is cached.
+
+    A caller being cancelled does not cancel the call as long as other
+    callers still wait for it. The call is cancelled when all its callers are.
+    """
+    def __init__(self) -> None:
+        self.calls: dict[Hashable, tuple[Task[Any], list[int]]] = {}
+        """The calls in flight by key, with their numbers of waiting callers.
+        """
+        self.started = 0
+        """The number of calls started."""
+        self.shared = 0
+        """The number of callers which joined a call in flight."""
+
+    def __len__(self) -> int:
+        return len(self.calls)
+
+    async def do(
+        self, key: Hashable, call: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Run ``call``, or join the call of ``key`` already in flight.
+
+        Args:
+            key: The key of the call, equal for calls with the same result.
+            call: The coroutine function making the call, only called if no
+                call of ``key`` is in flight.
+
+        Returns:
+            The result of the call, shared by all its callers, which must
+            therefore not modify it.
+        """
+        entry = self.calls.get(key)
+        if entry is None:
+            task: Task[Any] = asyncio.ensure_future(call())
+            entry = self.calls[key] = (task, [0])
+            task.add_done_callback(lambda _: self._finish(key, task))
+            self.started += 1
+        else:
+            task = entry[0]
+            self.shared += 1
+        waiters = entry[1]
+        waiters[0] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            waiters[0] -= 1
+            if waiters[0] == 0 and not task.done():
+                task.cancel()
+                if self.calls.get(key) is entry:
+                    del self.calls[key]
+
+    def _finish(self, key: Hashable, task: Task[Any]) -> None:
+        entry = self.calls.get(key)
+        if entry is not None and entry[0] is task:
+            del self.calls[key]
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> FlightStats:
+        """Get the counters of this object.
+
+        Returns:
+            A ``FlightStats`` object with the calls started and shared.
+        """
+        return FlightStats(
+            started=self.started,
+            shared=self.shared,
+            inflight=len(self.calls),
+        )
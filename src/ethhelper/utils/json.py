@@ -25,3 +25,60 @@ def orjson_dumps(v: Any, **kwargs: Any) -> str:
     return orjson.dumps(
         v, default=encode_my_class, option=orjson.OPT_NON_STR_KEYS
     ).decode()
+
+
+def orjson_dumps_bytes(v: Any) -> bytes:
+    """Encode a value into json bytes, with ``IntStr`` and ``HexBytes``
+    supported.
+
+    Args:
+        v: The value to be encoded.
+
+    Returns:
+        The json encoded bytes.
+    """
+    return orjson.dumps(
+        v, default=encode_my_class, option=orjson.OPT_NON_STR_KEYS
+    )
+
+
+_METHODS: dict[str, bytes] = {}
+_NO_PARAMS = b',"params":[]}'
+
+
+def encode_request(id: int | None, method: str, params: list[Any]) -> bytes:
+    """Encode a JSON-RPC request into json bytes.
+
+    The request is spliced from pre-encoded fragments: the encoded prefix of
+    each method is cached, so only the id and the parameters are encoded for
+    each request, and requests without parameters encode nothing but the id.
+
+    Args:
+        id: The id of the request.
+        method: The method name of the request.
+        params: The parameters of the request.
+
+    Returns:
+        The json encoded request.
+    """
+    prefix = _METHODS.get(method)
+    if prefix is None:
+        prefix = b',"method":' + orjson.dumps(method)
+        _METHODS[method] = prefix
+    if len(params) == 0:
+        suffix = _NO_PARAMS
+    else:
+        suffix = b',"params":' + orjson_dumps_bytes(params) + b"}"
+    return b'{"jsonrpc":"2.0","id":' + orjson.dumps(id) + prefix + suffix
+
+
+def encode_batch(requests: list[bytes]) -> bytes:
+    """Join encoded JSON-RPC requests into one encoded batch.
+
+    Args:
+        requests: The json encoded requests, see ``encode_request``.
+
+    Returns:
+        The json encoded batch.
+    """
+    return b"[" + b",".join(requests) + b"]"
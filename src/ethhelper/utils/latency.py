@@ -0,0 +1,82 @@
+from collections import (
+    deque,
+)
+
+from ethhelper.datatypes.stats import (
+    LatencyStats,
+)
+
+
+class LatencyWindow:
+    """The latencies of the recent requests of one method.
+
+    The last ``size`` latencies are kept, so the percentiles follow the
+    current load of the Geth node instead of its whole history. The
+    ``min_samples`` is the number of latencies needed before ``hedge_delay``
+    trusts the percentiles.
+    """
+    def __init__(self, size: int = 256, min_samples: int = 20) -> None:
+        self.samples: deque[float] = deque(maxlen=size)
+        self.min_samples = min_samples
+        self.requests = 0
+        self.hedges = 0
+        """The number of requests for which a duplicate was sent."""
+        self.hedge_wins = 0
+        """The number of hedged requests answered first by the duplicate."""
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def observe(self, latency: float) -> None:
+        """Record the latency of a request.
+
+        Args:
+            latency: The latency of the request in seconds.
+        """
+        self.requests += 1
+        self.samples.append(latency)
+
+    def percentile(self, p: float) -> float:
+        """Get a percentile of the recent latencies.
+
+        Args:
+            p: The percentile between ``0`` and ``1``, such as ``0.95``.
+
+        Returns:
+            The latency in seconds, or ``0`` if nothing was observed yet.
+        """
+        if len(self.samples) == 0:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    def hedge_delay(self, p: float, minimum: float = 0) -> float | None:
+        """Get the time to wait for a request before sending a duplicate.
+
+        Args:
+            p: The percentile of the recent latencies to wait for.
+            minimum: The lower bound of the delay in seconds.
+
+        Returns:
+            The delay in seconds, or ``None`` if fewer than ``min_samples``
+            latencies were observed, in which case no duplicate is sent.
+        """
+        if len(self.samples) < self.min_samples:
+            return None
+        return max(minimum, self.percentile(p))
+
+    def stats(self) -> LatencyStats:
+        """Get the current state of this window.
+
+        Returns:
+            A ``LatencyStats`` object with the percentiles and hedge counters.
+        """
+        return LatencyStats(
+            requests=self.requests,
+            samples=len(self.samples),
+            p50=self.percentile(0.5),
+            p95=self.percentile(0.95),
+            p99=self.percentile(0.99),
+            hedges=self.hedges,
+            hedge_wins=self.hedge_wins,
+        )
@@ -0,0 +1,171 @@
+from collections.abc import (
+    Sequence,
+)
+
+from ethhelper.datatypes.stats import (
+    PlanStats,
+)
+
+
+class BackendCost:
+    """The observed cost of one backend for one operation."""
+    def __init__(self) -> None:
+        self.samples = 0
+        self.throughput = 0.0
+        """The moving average of the items per second."""
+        self.item_bytes = 0.0
+        """The moving average of the response bytes per item."""
+        self.failures = 0
+
+
+class QueryPlanner:
+    """A chooser of the cheaper backend for equivalent operations, such as
+    GraphQL or JSON-RPC for a range of block headers.
+
+    Each operation is measured on every backend first: while a backend has
+    fewer than ``min_samples`` observed calls, it is chosen. Then the backend
+    with the highest moving average of items per second is chosen, and every
+    ``explore_interval`` choices the others are measured again, so that the
+    choice follows changes of the load of the node. A backend whose call
+    failed, for example because the node has no GraphQL service, is not
+    chosen again until it is measured again.
+
+    The ``alpha`` is the smoothing factor of the moving averages.
+    """
+    def __init__(
+        self,
+        backends: Sequence[str] = ("graphql", "jsonrpc"),
+        min_samples: int = 2,
+        explore_interval: int = 16,
+        alpha: float = 0.3
+    ) -> None:
+        self.backends = tuple(backends)
+        self.min_samples = min_samples
+        self.explore_interval = explore_interval
+        self.alpha = alpha
+        self.costs: dict[str, dict[str, BackendCost]] = {}
+        """The observed costs by operation and backend."""
+        self.choices: dict[str, int] = {}
+        self.choice: dict[str, str] = {}
+        self.reasons: dict[str, str] = {}
+
+    def _costs(self, operation: str) -> dict[str, BackendCost]:
+        if operation not in self.costs:
+            self.costs[operation] = {
+                backend: BackendCost() for backend in self.backends
+            }
+        return self.costs[operation]
+
+    def choose(
+        self, operation: str, backends: Sequence[str] | None = None
+    ) -> str:
+        """Choose the backend of the next call of an operation.
+
+        Args:
+            operation: The operation, usually its kind and parameters
+                which change its cost, such as the fields fetched.
+            backends: The backends able to run this call, or ``None`` for
+                all ``backends``.
+
+        Returns:
+            The chosen backend.
+        """
+        candidates = self.backends if backends is None else tuple(backends)
+        costs = self._costs(operation)
+        choices = self.choices.get(operation, 0) + 1
+        self.choices[operation] = choices
+        ranked = sorted(
+            candidates, key=lambda backend: -costs[backend].throughput
+        )
+        best = ranked[0]
+        unmeasured = [
+            backend for backend in candidates
+            if costs[backend].samples < self.min_samples
+        ]
+        if len(unmeasured) != 0:
+            choice = min(
+                unmeasured, key=lambda backend: costs[backend].samples
+            )
+            reason = (
+                f"measuring {choice}, {costs[choice].samples} of "
+                f"{self.min_samples} samples"
+            )
+        elif len(ranked) > 1 and choices % self.explore_interval == 0:
+            choice = min(
+                ranked[1:], key=lambda backend: costs[backend].samples
+            )
+            reason = (
+                f"measuring {choice} again, {best} is faster at "
+                f"{costs[best].throughput:.1f} items/s"
+            )
+        else:
+            choice = best
+            reason = ", ".join(
+                f"{backend} {costs[backend].throughput:.1f} items/s "
+                f"{costs[backend].item_bytes:.0f} bytes/item"
+                for backend in ranked
+            )
+        self.choice[operation] = choice
+        self.reasons[operation] = reason
+        return choice
+
+    def observe(
+        self,
+        operation: str,
+        backend: str,
+        items: int,
+        latency: float,
+        size: int
+    ) -> None:
+        """Record a successful call of an operation.
+
+        Args:
+            operation: The operation.
+            backend: The backend which ran the call.
+            items: The number of items of the call, such as blocks.
+            latency: The time taken by the call in seconds.
+            size: The size of the responses of the call in bytes.
+        """
+        if items <= 0:
+            return
+        cost = self._costs(operation)[backend]
+        throughput = items / max(latency, 1e-6)
+        item_bytes = size / items
+        if cost.samples == 0 or cost.throughput == 0:
+            cost.throughput = throughput
+            cost.item_bytes = item_bytes
+        else:
+            cost.throughput += self.alpha * (throughput - cost.throughput)
+            cost.item_bytes += self.alpha * (item_bytes - cost.item_bytes)
+        cost.samples += 1
+
+    def fail(self, operation: str, backend: str) -> None:
+        """Record a failed call of an operation.
+
+        Args:
+            operation: The operation.
+            backend: The backend whose call failed.
+        """
+        cost = self._costs(operation)[backend]
+        cost.failures += 1
+        cost.throughput = 0
+        cost.samples = max(cost.samples, self.min_samples)
+
+    def stats(self) -> dict[str, PlanStats]:
+        """Get the costs and the last choice of every operation.
+
+        Returns:
+            A dictionary mapping the operation to its ``PlanStats``.
+        """
+        return {
+            operation: PlanStats(
+                choice=self.choice.get(operation),
+                reason=self.reasons.get(operation, ""),
+                choices=self.choices.get(operation, 0),
+                samples={b: c.samples for b, c in costs.items()},
+                throughput={b: c.throughput for b, c in costs.items()},
+                item_bytes={b: c.item_bytes for b, c in costs.items()},
+                failures={b: c.failures for b, c in costs.items()},
+            )
+            for operation, costs in self.costs.items()
+        }
@@ -0,0 +1,143 @@
+import asyncio
+from asyncio import (
+    Task,
+)
+from collections import (
+    deque,
+)
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Iterable,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+
+async def prefetch(
+    factories: Iterable[Callable[[], Awaitable[T]]], depth: int
+) -> AsyncIterator[T]:
+    """Run awaitables ahead of the consumer and yield their results in order.
+
+    At most ``depth`` awaitables are in flight ahead of the result being
+    consumed, so memory stays bounded however many factories there are.
+    The factories are pulled lazily from ``factories``, one each time a result
+    is yielded. Pending awaitables are cancelled when the generator is closed.
+
+    Args:
+        factories: The functions creating the awaitables, in yield order.
+        depth: The maximum number of awaitables in flight.
+
+    Yields:
+        The results of the awaitables in the order of ``factories``.
+    """
+    iterator = iter(factories)
+    pending: deque[Task[T]] = deque()
+
+    async def run(factory: Callable[[], Awaitable[T]]) -> T:
+        return await factory()
+
+    try:
+        for factory in iterator:
+            pending.append(asyncio.create_task(run(factory)))
+            if len(pending) >= max(1, depth):
+                break
+        while len(pending) != 0:
+            result = await pending.popleft()
+            for factory in iterator:
+                pending.append(asyncio.create_task(run(factory)))
+                break
+            yield result
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def fetch_ranges(
+    start: int,
+    end: int,
+    fetch: Callable[[int, int], Coroutine[Any, Any, list[T]]],
+    size: Callable[[], int],
+    should_bisect: Callable[[BaseException], bool],
+    concurrency: int,
+    on_bisect: Callable[[int, int], None],
+    on_fetched: Callable[[int, int, list[T]], None],
+) -> list[T]:
+    """Fetch the items of a range of heights in concurrent chunks, bisecting
+    the chunks that fail.
+
+    The chunks are cut from ``start`` upwards, each one ``size()`` heights
+    long at the time it is cut, so ``size`` may follow what was learned from
+    the previous chunks. A chunk of more than one height whose ``fetch``
+    fails with an exception accepted by ``should_bisect`` is split in half,
+    and both halves are fetched again before any new chunk. Any other
+    failure cancels the chunks in flight and is raised, after the exceptions
+    of the other finished chunks are retrieved.
+
+    Args:
+        start: The first height of the range.
+        end: The last height of the range.
+        fetch: The coroutine function fetching the items of the chunk from
+            its first to its last height.
+        size: The function giving the number of heights of the next chunk.
+        should_bisect: The function telling whether a chunk failing with an
+            exception should be bisected.
+        concurrency: The maximum number of chunks in flight.
+        on_bisect: The function called with the first and last height of a
+            chunk before it is bisected.
+        on_fetched: The function called with the first and last height and
+            the items of each fetched chunk, in completion order.
+
+    Returns:
+        The items of all chunks, in height order.
+
+    Raises:
+        BaseException: The exception of a chunk which is not bisected.
+    """
+    chunks: dict[int, list[T]] = {}
+    retry: deque[tuple[int, int]] = deque()
+    running: dict[Task[list[T]], tuple[int, int]] = {}
+    next_start = start
+    try:
+        while next_start <= end or retry or running:
+            while len(running) < max(1, concurrency) and (
+                retry or next_start <= end
+            ):
+                if retry:
+                    first, last = retry.popleft()
+                else:
+                    first = next_start
+                    last = min(end, first + max(1, size()) - 1)
+                    next_start = last + 1
+                task: Task[list[T]] = asyncio.create_task(fetch(first, last))
+                running[task] = (first, last)
+            finished, _ = await asyncio.wait(
+                running, return_when=asyncio.FIRST_COMPLETED
+            )
+            failure: BaseException | None = None
+            for task in finished:
+                first, last = running.pop(task)
+                exception = task.exception()
+                if exception is None:
+                    chunks[first] = task.result()
+                    on_fetched(first, last, chunks[first])
+                elif last > first and should_bisect(exception):
+                    on_bisect(first, last)
+                    middle = (first + last) // 2
+                    retry.appendleft((middle + 1, last))
+                    retry.appendleft((first, middle))
+                elif failure is None:
+                    failure = exception
+            if failure is not None:
+                raise failure
+    finally:
+        for task in running:
+            task.cancel()
+    results: list[T] = []
+    for first in sorted(chunks):
+        results += chunks[first]
+    return results
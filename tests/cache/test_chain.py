@@ -0,0 +1,67 @@
+import logging
+from logging import (
+    FileHandler,
+    Formatter,
+)
+import os
+
+import dotenv
+from eth_typing import (
+    BlockNumber,
+)
+import pytest
+
+from ethhelper import (
+    ChainTracker,
+    GethHttpConnector,
+    MemoryCache,
+)
+from ethhelper.types import (
+    Address,
+    Hash32,
+)
+
+dotenv.load_dotenv()
+
+logger = logging.getLogger(__name__)
+fmt = Formatter("%(asctime)s [%(name)s][%(levelname)s] %(message)s")
+fh = FileHandler(f"./logs/{__name__}", "w", encoding="utf-8")
+fh.setFormatter(fmt)
+fh.setLevel(logging.DEBUG)
+logger.addHandler(fh)
+logger.setLevel(logging.DEBUG)
+
+host = os.getenv("HOST", "localhost")
+port = int(os.getenv("PORT", "8545"))
+
+
+@pytest.mark.asyncio
+class TestChainTracker:
+    async def test_case1(self) -> None:
+        tracker = ChainTracker()
+        orphaned: list[dict[int, str]] = []
+        tracker.add_listener(orphaned.append)
+        c = GethHttpConnector(
+            f"http://{host}:{port}/", logger, cache=MemoryCache(),
+            tracker=tracker
+        )
+        async with c:
+            height = await c.eth_block_number()
+            blocks = await c.get_blocks_by_numbers(
+                [BlockNumber(height - i) for i in range(3, -1, -1)]
+            )
+            for block in blocks:
+                await tracker.add_block(block)
+            assert tracker.head == height
+            assert tracker.reorgs == 0
+            await c.eth_get_balance(
+                Address("0x8ad599c3a0ff1de082011efddc58f1908eb6e6d8")
+            )
+            assert len(c.head_keys) != 0
+            fake = blocks[-1].copy(
+                update={"hash": Hash32(b"\x01" * 32)}
+            )
+            await tracker.add_block(fake)
+            assert tracker.reorgs == 1
+            assert orphaned == [{height: str(blocks[-1].hash)}]
+            assert height not in c.head_keys
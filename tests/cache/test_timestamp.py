@@ -0,0 +1,56 @@
+import logging
+from logging import (
+    FileHandler,
+    Formatter,
+)
+import os
+
+import dotenv
+from eth_typing import (
+    BlockNumber,
+)
+import pytest
+
+from ethhelper import (
+    BlockTimestampIndex,
+    GethHttpConnector,
+)
+
+dotenv.load_dotenv()
+
+logger = logging.getLogger(__name__)
+fmt = Formatter("%(asctime)s [%(name)s][%(levelname)s] %(message)s")
+fh = FileHandler(f"./logs/{__name__}", "w", encoding="utf-8")
+fh.setFormatter(fmt)
+fh.setLevel(logging.DEBUG)
+logger.addHandler(fh)
+logger.setLevel(logging.DEBUG)
+
+host = os.getenv("HOST", "localhost")
+port = int(os.getenv("PORT", "8545"))
+connector = GethHttpConnector(f"http://{host}:{port}/", logger)
+
+
+@pytest.mark.asyncio
+class TestBlockTimestampIndex:
+    async def test_case1(self) -> None:
+        index = BlockTimestampIndex(start=16798000)
+        await index.sync(connector, 16800000)
+        assert index.end == 16800000
+        assert index.timestamp(16798774) == 1678464011
+        height = await connector.get_height_after_ts(1678464011)
+        assert index.height_after(1678464011) == height
+        assert index.heights_after([1678464011, 0, 2 ** 32 - 1]) == [
+            height, BlockNumber(16798000), BlockNumber(16800001)
+        ]
+
+    async def test_case2(self, tmp_path: str) -> None:
+        path = os.path.join(tmp_path, "timestamps")
+        with BlockTimestampIndex(path, start=16798000) as index:
+            await index.sync(connector, 16799000)
+            timestamps = index.timestamps_of(range(16798000, 16799001))
+        with BlockTimestampIndex(path) as index:
+            assert index.start == 16798000
+            assert index.timestamps_of(range(16798000, 16799001)) == timestamps
+            await index.sync(connector, 16799100)
+            assert len(index) == 1101
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from logging import (
     FileHandler,
@@ -6,10 +7,25 @@ from logging import (
 import os
 
 import dotenv
+from eth_typing import (
+    BlockNumber,
+)
+import orjson
 import pytest
 
 from ethhelper import (
     GethHttpConnector,
+    GethHttpLimiter,
+    GethHttpTransport,
+    Priority,
+    use_priority,
+)
+from ethhelper.connectors.http import (
+    current_priority,
+)
+from ethhelper.types import (
+    GethRequest,
+    GethSuccessResponse,
 )
 
 dotenv.load_dotenv()
@@ -34,3 +50,190 @@ class TestHttpBase:
 
     async def test_case2(self) -> None:
         logger.info(f"txpool status {await connector.txpool_status()}")
+
+    async def test_case3(self) -> None:
+        async with GethHttpTransport(max_connections=10) as transport:
+            c1 = GethHttpConnector(
+                f"http://{host}:{port}/", logger, transport=transport
+            )
+            c2 = GethHttpConnector(
+                f"http://{host}:{port}/", logger, transport=transport
+            )
+            assert await c1.test_connection()
+            await c1.aclose()
+            assert not transport.closed
+            assert await c2.test_connection()
+        assert transport.closed
+
+    async def test_case4(self) -> None:
+        async with GethHttpConnector(f"http://{host}:{port}/", logger) as c:
+            logger.info(f"block number {await c.eth_block_number()}")
+            logger.info(f"timestamp {await c.get_block_ts_by_number(0)}")
+        assert c.transport.closed
+
+    async def test_case5(self) -> None:
+        async with GethHttpConnector(
+            f"http://{host}:{port}/", logger, coalesce_window=0.005
+        ) as c:
+            sent: list[str | bytes] = []
+            send_raw = c.send_raw
+
+            async def send_raw_counted(
+                raw: str | bytes, method: str | None = None
+            ) -> bytes:
+                sent.append(raw)
+                return await send_raw(raw, method)
+
+            c.send_raw = send_raw_counted  # type: ignore
+            heights = [hex(i) for i in range(1, 51)]
+            results = await asyncio.gather(
+                *[
+                    c.send("eth_getBlockTransactionCountByNumber", [height])
+                    for height in heights
+                ]
+            )
+            assert 1 <= len(sent) <= 2
+            assert sum(len(orjson.loads(raw)) for raw in sent) == 50
+            for height, result in zip(heights, results):
+                assert result == await connector.send(
+                    "eth_getBlockTransactionCountByNumber", [height]
+                )
+
+    async def test_case6(self) -> None:
+        success, errors = await connector.send_multiple(
+            [("eth_blockNumber", None), ("eth_noSuchMethod", None)]
+        )
+        assert len(success) == 1 and len(errors) == 1
+        assert isinstance(success[0].result, str)
+        assert errors[0].error.code == -32601
+        response = connector.parse_response(
+            b'{"jsonrpc":"2.0","id":1,"result":{"number":"0x1"}}'
+        )
+        assert response.result == {"number": "0x1"}
+
+    async def test_case7(self) -> None:
+        request = GethRequest(id=1, method="eth_blockNumber", params=[])
+        assert orjson.loads(request.encode()) == request.dict()
+        raw_res = await connector.send_raw(request.encode())
+        assert isinstance(raw_res, bytes)
+        response = connector.parse_response(raw_res)
+        assert isinstance(response, GethSuccessResponse)
+        assert response.id == 1
+
+    async def test_case8(self) -> None:
+        async with GethHttpConnector(
+            f"http://{host}:{port}/", logger, hedge_percentile=0.9
+        ) as c:
+            for _ in range(50):
+                await c.eth_block_number()
+            stats = c.latency_stats()["eth_blockNumber"]
+            logger.info(stats)
+            assert stats.requests == 50
+            assert stats.p50 <= stats.p99
+            assert stats.hedges <= 50 - 20
+            posts: list[str | bytes] = []
+            post = c._post
+
+            async def post_slow_primary(raw: str | bytes) -> bytes:
+                posts.append(raw)
+                if len(posts) % 2 == 1:
+                    await asyncio.sleep(0.3)
+                return await post(raw)
+
+            c._post = post_slow_primary  # type: ignore
+            c.hedge_min_delay = 0.05
+            for _ in range(10):
+                await c.eth_block_number()
+            await asyncio.gather(*c.outrun)
+            hedged = c.latency_stats()["eth_blockNumber"]
+            logger.info(hedged)
+            assert len(posts) == 20
+            assert hedged.hedges == stats.hedges + 10
+            assert hedged.hedge_wins == stats.hedge_wins + 10
+            assert hedged.requests == 60
+            assert hedged.p95 >= 0.3
+
+    async def test_case9(self) -> None:
+        limiter = GethHttpLimiter(rate=100, burst=10, initial=2, maximum=8)
+        async with GethHttpConnector(
+            f"http://{host}:{port}/",
+            logger,
+            limiter=limiter,
+            single_flight=False
+        ) as c:
+            await asyncio.gather(
+                *[c.eth_block_number() for _ in range(50)],
+                *[c.get_block_ts_by_number(BlockNumber(1)) for _ in range(5)]
+            )
+            stats = limiter.stats()
+            logger.info(stats)
+            assert stats.requests == 55
+            assert stats.inflight == 0 and stats.waiting == 0
+            assert 1 <= stats.limit <= 8
+
+    async def test_case10(self) -> None:
+        limiter = GethHttpLimiter(initial=4, minimum=4, maximum=4)
+        async with GethHttpConnector(
+            f"http://{host}:{port}/",
+            logger,
+            limiter=limiter,
+            single_flight=False
+        ) as c:
+            started: list[Priority] = []
+            acquire = limiter.acquire
+
+            async def acquire_recorded(
+                priority: Priority | None = None
+            ) -> float:
+                start = await acquire(priority)
+                started.append(priority or current_priority())
+                return start
+
+            limiter.acquire = acquire_recorded  # type: ignore
+
+            async def backfill(height: int) -> None:
+                with use_priority(Priority.BULK):
+                    await c.send("eth_getBlockByNumber", [hex(height), False])
+
+            async def realtime() -> None:
+                with use_priority(Priority.REALTIME):
+                    await c.eth_block_number()
+
+            backfills = [
+                asyncio.create_task(backfill(i)) for i in range(1, 201)
+            ]
+            while not limiter.waiters[Priority.BULK]:
+                await asyncio.sleep(0)
+            arrived = len(started)
+            await asyncio.gather(*[realtime() for _ in range(10)])
+            last = max(
+                i for i, priority in enumerate(started)
+                if priority == Priority.REALTIME
+            )
+            logger.info(f"{started}")
+            assert started.count(Priority.REALTIME) == 10
+            assert (
+                started[arrived:last].count(Priority.BULK)
+                <= limiter.capacity(Priority.BULK)
+            )
+            assert Priority.BULK in started[last:]
+            await asyncio.gather(*backfills)
+            assert len(started) == 210
+            stats = limiter.stats()
+            logger.info(stats)
+            assert stats.inflight == 0 and stats.waiting == 0
+
+    async def test_case11(self) -> None:
+        async with GethHttpConnector(f"http://{host}:{port}/", logger) as c:
+            blocks = await asyncio.gather(
+                *[c.eth_get_block("latest") for _ in range(20)]
+            )
+            assert all(block == blocks[0] for block in blocks)
+            timestamps = await asyncio.gather(
+                *[c.get_block_ts_by_number(BlockNumber(1)) for _ in range(5)]
+            )
+            assert len(set(timestamps)) == 1
+            stats = c.flight_stats()
+            logger.info(stats)
+            assert stats.started == 2 and stats.shared == 23
+            assert stats.inflight == 0
@@ -16,10 +16,15 @@ import pytest
 
 from ethhelper import (
     GethHttpConnector,
+    SqliteCache,
+)
+from ethhelper.connectors.http.cache import (
+    log_filter_key,
 )
 from ethhelper.types import (
     Address,
     FilterParams,
+    GethError,
 )
 
 dotenv.load_dotenv()
@@ -113,4 +118,107 @@ class TestHttpCustom:
         )
         logger.info(f"{len(logs)}")
 
+    async def test_case10(self) -> None:
+        numbers = [BlockNumber(16799185), BlockNumber(16798774)]
+        blocks = await connector.get_blocks_by_numbers(numbers)
+        assert [block.number for block in blocks] == numbers
+        results = await connector.send_batch(
+            [("eth_blockNumber", None), ("eth_notExist", None)]
+        )
+        assert isinstance(results[0], str)
+        assert isinstance(results[1], GethError)
+
+    async def test_case11(self) -> None:
+        blocks = await connector.get_blocks_by_numbers_range(
+            BlockNumber(16798774),
+            BlockNumber(16800773),
+        )
+        assert len(blocks) == 2000
+        stats = connector.batch_stats()["eth_getBlockByNumber"]
+        logger.info(f"batch stats {stats}")
+        assert stats.items >= 2000
+
+    async def test_case12(self) -> None:
+        logs = await connector.get_logs_by_blocks(
+            BlockNumber(16798774),
+            BlockNumber(16808774),
+            concurrency=8
+        )
+        keys = [(log.block_number, log.log_index) for log in logs]
+        assert keys == sorted(keys)
+        logger.info(f"{len(logs)}")
+
+    async def test_case13(self) -> None:
+        address = Address("0x8ad599c3a0ff1de082011efddc58f1908eb6e6d8")
+        results = await connector.get_logs_multiple([
+            FilterParams(  # type: ignore
+                address=address,
+                fromBlock=16798774 + i * 100,
+                toBlock=16798774 + i * 100 + 99,
+            )
+            for i in range(5)
+        ])
+        logs = await connector.get_logs_by_blocks(
+            BlockNumber(16798774), BlockNumber(16799273), address, step=100
+        )
+        assert sum(len(result) for result in results) == len(logs)
+
+    async def test_case14(self) -> None:
+        numbers: list[int] = []
+        async for blocks in connector.iter_blocks(
+            BlockNumber(16798774), BlockNumber(16799785), prefetch=2
+        ):
+            numbers += [block.number for block in blocks]
+        assert numbers == list(range(16798774, 16799786))
+        count = 0
+        async for logs in connector.iter_logs(
+            BlockNumber(16798774),
+            BlockNumber(16799185),
+            Address("0x8ad599c3a0ff1de082011efddc58f1908eb6e6d8"),
+            step=100
+        ):
+            count += len(logs)
+        logger.info(f"{count}")
 
+    async def test_case15(self) -> None:
+        height = await connector.get_height_after_ts(
+            int(datetime(2023, 3, 21, 16, 14).timestamp()), probes=8
+        )
+        assert height == 16874761
+        block = await connector.eth_get_block(height)
+        previous = await connector.eth_get_block(BlockNumber(height - 1))
+        assert previous.timestamp < block.timestamp
+
+    async def test_case16(self, tmp_path: str) -> None:
+        path = os.path.join(tmp_path, "cache.sqlite")
+        address = Address("0x8ad599c3a0ff1de082011efddc58f1908eb6e6d8")
+        numbers = [BlockNumber(16799185), BlockNumber(16798774)]
+        with SqliteCache(path) as cache:
+            c = GethHttpConnector(
+                f"http://{host}:{port}/", logger, cache=cache
+            )
+            async with c:
+                blocks = await c.get_blocks_by_numbers(numbers)
+                logs = await c.get_logs_by_blocks(
+                    BlockNumber(16798774), BlockNumber(16799185), address
+                )
+        with SqliteCache(path) as cache:
+            c = GethHttpConnector(
+                f"http://{host}:{port}/", logger, cache=cache
+            )
+            async with c:
+                assert await c.get_blocks_by_numbers(numbers) == blocks
+                key = log_filter_key(
+                    FilterParams(address=address).to_geth()  # type: ignore
+                )
+                assert cache.log_gaps(key, 16798774, 16799185) == []
+                assert await c.get_logs_by_blocks(
+                    BlockNumber(16798774), BlockNumber(16799185), address
+                ) == logs
+                more = await c.get_logs_by_blocks(
+                    BlockNumber(16798774), BlockNumber(16799785), address
+                )
+                assert more[:len(logs)] == logs
+                stats = cache.stats()
+                logger.info(stats)
+                assert stats.hits == 2 and stats.entries == 2
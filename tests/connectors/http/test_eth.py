@@ -20,6 +20,8 @@ from web3.types import (
 
 from ethhelper import (
     GethHttpConnector,
+    GethNativeHttpConnector,
+    MemoryCache,
 )
 from ethhelper.types import (
     Address,
@@ -43,6 +45,7 @@ logger.setLevel(logging.DEBUG)
 host = os.getenv("HOST", "localhost")
 port = int(os.getenv("PORT", "8545"))
 connector = GethHttpConnector(f"http://{host}:{port}/", logger)
+native = GethNativeHttpConnector(f"http://{host}:{port}/", logger)
 
 
 @pytest.mark.asyncio
@@ -183,3 +186,49 @@ class TestHttpEth:
             )
         )
         logger.info(receipt.transaction_hash)
+
+    async def test_case12(self) -> None:
+        height = BlockNumber(16716880)
+        block = await native.eth_get_block(height, True)
+        assert block == await connector.eth_get_block(height, True)
+        assert block.transactions
+        for txn in block.transactions[:10]:
+            assert not isinstance(txn, Hash32)
+            assert txn == await connector.eth_get_transaction(txn.hash)
+            receipt = await native.eth_get_transaction_receipt(txn.hash)
+            assert receipt == \
+                await connector.eth_get_transaction_receipt(txn.hash)
+        addr = Address("0x8ad599c3a0ff1de082011efddc58f1908eb6e6d8")
+        assert await native.eth_get_code(addr, height) == \
+            await connector.eth_get_code(addr, height)
+        txn = TxParams(  # type: ignore
+            data=HexBytes("0x3850c7bd"),
+            to=addr,
+        )
+        assert await native.eth_call(txn, height) == \
+            await connector.eth_call(txn, height)
+
+    async def test_case13(self) -> None:
+        height = BlockNumber(16716880)
+        for c in [
+            GethHttpConnector(
+                f"http://{host}:{port}/", logger, cache=MemoryCache()
+            ),
+            GethNativeHttpConnector(
+                f"http://{host}:{port}/", logger, cache=MemoryCache()
+            ),
+        ]:
+            async with c:
+                block = await c.eth_get_block(height)
+                assert block == await c.eth_get_block(height)
+                assert block == await c.eth_get_block(block.hash)
+                txn = block.transactions[0]
+                assert isinstance(txn, Hash32)
+                receipt = await c.eth_get_transaction_receipt(txn)
+                assert receipt == await c.eth_get_transaction_receipt(txn)
+                await c.eth_get_block("latest")
+                await c.eth_get_block("latest")
+                assert c.cache is not None
+                stats = c.cache.stats()
+                logger.info(stats)
+                assert stats.hits == 2 and stats.entries == 3
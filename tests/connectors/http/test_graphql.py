@@ -4,6 +4,7 @@ from logging import (
     Formatter,
 )
 import os
+import time
 
 import dotenv
 from eth_typing import (
@@ -14,6 +15,10 @@ import pytest
 from ethhelper import (
     GethHttpConnector,
 )
+from ethhelper.types import (
+    Address,
+    FilterParams,
+)
 
 dotenv.load_dotenv()
 
@@ -65,3 +70,96 @@ class TestGraphQL:
             step=400
         )
         assert len(blocks) == 16799785 - 16798774 + 1
+
+    async def test_case6(self) -> None:
+        result: dict[BlockNumber, int] = {}
+        async for chunk in connector.iter_block_timestamps(
+            BlockNumber(16798774), BlockNumber(16799185), step=100
+        ):
+            result |= chunk
+        assert list(result) == list(range(16798774, 16799186))
+
+    async def test_case7(self) -> None:
+        columns = await connector.get_block_fields_by_numbers_range(
+            BlockNumber(16798774),
+            BlockNumber(16799185),
+            ("gasUsed", "baseFeePerGas", "miner"),
+            step=100
+        )
+        assert list(columns) == ["number", "gasUsed", "baseFeePerGas", "miner"]
+        assert columns["number"] == list(range(16798774, 16799186))
+        headers = await connector.get_block_headers_by_numbers_range(
+            BlockNumber(16798774), BlockNumber(16798775), ("hash", "gasUsed")
+        )
+        block = await connector.eth_get_block(BlockNumber(16798774))
+        assert headers[0].hash == block.hash
+        assert headers[0].gas_used == block.gas_used
+        assert headers[0].timestamp is None
+
+    async def test_case8(self) -> None:
+        address = Address("0x8ad599c3a0ff1de082011efddc58f1908eb6e6d8")
+        start = time.monotonic()
+        expected = await connector.get_logs_by_blocks(
+            BlockNumber(16798774), BlockNumber(16799185), address
+        )
+        rpc_time = time.monotonic() - start
+        start = time.monotonic()
+        logs = await connector.get_logs_graphql(
+            FilterParams(  # type: ignore
+                address=address,
+                from_block=16798774,  # type: ignore
+                to_block=16799185  # type: ignore
+            ),
+            step=100
+        )
+        graphql_time = time.monotonic() - start
+        logger.info(
+            f"{len(logs)} logs, JSON-RPC {rpc_time:.3f}s, "
+            f"GraphQL {graphql_time:.3f}s"
+        )
+        assert logs == expected
+        with_ts = await connector.get_logs_ts_graphql(
+            FilterParams(  # type: ignore
+                address=address,
+                from_block=16798774,  # type: ignore
+                to_block=16798774  # type: ignore
+            )
+        )
+        assert all(ts == 1678464011 for _, ts in with_ts)
+
+    async def test_case9(self) -> None:
+        height = BlockNumber(16798774)
+        block, receipts = await connector.get_block_with_receipts(height)
+        expected = await connector.eth_get_block(height)
+        assert block.hash == expected.hash
+        assert block.transactions is not None
+        assert len(receipts) == len(block.transactions)
+        receipt = await connector.eth_get_transaction_receipt(
+            receipts[-1].transaction_hash
+        )
+        assert receipts[-1] == receipt
+        blocks = await connector.get_blocks_with_receipts_by_numbers_range(
+            height, BlockNumber(height + 9), step=4
+        )
+        assert [b.number for b, _ in blocks] == list(
+            range(height, height + 10)
+        )
+
+    async def test_case10(self) -> None:
+        addresses = [
+            Address("0x8ad599c3a0ff1de082011efddc58f1908eb6e6d8"),
+            Address("0x6C09Fe6aDfCb42002617683D1deAeD7536167575"),
+        ]
+        height = BlockNumber(16798774)
+        states = await connector.get_accounts_state(addresses, height, step=1)
+        assert list(states) == addresses
+        for address in addresses:
+            state = states[address]
+            assert state.balance == await connector.eth_get_balance(
+                address, height
+            )
+            assert state.code == await connector.eth_get_code(address, height)
+        states = await connector.get_accounts_state(
+            addresses, fields=["nonce"]
+        )
+        assert all(state.balance is None for state in states.values())
@@ -0,0 +1,136 @@
+import logging
+from logging import (
+    FileHandler,
+    Formatter,
+)
+import os
+
+import dotenv
+from eth_typing import (
+    BlockNumber,
+)
+import pytest
+
+from ethhelper import (
+    GethHttpConnector,
+    SqliteCache,
+)
+from ethhelper.types import (
+    Address,
+)
+
+dotenv.load_dotenv()
+
+logger = logging.getLogger(__name__)
+fmt = Formatter("%(asctime)s [%(name)s][%(levelname)s] %(message)s")
+fh = FileHandler(f"./logs/{__name__}", "w", encoding="utf-8")
+fh.setFormatter(fmt)
+fh.setLevel(logging.DEBUG)
+logger.addHandler(fh)
+logger.setLevel(logging.DEBUG)
+
+host = os.getenv("HOST", "localhost")
+port = int(os.getenv("PORT", "8545"))
+
+
+@pytest.mark.asyncio
+class TestHttpPlanner:
+    async def test_case1(self) -> None:
+        async with GethHttpConnector(
+            f"http://{host}:{port}/", logger
+        ) as connector:
+            results = [
+                await connector.query_block_timestamps(
+                    BlockNumber(16798774), BlockNumber(16799185)
+                )
+                for _ in range(5)
+            ]
+            assert all(result == results[0] for result in results)
+            assert results[0][BlockNumber(16798774)] == 1678464011
+            stats = connector.plan_stats()["headers:number,timestamp"]
+            logger.info(f"{stats}")
+            assert stats.choices == 5
+            assert stats.samples["graphql"] >= 2
+            assert stats.samples["jsonrpc"] >= 2
+            assert stats.choice is not None
+
+    async def test_case2(self) -> None:
+        address = Address("0x8ad599c3a0ff1de082011efddc58f1908eb6e6d8")
+        async with GethHttpConnector(
+            f"http://{host}:{port}/", logger
+        ) as connector:
+            logs = [
+                await connector.query_logs(
+                    BlockNumber(16798774), BlockNumber(16799185), address
+                )
+                for _ in range(4)
+            ]
+            assert all(result == logs[0] for result in logs)
+            states = [
+                await connector.query_accounts_state(
+                    [address], BlockNumber(16798774), ["balance", "nonce"]
+                )
+                for _ in range(4)
+            ]
+            assert all(result == states[0] for result in states)
+            logger.info(f"{connector.plan_stats()}")
+
+    async def test_case3(self) -> None:
+        async with GethHttpConnector(
+            f"http://{host}:{port}/",
+            logger,
+            graphql_url=f"http://{host}:{port}/no-graphql"
+        ) as connector:
+            for _ in range(3):
+                timestamps = await connector.query_block_timestamps(
+                    BlockNumber(16798774), BlockNumber(16798776)
+                )
+                assert timestamps[BlockNumber(16798774)] == 1678464011
+            stats = connector.plan_stats()["headers:number,timestamp"]
+            logger.info(f"{stats}")
+            assert stats.failures["graphql"] == 1
+            assert stats.choice == "jsonrpc"
+
+    async def test_case4(self) -> None:
+        async with GethHttpConnector(
+            f"http://{host}:{port}/", logger
+        ) as connector:
+            head = await connector.eth_block_number()
+            results = [
+                await connector.query_block_headers(
+                    BlockNumber(head - 2), BlockNumber(head + 5)
+                )
+                for _ in range(4)
+            ]
+            stats = connector.plan_stats()["headers:number,timestamp"]
+            logger.info(f"{stats}")
+            assert stats.samples["graphql"] >= 2
+            assert stats.samples["jsonrpc"] >= 2
+            for headers in results:
+                assert 3 <= len(headers) < 8
+                assert [header.number for header in headers] == list(
+                    range(head - 2, head - 2 + len(headers))
+                )
+
+    async def test_case5(self, tmp_path: str) -> None:
+        path = os.path.join(tmp_path, "cache.sqlite")
+        address = Address("0x8ad599c3a0ff1de082011efddc58f1908eb6e6d8")
+        with SqliteCache(path) as cache:
+            async with GethHttpConnector(
+                f"http://{host}:{port}/", logger, cache=cache
+            ) as connector:
+                logs = [
+                    await connector.query_logs(
+                        BlockNumber(16798774), BlockNumber(16799185), address
+                    )
+                    for _ in range(4)
+                ]
+                assert all(result == logs[0] for result in logs)
+                stats = next(
+                    stats for operation, stats in
+                    connector.plan_stats().items()
+                    if operation.startswith("logs:")
+                )
+                logger.info(f"{stats}")
+                assert stats.choices == 1
+                assert sum(stats.samples.values()) == 1
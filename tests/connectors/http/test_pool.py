@@ -0,0 +1,52 @@
+import asyncio
+import logging
+from logging import (
+    FileHandler,
+    Formatter,
+)
+import os
+
+import dotenv
+import pytest
+
+from ethhelper import (
+    GethHttpPoolConnector,
+)
+
+dotenv.load_dotenv()
+
+logger = logging.getLogger(__name__)
+fmt = Formatter("%(asctime)s [%(name)s][%(levelname)s] %(message)s")
+fh = FileHandler(f"./logs/{__name__}", "w", encoding="utf-8")
+fh.setFormatter(fmt)
+fh.setLevel(logging.DEBUG)
+logger.addHandler(fh)
+logger.setLevel(logging.DEBUG)
+
+host = os.getenv("HOST", "localhost")
+port = int(os.getenv("PORT", "8545"))
+
+
+@pytest.mark.asyncio
+class TestHttpPool:
+    async def test_case1(self) -> None:
+        async with GethHttpPoolConnector(
+            [f"http://{host}:{port}/", "http://127.0.0.1:1/"], logger
+        ) as connector:
+            heights = await asyncio.gather(
+                *[connector.eth_block_number() for _ in range(10)]
+            )
+            logger.info(f"{heights}")
+            stats = connector.node_stats()
+            logger.info(f"{stats}")
+            assert stats[f"http://{host}:{port}/"].healthy
+            assert not stats["http://127.0.0.1:1/"].healthy
+            assert await connector.get_block_ts_by_number(0) == 0
+
+    async def test_case2(self) -> None:
+        async with GethHttpPoolConnector(
+            ["http://127.0.0.1:1/", f"http://{host}:{port}/"], logger
+        ) as connector:
+            assert await connector.test_connection()
+            stats = connector.node_stats()
+            assert stats["http://127.0.0.1:1/"].failures >= 1